@@ -0,0 +1,32 @@
+"""Track dead-domain short-circuits per batch
+
+Revision ID: 004_domain_verdicts
+Revises: 003_outreach
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004_domain_verdicts"
+down_revision: Union[str, None] = "003_outreach"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "batch_jobs",
+        sa.Column("dead_domain_count", sa.Integer(), nullable=True, server_default="0"),
+    )
+    op.create_index(
+        "ix_email_verifications_domain_created",
+        "email_verifications",
+        ["domain", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_verifications_domain_created", table_name="email_verifications")
+    op.drop_column("batch_jobs", "dead_domain_count")
@@ -0,0 +1,36 @@
+"""Expression indexes for the set-based lead backfill
+
+Revision ID: 005_backfill_indexes
+Revises: 004_domain_verdicts
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005_backfill_indexes"
+down_revision: Union[str, None] = "004_domain_verdicts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serve DISTINCT ON (lower(email)) ... ORDER BY lower(email), created_at DESC,
+    # keyset-paginated in byte order
+    op.create_index(
+        "ix_email_verifications_lower_email_created",
+        "email_verifications",
+        [sa.text('lower(email) COLLATE "C"'), sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "ix_contact_enrichments_lower_email_created",
+        "contact_enrichments",
+        [sa.text('lower(email) COLLATE "C"'), sa.text("created_at DESC")],
+        postgresql_where=sa.text("enriched"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contact_enrichments_lower_email_created", table_name="contact_enrichments")
+    op.drop_index("ix_email_verifications_lower_email_created", table_name="email_verifications")
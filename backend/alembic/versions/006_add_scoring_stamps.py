@@ -0,0 +1,26 @@
+"""Record the scoring config version and input fingerprint on each lead
+
+Revision ID: 006_scoring_stamps
+Revises: 005_backfill_indexes
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006_scoring_stamps"
+down_revision: Union[str, None] = "005_backfill_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing leads start unstamped, so the first rescore scores all of them
+    op.add_column("leads", sa.Column("scoring_config_version", sa.String(40), nullable=True))
+    op.add_column("leads", sa.Column("scoring_input_hash", sa.String(40), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("leads", "scoring_input_hash")
+    op.drop_column("leads", "scoring_config_version")
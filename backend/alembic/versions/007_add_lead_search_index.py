@@ -0,0 +1,29 @@
+"""Trigram index for lead search
+
+Revision ID: 007_lead_search
+Revises: 006_scoring_stamps
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "007_lead_search"
+down_revision: Union[str, None] = "006_scoring_stamps"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay identical to app.services.lead_search.search_document()
+SEARCH_DOCUMENT = (
+    "lower(coalesce(email, '') || ' ' || coalesce(full_name, '') || ' ' || coalesce(first_name, '')"
+    " || ' ' || coalesce(last_name, '') || ' ' || coalesce(company_name, '') || ' ' || coalesce(title, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(f"CREATE INDEX ix_leads_search_trgm ON leads USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leads_search_trgm", table_name="leads")
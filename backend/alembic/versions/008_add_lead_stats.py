@@ -0,0 +1,118 @@
+"""Add the lead_stats rollup and the triggers that maintain it
+
+Revision ID: 008_lead_stats
+Revises: 007_lead_search
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "008_lead_stats"
+down_revision: Union[str, None] = "007_lead_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The SQL below is a snapshot of app.models.lead as of this revision; later
+# changes to the triggers need a new migration, not an edit here.
+
+# One lead's contribution to its rollup row, signed: +1 for new rows, -1 for old
+_DELTA = """
+            SELECT coalesce((created_at AT TIME ZONE 'UTC')::date, DATE '1970-01-01') AS day,
+                   coalesce(source, '') AS source,
+                   coalesce(verification_status, '') AS verification_status,
+                   coalesce(outreach_status, '') AS outreach_status,
+                   {sign} AS lead_count,
+                   {sign} * (coalesce(enriched, false))::int AS enriched_count,
+                   {sign} * (coalesce(lead_score, 0) > 0)::int AS scored_count,
+                   {sign} * coalesce(lead_score, 0)::bigint AS score_sum,
+                   {sign} * (lead_score IS NOT NULL)::int AS score_count
+            FROM {rows}"""
+
+# Net deltas per rollup row, upserted in key order
+_APPLY = """
+        INSERT INTO lead_stats AS s (
+            day, source, verification_status, outreach_status,
+            lead_count, enriched_count, scored_count, score_sum, score_count
+        )
+        SELECT day, source, verification_status, outreach_status,
+               sum(lead_count), sum(enriched_count), sum(scored_count), sum(score_sum), sum(score_count)
+        FROM ({deltas}
+        ) AS delta
+        GROUP BY day, source, verification_status, outreach_status
+        HAVING sum(lead_count) <> 0 OR sum(enriched_count) <> 0 OR sum(scored_count) <> 0
+            OR sum(score_sum) <> 0 OR sum(score_count) <> 0
+        ORDER BY day, source, verification_status, outreach_status
+        ON CONFLICT (day, source, verification_status, outreach_status) DO UPDATE SET
+            lead_count = s.lead_count + EXCLUDED.lead_count,
+            enriched_count = s.enriched_count + EXCLUDED.enriched_count,
+            scored_count = s.scored_count + EXCLUDED.scored_count,
+            score_sum = s.score_sum + EXCLUDED.score_sum,
+            score_count = s.score_count + EXCLUDED.score_count;"""
+
+_INSERTED = _DELTA.format(sign=1, rows="new_rows")
+_DELETED = _DELTA.format(sign=-1, rows="old_rows")
+
+TRIGGERS_SQL = [
+    f"""
+CREATE OR REPLACE FUNCTION lead_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+{_APPLY.format(deltas=_INSERTED)}
+    ELSIF TG_OP = 'UPDATE' THEN
+{_APPLY.format(deltas=_INSERTED + " UNION ALL" + _DELETED)}
+    ELSIF TG_OP = 'DELETE' THEN
+{_APPLY.format(deltas=_DELETED)}
+    ELSE
+        DELETE FROM lead_stats;
+    END IF;
+    RETURN NULL;
+END;
+$$""",
+    "DROP TRIGGER IF EXISTS lead_stats_insert ON leads",
+    "DROP TRIGGER IF EXISTS lead_stats_update ON leads",
+    "DROP TRIGGER IF EXISTS lead_stats_delete ON leads",
+    "DROP TRIGGER IF EXISTS lead_stats_truncate ON leads",
+    "CREATE TRIGGER lead_stats_insert AFTER INSERT ON leads REFERENCING NEW TABLE AS new_rows"
+    " FOR EACH STATEMENT EXECUTE PROCEDURE lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_update AFTER UPDATE ON leads REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    " FOR EACH STATEMENT EXECUTE PROCEDURE lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_delete AFTER DELETE ON leads REFERENCING OLD TABLE AS old_rows"
+    " FOR EACH STATEMENT EXECUTE PROCEDURE lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_truncate AFTER TRUNCATE ON leads"
+    " FOR EACH STATEMENT EXECUTE PROCEDURE lead_stats_apply()",
+]
+
+BACKFILL_SQL = [
+    "LOCK TABLE leads IN SHARE ROW EXCLUSIVE MODE",
+    _APPLY.format(deltas=_DELTA.format(sign=1, rows="leads")).strip(),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lead_stats",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("source", sa.String(50), nullable=False, server_default=""),
+        sa.Column("verification_status", sa.String(50), nullable=False, server_default=""),
+        sa.Column("outreach_status", sa.String(50), nullable=False, server_default=""),
+        sa.Column("lead_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("enriched_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("scored_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("score_sum", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("score_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("day", "source", "verification_status", "outreach_status", name="uq_lead_stats_key"),
+    )
+
+    # Install the triggers, then seed the rollup from the existing leads
+    for statement in TRIGGERS_SQL + BACKFILL_SQL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for trigger in ("insert", "update", "delete", "truncate"):
+        op.execute(f"DROP TRIGGER IF EXISTS lead_stats_{trigger} ON leads")
+    op.execute("DROP FUNCTION IF EXISTS lead_stats_apply()")
+    op.drop_table("lead_stats")
@@ -1,3 +1,4 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -17,14 +18,71 @@ class Settings(BaseSettings):
     # ZeroBounce
     zerobounce_api_key: str = ""
     zerobounce_base_url: str = "https://api.zerobounce.net/v2"
+    zerobounce_timeout: float = 30.0
+    zerobounce_max_connections: int = 50
+    zerobounce_max_keepalive_connections: int = 20
+    zerobounce_keepalive_expiry: float = 30.0
+    zerobounce_http2: bool = False
+    zerobounce_bulk_base_url: str = "https://bulkapi.zerobounce.net/v2"
+    # CSV batches this large use the bulk file API (0 = never); like other large batches they
+    # are split into csv_chunk_size shards, each uploaded as its own file
+    zerobounce_bulk_threshold: int = 5000
+    zerobounce_bulk_poll_interval: float = 15.0  # Seconds between re-scheduled file status checks
+    zerobounce_bulk_timeout: float = 6 * 3600.0  # A shard's file is given up on (batch failed) after this long
+
+    # Verification
+    verification_concurrency: int = 10  # ZeroBounce requests kept in flight per batch
+    verification_cache_ttl_seconds: int = 24 * 3600  # Fallback TTL for statuses not listed below
+    verification_ttl_by_status: dict[str, int] = {
+        "valid": 30 * 86400,
+        "invalid": 90 * 86400,
+        "catch-all": 7 * 86400,
+        "unknown": 3600,
+        "spamtrap": 90 * 86400,
+        "abuse": 90 * 86400,
+        "do_not_mail": 90 * 86400,
+    }
+    # Sub-statuses override the status TTL (transient SMTP failures are retried soon)
+    verification_ttl_by_sub_status: dict[str, int] = {
+        "greylisted": 3600,
+        "mail_server_temporary_error": 3600,
+        "mail_server_did_not_respond": 3600,
+        "timeout_exceeded": 3600,
+        "failed_smtp_connection": 3600,
+        "forcible_disconnect": 3600,
+        "antispam_system": 3600,
+        "exception_occurred": 3600,
+        "mailbox_quota_exceeded": 86400,
+        # local_dead_domain and local_no_mx default to domain_verdict_ttl_seconds and
+        # precheck_mx_cache_ttl_seconds (see _derive_local_ttls)
+    }
+    precheck_enabled: bool = True  # Resolve certain-bad emails locally before ZeroBounce
+    precheck_mx_lookup: bool = True
+    precheck_mx_cache_ttl_seconds: int = 3600
+    precheck_dns_timeout: float = 3.0
+    precheck_reject_role_accounts: bool = False
+    disposable_domains_path: str = ""
+    role_accounts_path: str = ""
+    domain_verdict_cache: bool = True  # Resolve addresses on known-dead domains locally
+    domain_verdict_ttl_seconds: int = 24 * 3600
+    verification_flush_size: int = 200  # Buffered writer: flush every N results...
+    verification_flush_interval: float = 2.0  # ...or every T seconds
+    csv_chunk_size: int = 2000  # Larger CSV batches are split into chunk tasks (0 disables; bulk batches then use one file)
+    reverification_enabled: bool = False  # Periodically re-verify leads whose result expired
+    reverification_batch_size: int = 1000
+    verification_cache_max_entries: int = 50000  # In-process LRU size
+    verification_cache_redis: bool = True  # Share cached results through Redis
+    verification_single_flight_redis: bool = True  # Coalesce duplicate calls across workers
 
     # HubSpot
     hubspot_client_id: str = ""
     hubspot_client_secret: str = ""
     hubspot_redirect_uri: str = "http://localhost:8000/api/hubspot/callback"
+    hubspot_concurrency: int = 4  # Contact pushes kept in flight per task
 
     # Apollo.io
     apollo_api_key: str = ""
+    apollo_concurrency: int = 4  # Enrichment requests kept in flight per task
 
     # LinkedIn Scraping
     linkedin_username: str = ""
@@ -32,6 +90,26 @@ class Settings(BaseSettings):
     linkedin_geckodriver_path: str = ""
     linkedin_scrape_schedule: str = "0 8 * * *"  # Daily at 8 AM (cron format)
 
+    # Lead scoring
+    scoring_config_cache: bool = True  # Keep the active ScoringConfig in process memory
+    scoring_config_check_interval: float = 5.0  # Seconds between Redis version checks
+    scoring_config_cache_ttl_seconds: int = 300  # Reload from the database at least this often
+    scoring_snapshot_ttl_seconds: int = 600  # Age at which the simulation snapshot is reloaded
+
+    # Dashboard
+    stats_cache_ttl_seconds: float = 10.0  # Aggregate stats are recomputed at most this often
+
+    @model_validator(mode="after")
+    def _derive_local_ttls(self) -> "Settings":
+        # A locally resolved result is only as fresh as the verdict it came from; an explicit
+        # entry in verification_ttl_by_sub_status still wins
+        self.verification_ttl_by_sub_status = {
+            "local_dead_domain": self.domain_verdict_ttl_seconds,
+            "local_no_mx": self.precheck_mx_cache_ttl_seconds,
+            **self.verification_ttl_by_sub_status,
+        }
+        return self
+
     @property
     def cors_origins_list(self) -> list[str]:
         return [origin.strip() for origin in self.cors_origins.split(",")]
@@ -3,6 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
 from app.database import engine, Base
+from app.services.zerobounce import close_zerobounce_service
+from app.services.apollo import close_apollo_service
 from app.routers import verify_router, batch_router, hubspot_router, apollo_router, linkedin_router, dashboard_router, leads_router, progress_router, outreach_router, pipeline_router
 
 settings = get_settings()
@@ -13,7 +15,9 @@ async def lifespan(app: FastAPI):
     # Startup: Create database tables
     Base.metadata.create_all(bind=engine)
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: release pooled HTTP connections
+    await close_zerobounce_service()
+    await close_apollo_service()
 
 
 app = FastAPI(
@@ -3,7 +3,7 @@ from app.models.batch import BatchJob
 from app.models.hubspot_sync import HubSpotConnection, HubSpotSyncLog
 from app.models.enrichment import ContactEnrichment
 from app.models.linkedin import LinkedInKeyword, LinkedInPost, LinkedInScrapeJob
-from app.models.lead import Lead, ScoringConfig
+from app.models.lead import Lead, LeadStats, ScoringConfig
 from app.models.outreach import InstantlyConnection, OutreachCampaign, OutreachLog
 
 __all__ = [
@@ -17,6 +17,7 @@ __all__ = [
     "LinkedInScrapeJob",
     "Lead",
     "ScoringConfig",
+    "LeadStats",
     "InstantlyConnection",
     "OutreachCampaign",
     "OutreachLog",
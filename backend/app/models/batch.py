@@ -14,6 +14,7 @@ class BatchJob(Base):
     valid_count = Column(Integer, default=0)
     invalid_count = Column(Integer, default=0)
     unknown_count = Column(Integer, default=0)
+    dead_domain_count = Column(Integer, default=0, server_default="0")  # Emails resolved by the dead-domain cache
     error_message = Column(Text, nullable=True)
 
     # File paths
@@ -28,4 +28,5 @@ class EmailVerification(Base):
 
     __table_args__ = (
         Index("ix_email_verifications_email_created", "email", "created_at"),
+        Index("ix_email_verifications_domain_created", "domain", "created_at"),
     )
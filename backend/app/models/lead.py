@@ -1,11 +1,12 @@
 """
 Lead model - the unified source of truth for all leads in the system.
 ScoringConfig - configurable scoring weights and criteria.
+LeadStats - lead counts rolled up per day and dimension, kept current by triggers.
 """
 
 from sqlalchemy import (
     Column, Integer, String, DateTime, Boolean, Text, Float,
-    ForeignKey, Index, JSON, UniqueConstraint,
+    ForeignKey, Index, JSON, UniqueConstraint, BigInteger, Date, event, text,
 )
 from sqlalchemy.sql import func
 from app.database import Base
@@ -55,6 +56,8 @@ class Lead(Base):
     # Lead scoring
     lead_score = Column(Integer, default=0)  # 0-100
     score_breakdown = Column(JSON, nullable=True)  # { email_quality: 25, seniority: 20, ... }
+    scoring_config_version = Column(String(40), nullable=True)  # config_version() the score was computed with
+    scoring_input_hash = Column(String(40), nullable=True)  # input_fingerprint() at scoring time
 
     # Source tracking
     source = Column(String(50), default="csv")  # csv, hubspot, linkedin, apollo
@@ -112,3 +115,144 @@ class ScoringConfig(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class LeadStats(Base):
+    """
+    Leads rolled up per creation day x source x verification_status x
+    outreach_status. Maintained by statement-level triggers on leads
+    (LEAD_STATS_TRIGGERS_SQL), so every write path keeps it current and
+    stats reads cost the same however many leads there are. NULL
+    dimensions are stored as "" so they can be part of the unique key.
+    """
+
+    __tablename__ = "lead_stats"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)  # UTC date of leads.created_at
+    source = Column(String(50), nullable=False, default="")
+    verification_status = Column(String(50), nullable=False, default="")
+    outreach_status = Column(String(50), nullable=False, default="")
+
+    lead_count = Column(Integer, nullable=False, default=0)
+    enriched_count = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)  # lead_score > 0
+    score_sum = Column(BigInteger, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)  # lead_score IS NOT NULL
+
+    __table_args__ = (
+        UniqueConstraint("day", "source", "verification_status", "outreach_status", name="uq_lead_stats_key"),
+    )
+
+
+# One lead's contribution to its rollup row, signed: +1 for new rows, -1 for old
+_LEAD_STATS_DELTA = """
+            SELECT coalesce((created_at AT TIME ZONE 'UTC')::date, DATE '1970-01-01') AS day,
+                   coalesce(source, '') AS source,
+                   coalesce(verification_status, '') AS verification_status,
+                   coalesce(outreach_status, '') AS outreach_status,
+                   {sign} AS lead_count,
+                   {sign} * (coalesce(enriched, false))::int AS enriched_count,
+                   {sign} * (coalesce(lead_score, 0) > 0)::int AS scored_count,
+                   {sign} * coalesce(lead_score, 0)::bigint AS score_sum,
+                   {sign} * (lead_score IS NOT NULL)::int AS score_count
+            FROM {rows}"""
+
+# Net deltas per rollup row, upserted in key order so concurrent writers lock rows in the same order
+_LEAD_STATS_APPLY = """
+        INSERT INTO lead_stats AS s (
+            day, source, verification_status, outreach_status,
+            lead_count, enriched_count, scored_count, score_sum, score_count
+        )
+        SELECT day, source, verification_status, outreach_status,
+               sum(lead_count), sum(enriched_count), sum(scored_count), sum(score_sum), sum(score_count)
+        FROM ({deltas}
+        ) AS delta
+        GROUP BY day, source, verification_status, outreach_status
+        HAVING sum(lead_count) <> 0 OR sum(enriched_count) <> 0 OR sum(scored_count) <> 0
+            OR sum(score_sum) <> 0 OR sum(score_count) <> 0
+        ORDER BY day, source, verification_status, outreach_status
+        ON CONFLICT (day, source, verification_status, outreach_status) DO UPDATE SET
+            lead_count = s.lead_count + EXCLUDED.lead_count,
+            enriched_count = s.enriched_count + EXCLUDED.enriched_count,
+            scored_count = s.scored_count + EXCLUDED.scored_count,
+            score_sum = s.score_sum + EXCLUDED.score_sum,
+            score_count = s.score_count + EXCLUDED.score_count;"""
+
+_LEAD_STATS_INSERTED = _LEAD_STATS_DELTA.format(sign=1, rows="new_rows")
+_LEAD_STATS_DELETED = _LEAD_STATS_DELTA.format(sign=-1, rows="old_rows")
+
+LEAD_STATS_TRIGGERS_SQL = [
+    f"""
+CREATE OR REPLACE FUNCTION lead_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+{_LEAD_STATS_APPLY.format(deltas=_LEAD_STATS_INSERTED)}
+    ELSIF TG_OP = 'UPDATE' THEN
+{_LEAD_STATS_APPLY.format(deltas=_LEAD_STATS_INSERTED + " UNION ALL" + _LEAD_STATS_DELETED)}
+    ELSIF TG_OP = 'DELETE' THEN
+{_LEAD_STATS_APPLY.format(deltas=_LEAD_STATS_DELETED)}
+    ELSE
+        DELETE FROM lead_stats;
+    END IF;
+    RETURN NULL;
+END;
+$$""",
+    "DROP TRIGGER IF EXISTS lead_stats_insert ON leads",
+    "DROP TRIGGER IF EXISTS lead_stats_update ON leads",
+    "DROP TRIGGER IF EXISTS lead_stats_delete ON leads",
+    "DROP TRIGGER IF EXISTS lead_stats_truncate ON leads",
+    "CREATE TRIGGER lead_stats_insert AFTER INSERT ON leads REFERENCING NEW TABLE AS new_rows"
+    " FOR EACH STATEMENT EXECUTE PROCEDURE lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_update AFTER UPDATE ON leads REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    " FOR EACH STATEMENT EXECUTE PROCEDURE lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_delete AFTER DELETE ON leads REFERENCING OLD TABLE AS old_rows"
+    " FOR EACH STATEMENT EXECUTE PROCEDURE lead_stats_apply()",
+    "CREATE TRIGGER lead_stats_truncate AFTER TRUNCATE ON leads"
+    " FOR EACH STATEMENT EXECUTE PROCEDURE lead_stats_apply()",
+]
+
+# Rebuild the rollup from scratch, e.g. when the table is first created
+LEAD_STATS_REBUILD_SQL = [
+    "LOCK TABLE leads IN SHARE ROW EXCLUSIVE MODE",
+    "DELETE FROM lead_stats",
+    _LEAD_STATS_APPLY.format(deltas=_LEAD_STATS_DELTA.format(sign=1, rows="leads")).strip(),
+]
+
+
+# Lead search document and its trigram index (migration 007); app.services.lead_search.search_document()
+# must render exactly this expression for the planner to use the index
+LEAD_SEARCH_DOCUMENT_SQL = (
+    "lower(coalesce(email, '') || ' ' || coalesce(full_name, '') || ' ' || coalesce(first_name, '')"
+    " || ' ' || coalesce(last_name, '') || ' ' || coalesce(company_name, '') || ' ' || coalesce(title, ''))"
+)
+
+LEAD_SEARCH_INDEX_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_leads_search_trgm ON leads USING gin (({LEAD_SEARCH_DOCUMENT_SQL}) gin_trgm_ops)",
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_lead_search(target, connection, **kw):
+    # create_all-based setups: lead search needs pg_trgm and the trigram index. Both statements
+    # are idempotent, so this also covers databases whose leads table predates them.
+    if connection.dialect.name != "postgresql":
+        return
+    try:
+        for statement in LEAD_SEARCH_INDEX_SQL:
+            connection.execute(text(statement))
+    except Exception as e:
+        raise RuntimeError(
+            f"Lead search needs the pg_trgm extension and its index; create them as a superuser "
+            f"(see migration 007) or grant the privilege: {e}"
+        ) from e
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_lead_stats(target, connection, tables=(), **kw):
+    # create_all-based setups: install the triggers and seed the rollup when lead_stats is new
+    if connection.dialect.name != "postgresql" or LeadStats.__table__ not in tables:
+        return
+    for statement in LEAD_STATS_TRIGGERS_SQL + LEAD_STATS_REBUILD_SQL:
+        connection.execute(text(statement))
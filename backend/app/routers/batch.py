@@ -83,6 +83,7 @@ async def get_batch_status(
         valid_count=batch.valid_count,
         invalid_count=batch.invalid_count,
         unknown_count=batch.unknown_count,
+        dead_domain_count=batch.dead_domain_count or 0,
         progress_percent=progress,
         error_message=batch.error_message,
         created_at=batch.created_at,
@@ -145,6 +146,7 @@ async def list_batches(
                 valid_count=batch.valid_count,
                 invalid_count=batch.invalid_count,
                 unknown_count=batch.unknown_count,
+                dead_domain_count=batch.dead_domain_count or 0,
                 progress_percent=progress,
                 error_message=batch.error_message,
                 created_at=batch.created_at,
@@ -5,11 +5,9 @@ Dashboard router - aggregate stats, activity timeline, credit balances.
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, desc
+from sqlalchemy import case, desc
 
 from app.database import get_db
-from app.models.email import EmailVerification
-from app.models.enrichment import ContactEnrichment
 from app.models.batch import BatchJob
 from app.models.hubspot_sync import HubSpotSyncLog
 from app.models.linkedin import LinkedInScrapeJob
@@ -22,86 +20,8 @@ router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 @router.get("/stats")
 async def get_stats(db: Session = Depends(get_db)):
     """Aggregate counts: leads, verified, enriched, verification breakdown, enrichment coverage."""
-    total_verified = db.query(func.count(EmailVerification.id)).scalar() or 0
-
-    # Verification breakdown
-    verification_breakdown = dict(
-        db.query(
-            EmailVerification.status,
-            func.count(EmailVerification.id),
-        )
-        .group_by(EmailVerification.status)
-        .all()
-    )
-
-    # Unique emails verified
-    unique_verified = db.query(func.count(func.distinct(EmailVerification.email))).scalar() or 0
-
-    # Enrichment stats
-    total_enrichments = db.query(func.count(ContactEnrichment.id)).scalar() or 0
-    enriched_count = (
-        db.query(func.count(ContactEnrichment.id))
-        .filter(ContactEnrichment.enriched == True)
-        .scalar()
-        or 0
-    )
-    unique_enriched = (
-        db.query(func.count(func.distinct(ContactEnrichment.email)))
-        .filter(ContactEnrichment.enriched == True)
-        .scalar()
-        or 0
-    )
-
-    # Enrichment coverage: how many have phone, linkedin, company, title
-    coverage = {}
-    if total_enrichments > 0:
-        coverage["phone"] = (
-            db.query(func.count(ContactEnrichment.id))
-            .filter(ContactEnrichment.phone_numbers.isnot(None))
-            .scalar()
-            or 0
-        )
-        coverage["linkedin"] = (
-            db.query(func.count(ContactEnrichment.id))
-            .filter(ContactEnrichment.linkedin_url.isnot(None))
-            .scalar()
-            or 0
-        )
-        coverage["company"] = (
-            db.query(func.count(ContactEnrichment.id))
-            .filter(ContactEnrichment.company_name.isnot(None))
-            .scalar()
-            or 0
-        )
-        coverage["title"] = (
-            db.query(func.count(ContactEnrichment.id))
-            .filter(ContactEnrichment.title.isnot(None))
-            .scalar()
-            or 0
-        )
-    else:
-        coverage = {"phone": 0, "linkedin": 0, "company": 0, "title": 0}
-
-    # Batch stats
-    total_batches = db.query(func.count(BatchJob.id)).scalar() or 0
-    completed_batches = (
-        db.query(func.count(BatchJob.id))
-        .filter(BatchJob.status == "completed")
-        .scalar()
-        or 0
-    )
-
-    return {
-        "total_verified": total_verified,
-        "unique_verified": unique_verified,
-        "verification_breakdown": verification_breakdown,
-        "total_enrichments": total_enrichments,
-        "enriched_count": enriched_count,
-        "unique_enriched": unique_enriched,
-        "enrichment_coverage": coverage,
-        "total_batches": total_batches,
-        "completed_batches": completed_batches,
-    }
+    from app.services.stats import cached, dashboard_stats
+    return cached("dashboard", lambda: dashboard_stats(db))
 
 
 @router.get("/activity")
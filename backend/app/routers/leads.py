@@ -3,14 +3,12 @@ Leads router - central hub for all lead operations.
 Paginated listing, filtering, bulk actions, export, scoring config.
 """
 
-import csv
-import io
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, func, or_
+from sqlalchemy import desc, asc, null, or_, select
 
 from app.database import get_db
 from app.models.lead import Lead, ScoringConfig
@@ -24,9 +22,10 @@ from app.schemas.lead import (
     ProcessLeadsResponse,
     ScoringConfigResponse,
     ScoringConfigUpdate,
+    ScoringSimulationRequest,
+    ScoringSimulationResponse,
 )
-from app.services.scoring import rescore_all_leads, DEFAULT_CONFIG
-from app.services.lead_manager import backfill_leads
+from app.services.scoring import DEFAULT_CONFIG
 
 router = APIRouter(prefix="/api/leads", tags=["leads"])
 
@@ -42,26 +41,31 @@ async def list_leads(
     score_min: Optional[int] = Query(None, ge=0, le=100),
     score_max: Optional[int] = Query(None, ge=0, le=100),
     enriched: Optional[bool] = None,
-    sort_by: str = Query("created_at", regex="^(created_at|lead_score|email|company_name|verification_status)$"),
+    sort_by: str = Query("created_at", regex="^(created_at|lead_score|email|company_name|verification_status|relevance)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    count: str = Query("exact", regex="^(exact|estimate|none)$"),
     db: Session = Depends(get_db),
 ):
-    """Paginated, filterable, sortable lead listing."""
+    """
+    Paginated, filterable, sortable lead listing.
+
+    Pages by offset (page) or, when a cursor is given, by keyset on
+    (sort_by, id). Every response carries the next_cursor. With
+    count=estimate the total comes from the query planner, and with
+    count=none it is skipped. sort_by=relevance ranks search matches.
+    """
+    from app.services.lead_search import search_filter, search_rank
+    from app.services.pagination import decode_cursor, encode_cursor, estimate_count, keyset_filter
+
+    if sort_by == "relevance" and not search:
+        raise HTTPException(status_code=400, detail="sort_by=relevance requires a search term")
+
     query = db.query(Lead)
 
     # Filters
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Lead.email.ilike(search_term),
-                Lead.full_name.ilike(search_term),
-                Lead.first_name.ilike(search_term),
-                Lead.last_name.ilike(search_term),
-                Lead.company_name.ilike(search_term),
-                Lead.title.ilike(search_term),
-            )
-        )
+        query = query.filter(search_filter(search))
 
     if source:
         query = query.filter(Lead.source == source)
@@ -82,69 +86,75 @@ async def list_leads(
         query = query.filter(Lead.enriched == enriched)
 
     # Count total
-    total = query.count()
-
-    # Sort
-    sort_column = getattr(Lead, sort_by)
+    total = None
+    if count == "exact":
+        total = query.count()
+    elif count == "estimate":
+        total = estimate_count(db, query)
+
+    # Sort, with id as tie-breaker so keyset pages are stable. NULL placement
+    # is spelled out to match keyset_filter (and Postgres' default).
+    if sort_by == "relevance":
+        sort_column = search_rank(search)
+        query = query.add_columns(sort_column)
+    else:
+        sort_column = getattr(Lead, sort_by)
     if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
+        query = query.order_by(desc(sort_column).nulls_first(), desc(Lead.id))
     else:
-        query = query.order_by(asc(sort_column))
+        query = query.order_by(asc(sort_column).nulls_last(), asc(Lead.id))
 
     # Paginate
-    offset = (page - 1) * page_size
-    leads = query.offset(offset).limit(page_size).all()
-    total_pages = (total + page_size - 1) // page_size
+    if cursor:
+        try:
+            after_value, after_id = decode_cursor(cursor, sort_by, sort_order, sort_column)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.filter(keyset_filter(sort_column, Lead.id, sort_order, after_value, after_id))
+    else:
+        query = query.offset((page - 1) * page_size)
+    rows = query.limit(page_size).all()
+    if sort_by == "relevance":
+        leads = [lead for lead, _ in rows]
+        sort_values = [rank for _, rank in rows]
+    else:
+        leads = rows
+        sort_values = [getattr(lead, sort_by) for lead in leads]
+
+    next_cursor = None
+    if len(leads) == page_size:
+        next_cursor = encode_cursor(sort_by, sort_order, sort_values[-1], leads[-1].id)
 
     return LeadListResponse(
         leads=[LeadResponse.model_validate(lead) for lead in leads],
         total=total,
+        total_estimated=count == "estimate" and total is not None,
         page=page,
         page_size=page_size,
-        total_pages=total_pages,
+        total_pages=(total + page_size - 1) // page_size if total is not None else None,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/pipeline-summary")
 async def pipeline_summary(db: Session = Depends(get_db)):
     """Counts at each pipeline stage."""
-    total = db.query(func.count(Lead.id)).scalar() or 0
-    verified = (
-        db.query(func.count(Lead.id))
-        .filter(Lead.verification_status.isnot(None))
-        .scalar() or 0
-    )
-    valid = (
-        db.query(func.count(Lead.id))
-        .filter(Lead.verification_status == "valid")
-        .scalar() or 0
-    )
-    enriched = (
-        db.query(func.count(Lead.id))
-        .filter(Lead.enriched == True)
-        .scalar() or 0
-    )
-    scored = (
-        db.query(func.count(Lead.id))
-        .filter(Lead.lead_score > 0)
-        .scalar() or 0
-    )
-    outreach = (
-        db.query(func.count(Lead.id))
-        .filter(Lead.outreach_status.isnot(None))
-        .scalar() or 0
-    )
-    avg_score = db.query(func.avg(Lead.lead_score)).scalar() or 0
+    from app.services.stats import cached, lead_pipeline_stats
+    return cached("pipeline_summary", lambda: lead_pipeline_stats(db))
 
-    return {
-        "imported": total,
-        "verified": verified,
-        "valid": valid,
-        "enriched": enriched,
-        "scored": scored,
-        "outreach": outreach,
-        "avg_score": round(avg_score, 1),
-    }
+
+@router.get("/stats/timeseries")
+async def lead_stats_timeseries(
+    days: int = Query(30, ge=1, le=366),
+    group_by: Optional[str] = Query(None, regex="^(source|verification_status|outreach_status)$"),
+    db: Session = Depends(get_db),
+):
+    """Daily pipeline stage counts by lead creation date, optionally split by one dimension."""
+    from app.services.stats import cached, lead_timeseries
+    return cached(
+        f"lead_timeseries:{days}:{group_by or ''}",
+        lambda: {"days": days, "group_by": group_by, "series": lead_timeseries(db, days, group_by)},
+    )
 
 
 @router.get("/export")
@@ -155,25 +165,9 @@ async def export_leads(
     verification_status: Optional[str] = None,
     score_min: Optional[int] = None,
     score_max: Optional[int] = None,
-    db: Session = Depends(get_db),
 ):
-    """CSV export with column selection."""
-    query = db.query(Lead)
-
-    if lead_ids:
-        ids = [int(x.strip()) for x in lead_ids.split(",") if x.strip()]
-        query = query.filter(Lead.id.in_(ids))
-
-    if source:
-        query = query.filter(Lead.source == source)
-    if verification_status:
-        query = query.filter(Lead.verification_status == verification_status)
-    if score_min is not None:
-        query = query.filter(Lead.lead_score >= score_min)
-    if score_max is not None:
-        query = query.filter(Lead.lead_score <= score_max)
-
-    leads = query.all()
+    """CSV export with column selection, streamed as it is read."""
+    from app.services.export import stream_csv
 
     default_columns = [
         "email", "first_name", "last_name", "full_name", "title", "phone",
@@ -187,17 +181,28 @@ async def export_leads(
     else:
         selected = default_columns
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(selected)
+    # Unknown columns export as empty cells; positional labels keep repeated columns
+    lead_columns = Lead.__table__.columns
+    query = select(*[
+        (lead_columns[col] if col in lead_columns else null()).label(f"col_{i}")
+        for i, col in enumerate(selected)
+    ]).order_by(Lead.id)
 
-    for lead in leads:
-        row = [getattr(lead, col, "") for col in selected]
-        writer.writerow(row)
+    if lead_ids:
+        ids = [int(x.strip()) for x in lead_ids.split(",") if x.strip()]
+        query = query.where(Lead.id.in_(ids))
+
+    if source:
+        query = query.where(Lead.source == source)
+    if verification_status:
+        query = query.where(Lead.verification_status == verification_status)
+    if score_min is not None:
+        query = query.where(Lead.lead_score >= score_min)
+    if score_max is not None:
+        query = query.where(Lead.lead_score <= score_max)
 
-    output.seek(0)
     return StreamingResponse(
-        output,
+        stream_csv(query, selected),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename=leads_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"},
     )
@@ -241,9 +246,39 @@ async def update_scoring_config(
 
     db.commit()
     db.refresh(config)
+
+    # Every API process and worker drops its cached copy
+    from app.services.scoring_config_cache import get_scoring_config_cache
+    get_scoring_config_cache().invalidate(config.config)
     return config
 
 
+@router.post("/scoring-simulation", response_model=ScoringSimulationResponse)
+def simulate_scoring_config(
+    request: ScoringSimulationRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Evaluate a candidate scoring config against all leads without saving it.
+
+    Compares the score distribution, per-category points and threshold
+    counts with the active config. A plain def: loading the snapshot and
+    scoring it is blocking work, so FastAPI runs it in the threadpool.
+    """
+    from app.services.scoring_simulation import simulate_scoring
+
+    try:
+        return simulate_scoring(
+            db,
+            request.config,
+            thresholds=request.thresholds,
+            bins=request.bins,
+            refresh=request.refresh,
+        )
+    except (TypeError, ValueError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid scoring config: {e}")
+
+
 @router.get("/{lead_id}", response_model=LeadDetailResponse)
 async def get_lead(lead_id: int, db: Session = Depends(get_db)):
     """Get lead detail with score breakdown."""
@@ -262,11 +297,8 @@ async def bulk_action(request: BulkActionRequest, db: Session = Depends(get_db))
         raise HTTPException(status_code=404, detail="No leads found with given IDs")
 
     if request.action == "score":
-        from app.services.scoring import score_and_update_lead, get_active_config
-        config = get_active_config(db)
-        for lead in leads:
-            score_and_update_lead(lead, db, config)
-        db.commit()
+        from app.services.scoring_engine import rescore_leads
+        rescore_leads(db, lead_ids=[lead.id for lead in leads], force=True)
         return BulkActionResponse(
             action="score",
             affected=len(leads),
@@ -382,13 +414,77 @@ async def process_leads(request: ProcessLeadsRequest, db: Session = Depends(get_
 
 @router.post("/backfill")
 async def backfill(db: Session = Depends(get_db)):
-    """Populate leads from existing verification and enrichment data."""
-    result = backfill_leads(db)
-    return result
+    """
+    Populate leads from existing verification and enrichment data.
+
+    Runs in the background; poll /api/progress/{batch_id} for progress.
+    """
+    from app.models.batch import BatchJob
+    from app.tasks.leads import find_running_job
+
+    running = find_running_job(db, "backfill")
+    if running:
+        return {
+            "batch_id": running.id,
+            "status": running.status,
+            "message": "A backfill is already running",
+        }
+
+    batch = BatchJob(
+        filename="backfill",
+        status="pending",
+        source="backfill",
+    )
+    db.add(batch)
+    db.commit()
+    db.refresh(batch)
+
+    from app.tasks.leads import backfill_leads_task
+    backfill_leads_task.delay(batch.id)
+
+    return {
+        "batch_id": batch.id,
+        "status": "queued",
+        "message": "Backfill started",
+    }
 
 
 @router.post("/rescore")
-async def rescore(db: Session = Depends(get_db)):
-    """Recalculate all lead scores."""
-    count = rescore_all_leads(db)
-    return {"rescored": count, "message": f"Rescored {count} leads"}
+async def rescore(
+    force: bool = Query(False, description="Rescore every lead, not only stale ones"),
+    db: Session = Depends(get_db),
+):
+    """
+    Recalculate scores of leads scored with another scoring config or whose
+    inputs changed since.
+
+    Runs in the background; poll /api/progress/{batch_id} for progress.
+    """
+    from app.models.batch import BatchJob
+    from app.tasks.leads import find_running_job
+
+    running = find_running_job(db, "rescore")
+    if running:
+        return {
+            "batch_id": running.id,
+            "status": running.status,
+            "message": "A rescore is already running",
+        }
+
+    batch = BatchJob(
+        filename="rescore",
+        status="pending",
+        source="rescore",
+    )
+    db.add(batch)
+    db.commit()
+    db.refresh(batch)
+
+    from app.tasks.leads import rescore_leads_task
+    rescore_leads_task.delay(batch.id, force)
+
+    return {
+        "batch_id": batch.id,
+        "status": "queued",
+        "message": "Rescore started",
+    }
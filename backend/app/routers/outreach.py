@@ -2,15 +2,13 @@
 Outreach router - Instantly.ai integration for pushing leads to campaigns.
 """
 
-import csv
-import io
 import logging
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 
 from app.database import get_db
 from app.models.lead import Lead
@@ -226,51 +224,41 @@ async def get_logs(
 
 
 @router.post("/export")
-async def smart_export(request: ExportFormatRequest, db: Session = Depends(get_db)):
-    """Smart CSV export formatted for specific outreach tools."""
-    query = db.query(Lead)
+async def smart_export(request: ExportFormatRequest):
+    """
+    Smart CSV export formatted for specific outreach tools.
+
+    Streamed as it is read, reading only the layout's columns; gzip
+    compressed when requested.
+    """
+    from app.services.export import gzip_stream, outreach_layout, stream_csv
+
+    columns, headers = outreach_layout(request.format)
+    query = select(*[getattr(Lead, col) for col in columns]).order_by(Lead.id)
 
     if request.lead_ids:
-        query = query.filter(Lead.id.in_(request.lead_ids))
+        query = query.where(Lead.id.in_(request.lead_ids))
 
     if request.filters:
         if request.filters.get("source"):
-            query = query.filter(Lead.source == request.filters["source"])
+            query = query.where(Lead.source == request.filters["source"])
         if request.filters.get("verification_status"):
-            query = query.filter(Lead.verification_status == request.filters["verification_status"])
+            query = query.where(Lead.verification_status == request.filters["verification_status"])
         if request.filters.get("score_min"):
-            query = query.filter(Lead.lead_score >= request.filters["score_min"])
-
-    leads = query.all()
-
-    # Format presets
-    if request.format == "instantly":
-        columns = ["email", "first_name", "last_name", "company_name", "title", "phone", "linkedin_url"]
-        headers = ["Email", "First Name", "Last Name", "Company Name", "Title", "Phone", "LinkedIn URL"]
-    elif request.format == "lemlist":
-        columns = ["email", "first_name", "last_name", "company_name", "linkedin_url"]
-        headers = ["email", "firstName", "lastName", "companyName", "linkedinUrl"]
-    else:
-        columns = [
-            "email", "first_name", "last_name", "full_name", "title", "phone",
-            "linkedin_url", "company_name", "company_domain", "company_industry",
-            "company_size", "seniority", "verification_status", "lead_score",
-        ]
-        headers = columns
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(headers)
-
-    for lead in leads:
-        row = [getattr(lead, col, "") or "" for col in columns]
-        writer.writerow(row)
-
-    output.seek(0)
+            query = query.where(Lead.lead_score >= request.filters["score_min"])
+
+    # Outreach tools get empty cells for every falsy value (0 included), as before
+    rows = stream_csv(query, headers, transform=lambda row: [value or "" for value in row])
+
+    filename = f"leads_{request.format}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
+    if request.gzip:
+        return StreamingResponse(
+            gzip_stream(rows),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f"attachment; filename={filename}.gz"},
+        )
     return StreamingResponse(
-        output,
+        rows,
         media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=leads_{request.format}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-        },
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -27,6 +27,7 @@ async def get_progress(batch_id: int, db: Session = Depends(get_db)):
         "valid_count": batch.valid_count,
         "invalid_count": batch.invalid_count,
         "unknown_count": batch.unknown_count,
+        "dead_domain_count": batch.dead_domain_count or 0,
         "percent": (
             int((batch.processed_emails / batch.total_emails) * 100)
             if batch.total_emails > 0
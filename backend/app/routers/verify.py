@@ -10,6 +10,7 @@ from app.schemas.email import (
 )
 from app.services.verification import get_verification_service
 from app.services.zerobounce import ZeroBounceError
+from app.services.verification_cache import get_verification_cache
 
 router = APIRouter(prefix="/api/verify", tags=["verification"])
 
@@ -23,7 +24,7 @@ async def verify_single_email(
     Verify a single email address.
 
     Returns detailed verification status from ZeroBounce.
-    Results are cached for 24 hours.
+    Results are cached in-process, in Redis and in the database.
     """
     service = get_verification_service(db)
 
@@ -98,3 +99,9 @@ async def verify_batch_emails(
         )
     except ZeroBounceError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """Hit/miss counters for this process's verification cache."""
+    return get_verification_cache().stats()
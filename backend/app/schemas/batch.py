@@ -18,6 +18,7 @@ class BatchJobStatus(BaseModel):
     valid_count: int
     invalid_count: int
     unknown_count: int
+    dead_domain_count: int = 0
     progress_percent: float
     error_message: Optional[str] = None
     created_at: datetime
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 class LeadResponse(BaseModel):
@@ -48,10 +48,12 @@ class LeadDetailResponse(LeadResponse):
 
 class LeadListResponse(BaseModel):
     leads: list[LeadResponse]
-    total: int
+    total: Optional[int] = None  # None when counting was skipped
+    total_estimated: bool = False  # total is a planner estimate
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as cursor to get the following page
 
 
 class BulkActionRequest(BaseModel):
@@ -97,3 +99,18 @@ class ScoringConfigResponse(BaseModel):
 
 class ScoringConfigUpdate(BaseModel):
     config: dict
+
+
+class ScoringSimulationRequest(BaseModel):
+    config: dict
+    thresholds: list[int] = [50, 70]
+    bins: int = Field(10, ge=1, le=100)
+    refresh: bool = False  # Reload the cached lead snapshot first
+
+
+class ScoringSimulationResponse(BaseModel):
+    lead_count: int
+    snapshot_age_seconds: float
+    histogram: list[dict]  # [{ min, max, active, candidate }]
+    breakdown: dict  # { active: { average, email_quality, ... }, candidate: { ... } }
+    thresholds: list[dict]  # [{ threshold, active, candidate, gained, lost }]
@@ -55,3 +55,4 @@ class ExportFormatRequest(BaseModel):
     lead_ids: Optional[list[int]] = None
     format: str = "instantly"  # instantly, lemlist, general
     filters: Optional[dict] = None
+    gzip: bool = False  # Return a gzip-compressed .csv.gz
@@ -1,3 +1,4 @@
+import asyncio
 import httpx
 from typing import Optional
 from datetime import datetime
@@ -24,6 +25,24 @@ class ApolloService:
     def __init__(self):
         self.settings = get_settings()
         self.api_key = self.settings.apollo_api_key
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared pooled client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(timeout=30.0)
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled client if it belongs to the running loop."""
+        client, client_loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client is not None and not client.is_closed and client_loop is asyncio.get_running_loop():
+            await client.aclose()
 
     async def enrich_person(self, email: str) -> dict:
         """
@@ -38,34 +57,33 @@ class ApolloService:
         if not self.api_key:
             raise ApolloError("Apollo API key not configured")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.BASE_URL}/people/match",
-                headers={
-                    "Content-Type": "application/json",
-                    "Cache-Control": "no-cache",
-                },
-                json={
-                    "api_key": self.api_key,
-                    "email": email,
-                },
-            )
+        response = await self._get_client().post(
+            f"{self.BASE_URL}/people/match",
+            headers={
+                "Content-Type": "application/json",
+                "Cache-Control": "no-cache",
+            },
+            json={
+                "api_key": self.api_key,
+                "email": email,
+            },
+        )
 
-            if response.status_code == 401:
-                raise ApolloError("Invalid Apollo API key")
+        if response.status_code == 401:
+            raise ApolloError("Invalid Apollo API key")
 
-            if response.status_code == 429:
-                raise ApolloError("Apollo API rate limit exceeded")
+        if response.status_code == 429:
+            raise ApolloError("Apollo API rate limit exceeded")
 
-            if response.status_code != 200:
-                raise ApolloError(f"Apollo API request failed: {response.status_code}")
+        if response.status_code != 200:
+            raise ApolloError(f"Apollo API request failed: {response.status_code}")
 
-            data = response.json()
+        data = response.json()
 
-            if not data.get("person"):
-                return self._empty_result(email)
+        if not data.get("person"):
+            return self._empty_result(email)
 
-            return self._parse_person_response(email, data["person"])
+        return self._parse_person_response(email, data["person"])
 
     async def enrich_bulk(self, emails: list[str]) -> list[dict]:
         """
@@ -291,44 +309,43 @@ class ApolloService:
         if person_seniorities:
             payload["person_seniorities"] = person_seniorities
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.BASE_URL}/mixed_people/search",
-                headers={
-                    "Content-Type": "application/json",
-                    "Cache-Control": "no-cache",
-                },
-                json=payload,
-            )
+        response = await self._get_client().post(
+            f"{self.BASE_URL}/mixed_people/search",
+            headers={
+                "Content-Type": "application/json",
+                "Cache-Control": "no-cache",
+            },
+            json=payload,
+        )
 
-            if response.status_code == 401:
-                raise ApolloError("Invalid Apollo API key")
+        if response.status_code == 401:
+            raise ApolloError("Invalid Apollo API key")
 
-            if response.status_code == 429:
-                raise ApolloError("Apollo API rate limit exceeded")
+        if response.status_code == 429:
+            raise ApolloError("Apollo API rate limit exceeded")
 
-            if response.status_code != 200:
-                raise ApolloError(f"Apollo search failed: {response.status_code}")
+        if response.status_code != 200:
+            raise ApolloError(f"Apollo search failed: {response.status_code}")
 
-            data = response.json()
-            people = data.get("people") or []
-            pagination = data.get("pagination") or {}
-
-            # Parse each person and filter out those without emails
-            contacts = []
-            for person in people:
-                email = person.get("email")
-                if not email:
-                    continue
-                contacts.append(self._parse_person_response(email, person))
-
-            return {
-                "contacts": contacts,
-                "total_entries": pagination.get("total_entries", 0),
-                "per_page": pagination.get("per_page", per_page),
-                "page": pagination.get("page", page),
-                "total_pages": pagination.get("total_pages", 0),
-            }
+        data = response.json()
+        people = data.get("people") or []
+        pagination = data.get("pagination") or {}
+
+        # Parse each person and filter out those without emails
+        contacts = []
+        for person in people:
+            email = person.get("email")
+            if not email:
+                continue
+            contacts.append(self._parse_person_response(email, person))
+
+        return {
+            "contacts": contacts,
+            "total_entries": pagination.get("total_entries", 0),
+            "per_page": pagination.get("per_page", per_page),
+            "page": pagination.get("page", page),
+            "total_pages": pagination.get("total_pages", 0),
+        }
 
     def _empty_result(self, email: str) -> dict:
         """Return empty result for non-matched emails."""
@@ -348,3 +365,9 @@ def get_apollo_service() -> ApolloService:
     if _apollo_service is None:
         _apollo_service = ApolloService()
     return _apollo_service
+
+
+async def close_apollo_service() -> None:
+    """Release the singleton's pooled connections (called at shutdown)."""
+    if _apollo_service is not None:
+        await _apollo_service.aclose()
@@ -0,0 +1,47 @@
+"""
+Bounded-concurrency helpers for fanning out provider calls.
+
+Results always come back in input order; an exception raised for one item
+is handed to the caller's error handler instead of cancelling the rest.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+
+async def bounded_gather(
+    items: Sequence[Any],
+    worker: Callable[[Any], Awaitable[Any]],
+    limit: int,
+    on_error: Callable[[Any, Exception], Any],
+    on_result: Optional[Callable[[int, Any], None]] = None,
+) -> list:
+    """
+    Run ``worker`` over ``items`` keeping at most ``limit`` calls in flight.
+
+    Args:
+        items: Inputs to process
+        worker: Coroutine function called once per item
+        limit: Maximum number of concurrent calls (values < 1 mean 1)
+        on_error: Builds the result for an item whose worker raised
+        on_result: Optional callback invoked as ``(index, result)`` as each
+            item completes (completion order, not input order)
+
+    Returns:
+        List of results in the same order as ``items``
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+    results: list = [None] * len(items)
+
+    async def run(index: int, item: Any) -> None:
+        async with semaphore:
+            try:
+                result = await worker(item)
+            except Exception as e:
+                result = on_error(item, e)
+        results[index] = result
+        if on_result is not None:
+            on_result(index, result)
+
+    await asyncio.gather(*(run(i, item) for i, item in enumerate(items)))
+    return results
@@ -0,0 +1,187 @@
+"""
+Domain-level negative cache for verification.
+
+Once ZeroBounce (or the local MX check) reports that a domain has no mail
+servers, every other address on it is bound to fail the same way. Dead
+domains are remembered in Redis with a TTL so that the remaining addresses
+in a batch, and in later batches on any worker, are resolved locally
+instead of being sent upstream. Verdicts are seeded from existing
+EmailVerification rows by VerificationService.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import redis
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "verification:domain:"
+
+# After a Redis error the shared tier is skipped for this many seconds
+REDIS_RETRY_SECONDS = 30.0
+
+DEAD_DOMAIN_SUB_STATUS = "local_dead_domain"
+
+# Sub-statuses that prove the domain has no mail servers
+DEAD_DOMAIN_SUB_STATUSES = frozenset({"no_dns_entries", "local_no_mx", DEAD_DOMAIN_SUB_STATUS})
+
+# Invalid sub-statuses about the address itself, which say nothing about its domain
+ADDRESS_SUB_STATUSES = frozenset({
+    "failed_syntax_check",
+    "possible_typo",
+    "leading_period_removed",
+    "mailbox_not_found",
+    "mailbox_quota_exceeded",
+    "local_syntax_error",
+})
+
+
+def result_domain(result: dict) -> Optional[str]:
+    domain = result.get("domain") or result.get("email", "").rpartition("@")[2]
+    return domain.lower() if domain else None
+
+
+def is_dead_domain_result(result: dict) -> bool:
+    """Whether a verification result proves the domain cannot receive mail."""
+    sub_status = result.get("sub_status")
+    if sub_status in DEAD_DOMAIN_SUB_STATUSES:
+        return True
+    # mx_found is None when ZeroBounce left it empty (as it does for syntax failures)
+    return (
+        result.get("status") == "invalid"
+        and result.get("mx_found") is False
+        and sub_status not in ADDRESS_SUB_STATUSES
+    )
+
+
+def dead_domain_result(email: str) -> dict:
+    """Local result for an address on a domain known to be dead."""
+    return {
+        "email": email,
+        "status": "invalid",
+        "sub_status": DEAD_DOMAIN_SUB_STATUS,
+        "score": None,
+        "free_email": None,
+        "did_you_mean": None,
+        "domain": email.rpartition("@")[2] or None,
+        "domain_age_days": None,
+        "smtp_provider": None,
+        "mx_found": False,
+        "mx_record": None,
+        "verified_at": datetime.utcnow(),
+    }
+
+
+class DomainVerdictCache:
+    """Dead-domain set kept in process memory and, optionally, in Redis."""
+
+    def __init__(self, ttl: int, client: Optional[redis.Redis]):
+        self.ttl = ttl
+        self.client = client
+        self._local: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._disabled_until = 0.0
+
+    @property
+    def _shared(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._disabled_until
+
+    def _fail(self, error: Exception) -> None:
+        logger.warning(f"Domain cache: Redis unavailable, skipping for {REDIS_RETRY_SECONDS:.0f}s: {error}")
+        self._disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def is_dead(self, domain: str) -> bool:
+        return domain in self.dead_domains([domain])
+
+    def dead_domains(self, domains: list[str]) -> set[str]:
+        """Return the subset of domains currently known to be dead."""
+        now = time.monotonic()
+        dead = set()
+        remaining = []
+        with self._lock:
+            for domain in domains:
+                expires_at = self._local.get(domain)
+                if expires_at is not None and expires_at > now:
+                    dead.add(domain)
+                else:
+                    self._local.pop(domain, None)
+                    remaining.append(domain)
+
+        if remaining and self._shared:
+            try:
+                flags = self.client.mget([KEY_PREFIX + domain for domain in remaining])
+            except redis.RedisError as e:
+                self._fail(e)
+                return dead
+            found = [domain for domain, flag in zip(remaining, flags) if flag is not None]
+            with self._lock:
+                for domain in found:
+                    self._local[domain] = now + self.ttl
+            dead.update(found)
+
+        return dead
+
+    def mark_dead(self, domains: set[str]) -> None:
+        if not domains or self.ttl <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for domain in domains:
+                self._local[domain] = expires_at
+        if self._shared:
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                for domain in domains:
+                    pipe.set(KEY_PREFIX + domain, "1", ex=self.ttl)
+                pipe.execute()
+            except redis.RedisError as e:
+                self._fail(e)
+
+    def clear(self, domains: set[str]) -> None:
+        if not domains:
+            return
+        with self._lock:
+            for domain in domains:
+                self._local.pop(domain, None)
+        if self._shared:
+            try:
+                self.client.delete(*[KEY_PREFIX + domain for domain in domains])
+            except redis.RedisError as e:
+                self._fail(e)
+
+    def learn(self, results: list[dict]) -> None:
+        """Update verdicts from fresh verification results."""
+        dead = set()
+        alive = set()
+        for result in results:
+            domain = result_domain(result)
+            if not domain:
+                continue
+            if is_dead_domain_result(result):
+                dead.add(domain)
+            elif result.get("status") == "valid":
+                alive.add(domain)
+        self.mark_dead(dead)
+        # A deliverable address means the domain has come back to life
+        self.clear(alive - dead)
+
+
+# Singleton instance
+_domain_cache: Optional[DomainVerdictCache] = None
+
+
+def get_domain_cache() -> DomainVerdictCache:
+    global _domain_cache
+    if _domain_cache is None:
+        settings = get_settings()
+        client = None
+        if settings.verification_cache_redis:
+            client = redis.Redis.from_url(settings.redis_url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        _domain_cache = DomainVerdictCache(settings.domain_verdict_ttl_seconds, client)
+    return _domain_cache
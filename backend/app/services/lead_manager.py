@@ -7,15 +7,27 @@ one Lead record is created/updated.
 """
 
 import logging
-from typing import Optional
+from types import SimpleNamespace
+from typing import Callable, Optional
+from sqlalchemy import JSON, Integer, Text, case, cast, false, func, literal, literal_column, null, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.models.lead import Lead
 from app.models.email import EmailVerification
 from app.models.enrichment import ContactEnrichment
-from app.services.scoring import score_and_update_lead
+from app.services.scoring import get_active_config, score_and_update_lead
 
 logger = logging.getLogger(__name__)
 
+# Emails per IN query / upsert statement in the bulk variants
+UPSERT_CHUNK_SIZE = 500
+
+# Enrichment records per lead upsert in EnrichmentLeadBuffer
+ENRICHMENT_FLUSH_SIZE = 100
+
+# Rows per chunk (and per commit) in backfill_leads
+BACKFILL_CHUNK_SIZE = 5000
+
 
 def upsert_lead_from_verification(
     db: Session,
@@ -46,6 +58,96 @@ def upsert_lead_from_verification(
     return lead
 
 
+def upsert_leads_from_verifications(
+    db: Session,
+    verifications: list[EmailVerification],
+    source: str = "csv",
+    config: Optional[dict] = None,
+) -> int:
+    """
+    Bulk variant of upsert_lead_from_verification.
+
+    Existing leads are loaded with one IN query per chunk, every lead is
+    scored with the config loaded once, and the rows are written with a
+    single INSERT ... ON CONFLICT (email) DO UPDATE per chunk. The caller
+    commits.
+
+    Returns:
+        Number of leads written
+    """
+    if config is None:
+        config = get_active_config(db)
+
+    # One row per email; the last verification wins, as with sequential upserts
+    latest = {}
+    for verification in verifications:
+        latest[verification.email.lower().strip()] = verification
+    emails = list(latest)
+
+    written = 0
+    for start in range(0, len(emails), UPSERT_CHUNK_SIZE):
+        chunk = emails[start:start + UPSERT_CHUNK_SIZE]
+        existing = {lead.email: lead for lead in db.query(Lead).filter(Lead.email.in_(chunk))}
+
+        rows = []
+        for email in chunk:
+            verification = latest[email]
+            lead = _lead_snapshot(existing.get(email), email, source)
+            lead.verification_status = verification.status
+            lead.verification_sub_status = verification.sub_status
+            lead.verification_score = verification.score
+            lead.latest_verification_id = verification.id
+            score_and_update_lead(lead, db, config)
+            rows.append({
+                "email": email,
+                "source": lead.source,
+                "enriched": lead.enriched,
+                "verification_status": lead.verification_status,
+                "verification_sub_status": lead.verification_sub_status,
+                "verification_score": lead.verification_score,
+                "latest_verification_id": lead.latest_verification_id,
+                "lead_score": lead.lead_score,
+                "score_breakdown": lead.score_breakdown,
+                "scoring_config_version": lead.scoring_config_version,
+                "scoring_input_hash": lead.scoring_input_hash,
+            })
+
+        stmt = pg_insert(Lead)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Lead.email],
+                set_={
+                    "verification_status": stmt.excluded.verification_status,
+                    "verification_sub_status": stmt.excluded.verification_sub_status,
+                    "verification_score": stmt.excluded.verification_score,
+                    "latest_verification_id": stmt.excluded.latest_verification_id,
+                    "lead_score": stmt.excluded.lead_score,
+                    "score_breakdown": stmt.excluded.score_breakdown,
+                    "scoring_config_version": stmt.excluded.scoring_config_version,
+                    "scoring_input_hash": stmt.excluded.scoring_input_hash,
+                    "updated_at": func.now(),
+                },
+            ),
+            rows,
+        )
+        # Loaded leads would otherwise shadow the rows just written
+        for lead in existing.values():
+            db.expire(lead)
+        written += len(rows)
+
+    return written
+
+
+def _lead_snapshot(lead: Optional[Lead], email: str, source: str) -> SimpleNamespace:
+    """Detached copy of a lead's columns (or a new lead's defaults) to merge and score."""
+    if lead is None:
+        values = {column.key: None for column in Lead.__table__.columns}
+        values.update(email=email, source=source, enriched=False)
+    else:
+        values = {column.key: getattr(lead, column.key) for column in Lead.__table__.columns}
+    return SimpleNamespace(**values)
+
+
 def upsert_lead_from_enrichment(
     db: Session,
     email: str,
@@ -62,6 +164,27 @@ def upsert_lead_from_enrichment(
         lead = Lead(email=email.lower().strip(), source=source or "csv")
         db.add(lead)
 
+    _apply_enrichment(lead, enrichment, source)
+
+    # Score the lead
+    score_and_update_lead(lead, db)
+
+    db.commit()
+    db.refresh(lead)
+    return lead
+
+
+# Lead columns an enrichment can fill in; a new non-null value wins over the old one
+ENRICHMENT_FIELDS = [
+    "first_name", "last_name", "full_name", "title", "headline", "linkedin_url",
+    "seniority", "city", "state", "country", "departments", "phone_numbers",
+    "company_name", "company_domain", "company_industry", "company_size",
+    "company_location",
+]
+
+
+def _apply_enrichment(lead, enrichment: ContactEnrichment, source: Optional[str]) -> None:
+    """Merge an enrichment record into a Lead (or a lead snapshot)."""
     if source:
         lead.source = source
 
@@ -69,23 +192,8 @@ def upsert_lead_from_enrichment(
     lead.latest_enrichment_id = enrichment.id
 
     if enrichment.enriched:
-        lead.first_name = enrichment.first_name or lead.first_name
-        lead.last_name = enrichment.last_name or lead.last_name
-        lead.full_name = enrichment.full_name or lead.full_name
-        lead.title = enrichment.title or lead.title
-        lead.headline = enrichment.headline or lead.headline
-        lead.linkedin_url = enrichment.linkedin_url or lead.linkedin_url
-        lead.seniority = enrichment.seniority or lead.seniority
-        lead.city = enrichment.city or lead.city
-        lead.state = enrichment.state or lead.state
-        lead.country = enrichment.country or lead.country
-        lead.departments = enrichment.departments or lead.departments
-        lead.phone_numbers = enrichment.phone_numbers or lead.phone_numbers
-        lead.company_name = enrichment.company_name or lead.company_name
-        lead.company_domain = enrichment.company_domain or lead.company_domain
-        lead.company_industry = enrichment.company_industry or lead.company_industry
-        lead.company_size = enrichment.company_size or lead.company_size
-        lead.company_location = enrichment.company_location or lead.company_location
+        for field in ENRICHMENT_FIELDS:
+            setattr(lead, field, getattr(enrichment, field) or getattr(lead, field))
 
         # Extract primary phone
         if enrichment.phone_numbers and len(enrichment.phone_numbers) > 0:
@@ -94,121 +202,292 @@ def upsert_lead_from_enrichment(
             else:
                 lead.phone = str(enrichment.phone_numbers[0])
 
-    # Score the lead
-    score_and_update_lead(lead, db)
 
-    db.commit()
-    db.refresh(lead)
-    return lead
+def upsert_leads_from_enrichments(
+    db: Session,
+    enrichments: list[ContactEnrichment],
+    source: Optional[str] = None,
+    config: Optional[dict] = None,
+) -> int:
+    """
+    Bulk variant of upsert_lead_from_enrichment.
 
+    Resolves existing leads with one IN query per chunk, scores them with
+    the config loaded once and writes them with a single INSERT ... ON
+    CONFLICT (email) DO UPDATE per chunk. Enrichment fields keep the "prefer
+    new non-null value" merge, also against concurrent writers, by
+    coalescing with the stored row. The caller commits.
 
-def backfill_leads(db: Session) -> dict:
+    Returns:
+        Number of leads written
     """
-    Populate leads table from existing EmailVerification and ContactEnrichment data.
-    Returns stats about the backfill operation.
+    if config is None:
+        config = get_active_config(db)
+
+    # Enrichments for the same email are merged in order, as with sequential upserts
+    by_email: dict[str, list[ContactEnrichment]] = {}
+    for enrichment in enrichments:
+        by_email.setdefault(enrichment.email.lower().strip(), []).append(enrichment)
+    emails = list(by_email)
+
+    written = 0
+    for start in range(0, len(emails), UPSERT_CHUNK_SIZE):
+        chunk = emails[start:start + UPSERT_CHUNK_SIZE]
+        existing = {lead.email: lead for lead in db.query(Lead).filter(Lead.email.in_(chunk))}
+
+        rows = []
+        for email in chunk:
+            lead = _lead_snapshot(existing.get(email), email, source or "csv")
+            for enrichment in by_email[email]:
+                _apply_enrichment(lead, enrichment, source)
+            score_and_update_lead(lead, db, config)
+            row = {field: getattr(lead, field) for field in ENRICHMENT_FIELDS}
+            row.update(
+                email=email,
+                source=lead.source,
+                enriched=lead.enriched,
+                latest_enrichment_id=lead.latest_enrichment_id,
+                phone=lead.phone,
+                lead_score=lead.lead_score,
+                score_breakdown=lead.score_breakdown,
+                scoring_config_version=lead.scoring_config_version,
+                scoring_input_hash=lead.scoring_input_hash,
+            )
+            rows.append(row)
+
+        stmt = pg_insert(Lead)
+        set_ = {
+            field: func.coalesce(getattr(stmt.excluded, field), getattr(Lead, field))
+            for field in ENRICHMENT_FIELDS + ["phone"]
+        }
+        set_.update(
+            source=stmt.excluded.source,
+            enriched=stmt.excluded.enriched,
+            latest_enrichment_id=stmt.excluded.latest_enrichment_id,
+            lead_score=stmt.excluded.lead_score,
+            score_breakdown=stmt.excluded.score_breakdown,
+            scoring_config_version=stmt.excluded.scoring_config_version,
+            scoring_input_hash=stmt.excluded.scoring_input_hash,
+            updated_at=func.now(),
+        )
+        db.execute(stmt.on_conflict_do_update(index_elements=[Lead.email], set_=set_), rows)
+        # Loaded leads would otherwise shadow the rows just written
+        for lead in existing.values():
+            db.expire(lead)
+        written += len(rows)
+
+    return written
+
+
+class EnrichmentLeadBuffer:
     """
-    created = 0
-    updated = 0
-    errors = 0
-
-    # Get all unique emails from verifications (most recent first)
-    verifications = (
-        db.query(EmailVerification)
-        .order_by(EmailVerification.created_at.desc())
-        .all()
-    )
+    Collects ContactEnrichment records from a task and upserts their leads in bulk.
 
-    seen_emails = set()
-    for v in verifications:
-        email = v.email.lower().strip()
-        if email in seen_emails:
-            continue
-        seen_emails.add(email)
+    Each record is still inserted and committed as it is added, so a later
+    rollback in the task cannot lose it; only the lead upserts are deferred
+    and written every ``flush_size`` records and on the final flush.
+    """
 
+    def __init__(self, db: Session, source: Optional[str] = None, flush_size: int = ENRICHMENT_FLUSH_SIZE):
+        self.db = db
+        self.source = source
+        self.flush_size = flush_size
+        self.config = get_active_config(db)
+        self._pending: list[SimpleNamespace] = []
+
+    def add(self, enrichment: ContactEnrichment) -> None:
+        self.db.add(enrichment)
+        self.db.flush()
+        # Snapshot before the commit expires it, so flushing needs no reloads
+        self._pending.append(SimpleNamespace(**{
+            column.key: getattr(enrichment, column.key) for column in ContactEnrichment.__table__.columns
+        }))
+        self.db.commit()
+        if len(self._pending) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
         try:
-            lead = db.query(Lead).filter(Lead.email == email).first()
-            if lead is None:
-                lead = Lead(email=email, source="csv")
-                db.add(lead)
-                created += 1
-            else:
-                updated += 1
-
-            lead.verification_status = v.status
-            lead.verification_sub_status = v.sub_status
-            lead.verification_score = v.score
-            lead.latest_verification_id = v.id
+            with self.db.begin_nested():
+                upsert_leads_from_enrichments(self.db, pending, self.source, self.config)
         except Exception as e:
-            logger.error(f"Error backfilling verification for {email}: {e}")
-            errors += 1
+            logger.warning(f"Failed to upsert {len(pending)} leads from enrichment: {e}")
+        self.db.commit()
 
-    db.flush()
 
-    # Now layer enrichment data on top
-    enrichments = (
-        db.query(ContactEnrichment)
-        .filter(ContactEnrichment.enriched == True)
-        .order_by(ContactEnrichment.created_at.desc())
-        .all()
-    )
+def backfill_leads(
+    db: Session,
+    state: Optional[dict] = None,
+    on_chunk: Optional[Callable[[dict], None]] = None,
+    chunk_size: int = BACKFILL_CHUNK_SIZE,
+) -> dict:
+    """
+    Populate leads table from existing EmailVerification and ContactEnrichment data.
 
-    enriched_emails = set()
-    for e in enrichments:
-        email = e.email.lower().strip()
-        if email in enriched_emails or email.endswith("@pending.local"):
-            continue
-        enriched_emails.add(email)
+    Runs set-based in three phases, each a keyset-paginated sequence of
+    chunks committed one at a time, so memory stays flat however large the
+    tables are:
 
-        try:
-            lead = db.query(Lead).filter(Lead.email == email).first()
-            if lead is None:
-                lead = Lead(email=email, source="csv")
-                db.add(lead)
-                created += 1
-
-            lead.enriched = True
-            lead.latest_enrichment_id = e.id
-            lead.first_name = e.first_name or lead.first_name
-            lead.last_name = e.last_name or lead.last_name
-            lead.full_name = e.full_name or lead.full_name
-            lead.title = e.title or lead.title
-            lead.headline = e.headline or lead.headline
-            lead.linkedin_url = e.linkedin_url or lead.linkedin_url
-            lead.seniority = e.seniority or lead.seniority
-            lead.city = e.city or lead.city
-            lead.state = e.state or lead.state
-            lead.country = e.country or lead.country
-            lead.departments = e.departments or lead.departments
-            lead.phone_numbers = e.phone_numbers or lead.phone_numbers
-            lead.company_name = e.company_name or lead.company_name
-            lead.company_domain = e.company_domain or lead.company_domain
-            lead.company_industry = e.company_industry or lead.company_industry
-            lead.company_size = e.company_size or lead.company_size
-            lead.company_location = e.company_location or lead.company_location
-
-            if e.phone_numbers and len(e.phone_numbers) > 0:
-                if isinstance(e.phone_numbers[0], dict):
-                    lead.phone = e.phone_numbers[0].get("sanitized_number") or e.phone_numbers[0].get("number")
-                else:
-                    lead.phone = str(e.phone_numbers[0])
-        except Exception as ex:
-            logger.error(f"Error backfilling enrichment for {email}: {ex}")
-            errors += 1
-
-    db.flush()
-
-    # Score all leads
-    from app.services.scoring import get_active_config, score_and_update_lead
+    1. verifications: latest row per lower(email) upserted into leads
+    2. enrichments: latest enriched row per lower(email) merged on top
+    3. scoring: leads whose scoring inputs or config changed rescored
+
+    Args:
+        db: Database session
+        state: Progress from an earlier, interrupted run to resume from
+        on_chunk: Optional callback with the updated state after each
+            committed chunk, e.g. to checkpoint it and report progress
+        chunk_size: Rows per chunk
+
+    Returns:
+        Stats about the backfill operation
+    """
+    from app.services.scoring_engine import rescore_leads_chunk
+
+    state = dict(state or new_backfill_state())
     config = get_active_config(db)
-    all_leads = db.query(Lead).all()
-    for lead in all_leads:
-        score_and_update_lead(lead, db, config)
 
-    db.commit()
+    while state["phase"] != "done":
+        if state["phase"] == "verifications":
+            rows = _backfill_verifications_chunk(db, state["after"], chunk_size)
+        elif state["phase"] == "enrichments":
+            rows = _backfill_enrichments_chunk(db, state["after"], chunk_size)
+        else:
+            scanned, _ = rescore_leads_chunk(db, state["after"], chunk_size, config)
+            rows = [(lead_id, False) for lead_id in scanned]
+        db.commit()
+
+        if rows:
+            state["after"] = max(key for key, _ in rows)
+            state["processed"] += len(rows)
+            if state["phase"] != "scoring":
+                inserted = sum(1 for _, was_inserted in rows if was_inserted)
+                state["created"] += inserted
+                state["updated"] += len(rows) - inserted
+        if len(rows) < chunk_size:
+            state["phase"] = BACKFILL_PHASES[BACKFILL_PHASES.index(state["phase"]) + 1]
+            state["after"] = 0 if state["phase"] == "scoring" else ""
+
+        if on_chunk is not None:
+            on_chunk(state)
 
     return {
-        "created": created,
-        "updated": updated,
-        "errors": errors,
+        "created": state["created"],
+        "updated": state["updated"],
+        "errors": 0,
         "total_leads": db.query(Lead).count(),
     }
+
+
+BACKFILL_PHASES = ["verifications", "enrichments", "scoring", "done"]
+
+
+def new_backfill_state() -> dict:
+    return {"phase": "verifications", "after": "", "created": 0, "updated": 0, "processed": 0}
+
+
+def _backfill_verifications_chunk(db: Session, after: str, limit: int) -> list[tuple[str, bool]]:
+    """Upsert the latest verification of the next ``limit`` emails after ``after``."""
+    # Byte-order collation so the keyset matches Python's max() over the returned emails
+    email = func.lower(EmailVerification.email).collate("C")
+    latest = (
+        select(
+            email,
+            literal("csv"),
+            false(),
+            EmailVerification.status,
+            EmailVerification.sub_status,
+            EmailVerification.score,
+            EmailVerification.id,
+            literal(0),
+        )
+        .where(email > after)
+        .order_by(email, EmailVerification.created_at.desc())
+        .distinct(email)
+        .limit(limit)
+    )
+    stmt = pg_insert(Lead).from_select(
+        [
+            "email", "source", "enriched", "verification_status", "verification_sub_status",
+            "verification_score", "latest_verification_id", "lead_score",
+        ],
+        latest,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Lead.email],
+        set_={
+            "verification_status": stmt.excluded.verification_status,
+            "verification_sub_status": stmt.excluded.verification_sub_status,
+            "verification_score": stmt.excluded.verification_score,
+            "latest_verification_id": stmt.excluded.latest_verification_id,
+            "updated_at": func.now(),
+        },
+    )
+    # xmax is 0 only on rows this statement inserted rather than updated
+    return [tuple(row) for row in db.execute(stmt.returning(Lead.email, literal_column("xmax = 0")))]
+
+
+def _backfill_enrichments_chunk(db: Session, after: str, limit: int) -> list[tuple[str, bool]]:
+    """Merge the latest enrichment of the next ``limit`` enriched emails after ``after``."""
+    email = func.lower(ContactEnrichment.email).collate("C")
+    first_phone = ContactEnrichment.phone_numbers[0]
+
+    def present(column):
+        # Match the Python merge, where "", 0 and [] lose to the existing value
+        if isinstance(column.type, JSON):
+            return case((cast(column, Text).in_(["null", "[]", "{}", '""']), null()), else_=column)
+        if isinstance(column.type, Integer):
+            return func.nullif(column, 0)
+        return func.nullif(column, "")
+
+    phone = case(
+        (
+            func.json_typeof(first_phone) == "object",
+            func.coalesce(
+                func.nullif(first_phone["sanitized_number"].as_string(), ""),
+                first_phone["number"].as_string(),
+            ),
+        ),
+        (first_phone.is_not(None), first_phone.as_string()),
+        else_=null(),
+    )
+
+    latest = (
+        select(
+            email,
+            literal("csv"),
+            true(),
+            ContactEnrichment.id,
+            literal(0),
+            phone,
+            *[present(getattr(ContactEnrichment, field)) for field in ENRICHMENT_FIELDS],
+        )
+        .where(
+            email > after,
+            ContactEnrichment.enriched == True,
+            ~email.like("%@pending.local"),
+        )
+        .order_by(email, ContactEnrichment.created_at.desc())
+        .distinct(email)
+        .limit(limit)
+    )
+    stmt = pg_insert(Lead).from_select(
+        ["email", "source", "enriched", "latest_enrichment_id", "lead_score", "phone"] + ENRICHMENT_FIELDS,
+        latest,
+    )
+    set_ = {
+        field: func.coalesce(getattr(stmt.excluded, field), getattr(Lead, field))
+        for field in ENRICHMENT_FIELDS
+    }
+    set_.update(
+        enriched=true(),
+        latest_enrichment_id=stmt.excluded.latest_enrichment_id,
+        # The primary phone is only replaced when the enrichment has phone numbers
+        phone=case((stmt.excluded.phone_numbers.is_not(None), stmt.excluded.phone), else_=Lead.phone),
+        updated_at=func.now(),
+    )
+    stmt = stmt.on_conflict_do_update(index_elements=[Lead.email], set_=set_)
+    return [tuple(row) for row in db.execute(stmt.returning(Lead.email, literal_column("xmax = 0")))]
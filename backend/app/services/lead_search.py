@@ -0,0 +1,57 @@
+"""
+Lead search over a trigram-indexed document.
+
+The searchable fields are folded into one lowercased document,
+lower(coalesce(email, '') || ' ' || coalesce(full_name, '') || ...),
+which migration 007 (or, for create_all setups, the after_create hook in
+app.models.lead) indexes with a pg_trgm GIN index. Each search word
+becomes a LIKE '%word%' predicate over that document, which Postgres
+answers from the index instead of scanning the table, and results can be
+ranked by word_similarity.
+"""
+
+from sqlalchemy import Float, and_, cast, func, literal_column
+
+from app.models.lead import Lead
+
+# Order matters: search_document() must render app.models.lead.LEAD_SEARCH_DOCUMENT_SQL,
+# the exact expression of ix_leads_search_trgm
+SEARCH_FIELDS = [
+    Lead.email,
+    Lead.full_name,
+    Lead.first_name,
+    Lead.last_name,
+    Lead.company_name,
+    Lead.title,
+]
+
+
+def search_document():
+    """The indexed search document expression."""
+    document = func.coalesce(SEARCH_FIELDS[0], literal_column("''"))
+    for field in SEARCH_FIELDS[1:]:
+        # Constants as literals, not bind parameters, so the expression matches the index
+        document = document.op("||")(literal_column("' '")).op("||")(func.coalesce(field, literal_column("''")))
+    return func.lower(document)
+
+
+def _like_pattern(word: str) -> str:
+    escaped = word.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return f"%{escaped}%"
+
+
+def search_filter(term: str):
+    """Leads whose document contains every word of ``term``, case-insensitively."""
+    document = search_document()
+    return and_(*[document.like(_like_pattern(word), escape="/") for word in term.lower().split()])
+
+
+def search_rank(term: str):
+    """
+    Relevance of each lead to ``term`` between 0 and 1, higher is better.
+
+    word_similarity() returns real; it is cast to double precision so the
+    selected value, the ORDER BY and a keyset cursor's equality test on a
+    tied rank (sent back as a float8 parameter) all compare the same type.
+    """
+    return cast(func.word_similarity(term.lower(), search_document()), Float(53))
@@ -0,0 +1,190 @@
+"""
+Local pre-verification stage run before spending ZeroBounce credits.
+
+Checks RFC syntax, a locally loaded list of disposable domains (and,
+optionally, role-account mailboxes) and whether the domain can receive
+mail at all. Only certain-bad addresses are resolved locally; anything
+uncertain (e.g. a DNS timeout) is passed on to ZeroBounce.
+
+Domain checks run once per unique domain in a batch, since most lists are
+dominated by a handful of domains.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+from email_validator import EmailNotValidError, validate_email
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Seed list; extend with DISPOSABLE_DOMAINS_PATH (one domain per line)
+DISPOSABLE_DOMAINS = {
+    "10minutemail.com", "guerrillamail.com", "guerrillamail.net", "mailinator.com",
+    "maildrop.cc", "sharklasers.com", "tempmail.com", "temp-mail.org", "throwawaymail.com",
+    "trashmail.com", "yopmail.com", "getnada.com", "dispostable.com", "fakeinbox.com",
+    "mintemail.com", "mohmal.com", "emailondeck.com", "tempail.com", "burnermail.io",
+}
+
+# Extend with ROLE_ACCOUNTS_PATH (one local part per line)
+ROLE_ACCOUNTS = {
+    "abuse", "admin", "billing", "contact", "donotreply", "do-not-reply", "help", "hostmaster",
+    "info", "marketing", "no-reply", "noreply", "office", "postmaster", "sales", "support",
+    "webmaster",
+}
+
+# Concurrent DNS lookups per batch
+DNS_CONCURRENCY = 20
+
+
+def _load_list(path: str, seed: set[str]) -> set[str]:
+    values = set(seed)
+    if not path:
+        return values
+    try:
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            line = line.strip().lower()
+            if line and not line.startswith("#"):
+                values.add(line)
+    except OSError as e:
+        logger.warning(f"Could not load list from {path}: {e}")
+    return values
+
+
+class PreVerifier:
+    def __init__(self):
+        self.settings = get_settings()
+        self.disposable_domains = _load_list(self.settings.disposable_domains_path, DISPOSABLE_DOMAINS)
+        self.role_accounts = _load_list(self.settings.role_accounts_path, ROLE_ACCOUNTS)
+        self._mx_cache: dict[str, tuple[float, Optional[bool]]] = {}
+        self._resolver = dns.asyncresolver.Resolver()
+        self._resolver.lifetime = self.settings.precheck_dns_timeout
+
+    async def check_many(self, emails: list[str]) -> dict[str, dict]:
+        """
+        Pre-check normalized emails.
+
+        Returns:
+            Mapping of email to a local verification result for every
+            certain-bad address; emails that should go upstream are absent
+        """
+        rejected = {}
+        by_domain: dict[str, list[str]] = {}
+
+        for email in emails:
+            reason = self._check_syntax(email)
+            if reason is None:
+                local, _, domain = email.rpartition("@")
+                if domain in self.disposable_domains:
+                    reason = "local_disposable"
+                elif self.settings.precheck_reject_role_accounts and local in self.role_accounts:
+                    reason = "local_role_based"
+                else:
+                    by_domain.setdefault(domain, []).append(email)
+                    continue
+            rejected[email] = self._local_result(email, reason)
+
+        if self.settings.precheck_mx_lookup and by_domain:
+            verdicts = await self.mx_verdicts(list(by_domain))
+            for domain, accepts_mail in verdicts.items():
+                if accepts_mail is False:
+                    for email in by_domain[domain]:
+                        rejected[email] = self._local_result(email, "local_no_mx")
+
+        return rejected
+
+    async def mx_verdicts(self, domains: list[str]) -> dict[str, Optional[bool]]:
+        """
+        Whether each domain accepts mail, using a TTL'd per-domain cache.
+
+        True/False are definite answers; None means the lookup was
+        inconclusive (timeout, SERVFAIL) and the domain must not be rejected.
+        """
+        now = time.monotonic()
+        verdicts = {}
+        missing = []
+        for domain in domains:
+            cached = self._mx_cache.get(domain)
+            if cached is not None and cached[0] > now:
+                verdicts[domain] = cached[1]
+            else:
+                missing.append(domain)
+
+        semaphore = asyncio.Semaphore(DNS_CONCURRENCY)
+
+        async def resolve(domain: str) -> None:
+            async with semaphore:
+                verdict = await self._accepts_mail(domain)
+            verdicts[domain] = verdict
+            if verdict is not None:
+                self._mx_cache[domain] = (time.monotonic() + self.settings.precheck_mx_cache_ttl_seconds, verdict)
+
+        await asyncio.gather(*(resolve(domain) for domain in missing))
+        return verdicts
+
+    async def _accepts_mail(self, domain: str) -> Optional[bool]:
+        try:
+            answer = await self._resolver.resolve(domain, "MX")
+            # A null MX ("0 .") explicitly refuses mail (RFC 7505)
+            return any(str(record.exchange) != "." for record in answer)
+        except dns.resolver.NXDOMAIN:
+            return False
+        except dns.resolver.NoAnswer:
+            pass
+        except (dns.exception.Timeout, dns.resolver.NoNameservers, dns.exception.DNSException):
+            return None
+
+        # No MX record: mail falls back to the domain's address records, A or AAAA (RFC 5321)
+        verdict = False
+        for rdtype in ("A", "AAAA"):
+            try:
+                await self._resolver.resolve(domain, rdtype)
+                return True
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                pass
+            except dns.exception.DNSException:
+                verdict = None
+        return verdict
+
+    def _check_syntax(self, email: str) -> Optional[str]:
+        try:
+            validate_email(email, check_deliverability=False)
+        except EmailNotValidError:
+            return "local_syntax_error"
+        return None
+
+    def _local_result(self, email: str, sub_status: str) -> dict:
+        domain = email.rpartition("@")[2] or None
+        return {
+            "email": email,
+            "status": "do_not_mail" if sub_status in ("local_disposable", "local_role_based") else "invalid",
+            "sub_status": sub_status,
+            "score": None,
+            "free_email": None,
+            "did_you_mean": None,
+            "domain": domain,
+            "domain_age_days": None,
+            "smtp_provider": None,
+            "mx_found": False if sub_status == "local_no_mx" else None,
+            "mx_record": None,
+            "verified_at": datetime.utcnow(),
+        }
+
+
+# Singleton instance
+_pre_verifier: Optional[PreVerifier] = None
+
+
+def get_pre_verifier() -> PreVerifier:
+    global _pre_verifier
+    if _pre_verifier is None:
+        _pre_verifier = PreVerifier()
+    return _pre_verifier
@@ -9,8 +9,12 @@ Scoring categories:
 - Data completeness (25pts): phone=8, linkedin=8, company=5, title=4
 """
 
+import hashlib
+import json
 import logging
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
 from sqlalchemy.orm import Session
 from app.models.lead import Lead, ScoringConfig
 
@@ -45,9 +49,55 @@ SENIORITY_MAP = {
     "manager": ["manager", "head of", "lead", "senior manager", "team lead"],
 }
 
+# Bump whenever score_lead's rules change, so every lead counts as stale
+SCORING_RULES_VERSION = 1
+
+# Lead columns score_lead reads; a lead is rescored when any of them changes
+SCORING_INPUT_FIELDS = [
+    "verification_status",
+    "seniority",
+    "title",
+    "company_size",
+    "company_industry",
+    "phone",
+    "phone_numbers",
+    "linkedin_url",
+    "company_name",
+]
+
+
+def config_version(config: dict) -> str:
+    """Stable hash of a scoring config (and the scoring rules version)."""
+    payload = json.dumps([SCORING_RULES_VERSION, config], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def input_fingerprint(lead) -> str:
+    """Hash of a lead's scoring inputs; works on Lead objects and result rows alike."""
+    payload = json.dumps(
+        [getattr(lead, field) for field in SCORING_INPUT_FIELDS],
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
 
 def get_active_config(db: Session) -> dict:
-    """Get the active scoring configuration, or use defaults."""
+    """
+    Get the active scoring configuration, or use defaults.
+
+    Served from the process-level ScoringConfigCache when enabled; the
+    returned dict is shared and must not be modified.
+    """
+    from app.config import get_settings
+
+    if get_settings().scoring_config_cache:
+        from app.services.scoring_config_cache import get_scoring_config_cache
+        return get_scoring_config_cache().get(db)
+    return load_active_config(db)
+
+
+def load_active_config(db: Session) -> dict:
+    """Read the active scoring configuration from the database, or use defaults."""
     config_record = (
         db.query(ScoringConfig)
         .filter(ScoringConfig.is_active == True)
@@ -59,22 +109,54 @@ def get_active_config(db: Session) -> dict:
     return DEFAULT_CONFIG
 
 
-def classify_seniority(seniority: Optional[str], title: Optional[str]) -> str:
-    """Classify a lead's seniority level from seniority field or job title."""
-    text = ""
-    if seniority:
-        text += seniority.lower()
-    if title:
-        text += " " + title.lower()
+class SeniorityClassifier:
+    """
+    Seniority classifier compiled once from a level -> keywords map.
 
-    if not text.strip():
-        return "other"
+    Each level's keywords become one compiled alternation, searched in map
+    order so the first level with any keyword in the text wins, exactly as
+    the keyword loops did. Results are memoized per (seniority, title) pair,
+    since the same titles recur across leads and rescores.
+    """
 
-    for level, keywords in SENIORITY_MAP.items():
-        for kw in keywords:
-            if kw in text:
+    def __init__(self, seniority_map: dict, cache_size: int = 65536):
+        self.patterns = [
+            (level, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+            for level, keywords in seniority_map.items()
+        ]
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, seniority: Optional[str], title: Optional[str]) -> str:
+        text = ""
+        if seniority:
+            text += seniority.lower()
+        if title:
+            text += " " + title.lower()
+
+        if not text.strip():
+            return "other"
+
+        for level, pattern in self.patterns:
+            if pattern.search(text):
                 return level
-    return "other"
+        return "other"
+
+    def classify_many(self, seniority: Iterable, title: Iterable) -> list[str]:
+        """Classify aligned seniority/title sequences (missing values as None)."""
+        return list(map(self.classify, seniority, title))
+
+
+_seniority_classifier = SeniorityClassifier(SENIORITY_MAP)
+
+
+def get_seniority_classifier() -> SeniorityClassifier:
+    """Get the classifier for SENIORITY_MAP."""
+    return _seniority_classifier
+
+
+def classify_seniority(seniority: Optional[str], title: Optional[str]) -> str:
+    """Classify a lead's seniority level from seniority field or job title."""
+    return _seniority_classifier.classify(seniority, title)
 
 
 def score_lead(lead: Lead, config: Optional[dict] = None) -> tuple:
@@ -181,16 +263,15 @@ def score_and_update_lead(lead: Lead, db: Session, config: Optional[dict] = None
     total, breakdown = score_lead(lead, config)
     lead.lead_score = total
     lead.score_breakdown = breakdown
+    lead.scoring_config_version = config_version(config)
+    lead.scoring_input_hash = input_fingerprint(lead)
     return lead
 
 
-def rescore_all_leads(db: Session) -> int:
-    """Recalculate scores for all leads. Returns count of leads rescored."""
-    config = get_active_config(db)
-    leads = db.query(Lead).all()
-    count = 0
-    for lead in leads:
-        score_and_update_lead(lead, db, config)
-        count += 1
-    db.commit()
-    return count
+def rescore_all_leads(db: Session, force: bool = False) -> int:
+    """
+    Recalculate scores for leads scored with another config or whose inputs
+    changed since (every lead if ``force``). Returns count of leads rescored.
+    """
+    from app.services.scoring_engine import rescore_leads
+    return rescore_leads(db, force=force)
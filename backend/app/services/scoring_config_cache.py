@@ -0,0 +1,116 @@
+"""
+Process-level cache of the active scoring configuration.
+
+Every lead upsert scores the lead, and scoring needs the active
+ScoringConfig. Rather than querying scoring_configs per lead, each process
+keeps the config in memory together with its config_version. Writers
+publish the new version to Redis; readers compare it with theirs at most
+once every few seconds and reload from the database only when it changed.
+Without Redis, the config is simply reloaded once the TTL expires.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.services.scoring import config_version, load_active_config
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "scoring:config:version"
+
+# After a Redis error the shared version is ignored for this many seconds
+REDIS_RETRY_SECONDS = 30.0
+
+
+class ScoringConfigCache:
+    """Active scoring config kept in process memory, invalidated through Redis."""
+
+    def __init__(self, check_interval: float, ttl: int, client: Optional[redis.Redis]):
+        self.check_interval = check_interval
+        self.ttl = ttl
+        self.client = client
+        self._config: Optional[dict] = None
+        self._version: Optional[str] = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._disabled_until = 0.0
+
+    @property
+    def _shared(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._disabled_until
+
+    def _fail(self, error: Exception) -> None:
+        logger.warning(f"Scoring config cache: Redis unavailable, skipping for {REDIS_RETRY_SECONDS:.0f}s: {error}")
+        self._disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _published_version(self) -> Optional[str]:
+        if not self._shared:
+            return None
+        try:
+            version = self.client.get(VERSION_KEY)
+        except redis.RedisError as e:
+            self._fail(e)
+            return None
+        return version.decode() if version is not None else None
+
+    def get(self, db: Session) -> dict:
+        """Return the active config, reloading it only if it may have changed."""
+        now = time.monotonic()
+        with self._lock:
+            config = self._config
+            fresh = config is not None and now - self._loaded_at < self.ttl
+            if fresh and now - self._checked_at < self.check_interval:
+                return config
+
+        published = self._published_version()
+        with self._lock:
+            if fresh and (published is None or published == self._version):
+                self._checked_at = now
+                return config
+
+        config = load_active_config(db)
+        with self._lock:
+            self._config = config
+            self._version = config_version(config)
+            self._loaded_at = self._checked_at = time.monotonic()
+        return config
+
+    def invalidate(self, config: Optional[dict] = None) -> None:
+        """
+        Drop the cached config here and tell every other process to reload it.
+
+        Args:
+            config: The config just written, published as the new version
+        """
+        with self._lock:
+            self._config = None
+            self._version = None
+        if config is not None and self._shared:
+            try:
+                self.client.set(VERSION_KEY, config_version(config))
+            except redis.RedisError as e:
+                self._fail(e)
+
+
+# Singleton instance
+_scoring_config_cache: Optional[ScoringConfigCache] = None
+
+
+def get_scoring_config_cache() -> ScoringConfigCache:
+    global _scoring_config_cache
+    if _scoring_config_cache is None:
+        settings = get_settings()
+        client = redis.Redis.from_url(settings.redis_url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        _scoring_config_cache = ScoringConfigCache(
+            settings.scoring_config_check_interval,
+            settings.scoring_config_cache_ttl_seconds,
+            client,
+        )
+    return _scoring_config_cache
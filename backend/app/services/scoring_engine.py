@@ -0,0 +1,308 @@
+"""
+Columnar lead scoring engine.
+
+Scores leads in chunks: only the scoring inputs are fetched, all four
+score_breakdown components are computed over NumPy/pandas columns with
+the same rules as scoring.score_lead, and each chunk is written back with
+a single UPDATE ... FROM (VALUES ...). Used for every bulk rescore; the
+per-lead score_lead remains the reference for single-lead updates.
+
+Rescoring is incremental: each lead records the config version and the
+input fingerprint it was scored with, and only leads where either differs
+are scored and written.
+"""
+
+import json
+import logging
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Integer, JSON, Text, cast, column, select, update, values
+from sqlalchemy.orm import Session
+
+from app.models.lead import Lead
+from app.services.scoring import (
+    DEFAULT_CONFIG, SCORING_INPUT_FIELDS, SENIORITY_MAP, config_version, get_active_config,
+    get_seniority_classifier, input_fingerprint,
+)
+
+logger = logging.getLogger(__name__)
+
+# Leads per fetch and per UPDATE ... FROM (VALUES ...) statement
+SCORING_CHUNK_SIZE = 5000
+
+SCORING_INPUTS = [Lead.id] + [getattr(Lead, field) for field in SCORING_INPUT_FIELDS]
+
+# What each lead was last scored with
+SCORING_STAMPS = [Lead.scoring_config_version, Lead.scoring_input_hash]
+
+BREAKDOWN_KEYS = ["email_quality", "seniority", "company_fit", "data_completeness"]
+
+def _present(series: pd.Series) -> np.ndarray:
+    """Python truthiness of a string column ("" and None are false)."""
+    return (series.notna() & (series.astype(object) != "")).to_numpy()
+
+
+def classify_seniority_many(seniority: pd.Series, title: pd.Series) -> np.ndarray:
+    """Vectorized classify_seniority over aligned seniority/title columns."""
+    levels = get_seniority_classifier().classify_many(
+        seniority.where(seniority.notna(), None).tolist(),
+        title.where(title.notna(), None).tolist(),
+    )
+    return np.array(levels, dtype=object)
+
+
+def scoring_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce a frame of scoring inputs (columns named as in SCORING_INPUTS)
+    to the config-independent features score_features needs.
+
+    Strings are kept as categoricals, so the features of a whole leads
+    table stay small enough to cache (see scoring_simulation).
+    """
+    # JSON column: the only input that has to be inspected per value
+    has_phone_numbers = df["phone_numbers"].map(lambda v: isinstance(v, (list, dict, str)) and len(v) > 0)
+    industry = df["company_industry"]
+    has_industry = _present(industry)
+
+    return pd.DataFrame(
+        {
+            "status": pd.Categorical(df["verification_status"]),
+            "level": pd.Categorical(classify_seniority_many(df["seniority"], df["title"])),
+            "company_size": pd.to_numeric(df["company_size"], errors="coerce").to_numpy(dtype=float),
+            "industry": pd.Categorical(industry.where(has_industry, "").astype(str).str.lower()),
+            "has_phone": _present(df["phone"]) | has_phone_numbers.to_numpy(dtype=bool),
+            "has_linkedin": _present(df["linkedin_url"]),
+            "has_company": _present(df["company_name"]),
+            "has_title": _present(df["title"]),
+        },
+        index=df.index,
+    )
+
+
+def score_features(features: pd.DataFrame, config: Optional[dict] = None) -> tuple[np.ndarray, pd.DataFrame]:
+    """
+    Score a frame of scoring_features with the given config.
+
+    Returns:
+        Tuple of (totals, breakdown frame with BREAKDOWN_KEYS columns),
+        both aligned with the input rows
+    """
+    if config is None:
+        config = DEFAULT_CONFIG
+
+    weights = config.get("weights", DEFAULT_CONFIG["weights"])
+    seniority_scores = config.get("seniority_scores", DEFAULT_CONFIG["seniority_scores"])
+    ideal_size = config.get("ideal_company_size", DEFAULT_CONFIG["ideal_company_size"])
+    target_industries = config.get("target_industries", [])
+
+    n = len(features)
+    breakdown = pd.DataFrame(index=features.index)
+
+    # 1. Email quality
+    max_email = weights.get("email_quality", 25)
+    status = features["status"]
+    breakdown["email_quality"] = np.select(
+        [
+            (status == "valid").to_numpy(),
+            (status == "catch-all").to_numpy(),
+            (status.isna() | (status == "unknown")).to_numpy(),
+        ],
+        [max_email, int(max_email * 0.4), int(max_email * 0.2)],
+        default=0,
+    )
+
+    # 2. Seniority
+    max_seniority = weights.get("seniority", 25)
+    other = seniority_scores.get("other", 5)
+    level_scores = features["level"].map({level: seniority_scores.get(level, other) for level in [*SENIORITY_MAP, "other"]})
+    breakdown["seniority"] = np.minimum(np.asarray(level_scores, dtype=float), max_seniority)
+
+    # 3. Company fit
+    max_company = weights.get("company_fit", 25)
+    company_score = np.zeros(n)
+
+    size = features["company_size"].to_numpy(dtype=float)
+    size_min = ideal_size.get("min", 50)
+    size_max = ideal_size.get("max", 5000)
+    has_size = ~np.isnan(size)
+    in_range = has_size & (size >= size_min) & (size <= size_max)
+    company_score[in_range] += int(max_company * 0.6)
+
+    # Partial credit: closer to range = more points
+    partial = has_size & ~in_range & (size > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(size[partial] < size_min, size[partial] / size_min, size_max / size[partial])
+    company_score[partial] += np.trunc(max_company * 0.6 * np.maximum(ratio, 0.2))
+
+    # Industry match, decided once per distinct industry
+    if target_industries:
+        industry = features["industry"].cat
+        targets = [target.lower() for target in target_industries]
+        matching = np.array([bool(c) and any(t in c for t in targets) for c in industry.categories], dtype=bool)
+        company_score[matching[industry.codes]] += int(max_company * 0.4)
+    else:
+        # No target industries configured = give full industry points
+        company_score += int(max_company * 0.4)
+
+    breakdown["company_fit"] = np.minimum(company_score, max_company)
+
+    # 4. Data completeness
+    max_completeness = weights.get("data_completeness", 25)
+    completeness = (
+        np.where(features["has_phone"].to_numpy(), int(max_completeness * 8 / 25), 0)
+        + np.where(features["has_linkedin"].to_numpy(), int(max_completeness * 8 / 25), 0)
+        + np.where(features["has_company"].to_numpy(), int(max_completeness * 5 / 25), 0)
+        + np.where(features["has_title"].to_numpy(), int(max_completeness * 4 / 25), 0)
+    )
+    breakdown["data_completeness"] = np.minimum(completeness, max_completeness)
+
+    totals = np.clip(breakdown[BREAKDOWN_KEYS].sum(axis=1).to_numpy(), 0, 100)
+    return totals, breakdown
+
+
+def score_frame(df: pd.DataFrame, config: Optional[dict] = None) -> tuple[np.ndarray, pd.DataFrame]:
+    """Score a frame of scoring inputs (columns named as in SCORING_INPUTS); see score_features."""
+    return score_features(scoring_features(df), config)
+
+
+def fetch_scoring_inputs(
+    db: Session,
+    after_id: int,
+    limit: int,
+    lead_ids: Optional[list[int]] = None,
+    fingerprint: bool = True,
+) -> pd.DataFrame:
+    """
+    Fetch the scoring inputs of the next ``limit`` leads with id greater than ``after_id``.
+
+    Besides the SCORING_INPUTS columns, the frame has the SCORING_STAMPS
+    columns and a ``fingerprint`` column with each lead's current
+    input_fingerprint, unless ``fingerprint`` is False (read-only callers
+    that never compare or write stamps).
+    """
+    columns = SCORING_INPUTS + SCORING_STAMPS if fingerprint else SCORING_INPUTS
+    query = select(*columns).where(Lead.id > after_id).order_by(Lead.id).limit(limit)
+    if lead_ids is not None:
+        query = query.where(Lead.id.in_(lead_ids))
+    rows = db.execute(query).all()
+    df = pd.DataFrame(rows, columns=[c.key for c in columns])
+    if fingerprint:
+        # Hash the raw values: pandas turns nullable integer columns into floats
+        df["fingerprint"] = [input_fingerprint(row) for row in rows]
+    return df
+
+
+def write_scores(db: Session, ids, totals, breakdown: pd.DataFrame, version: str, fingerprints) -> None:
+    """Write one chunk of scores with a single UPDATE ... FROM (VALUES ...). The caller commits."""
+    if len(ids) == 0:
+        return
+
+    rows = [
+        (
+            int(lead_id),
+            int(total),
+            json.dumps({key: _plain(value) for key, value in zip(BREAKDOWN_KEYS, parts)}),
+            fingerprint,
+        )
+        for lead_id, total, parts, fingerprint in zip(
+            ids, totals, breakdown[BREAKDOWN_KEYS].itertuples(index=False), fingerprints,
+        )
+    ]
+    scores = values(
+        column("id", Integer),
+        column("lead_score", Integer),
+        column("score_breakdown", Text),
+        column("scoring_input_hash", Text),
+        name="scores",
+    ).data(rows)
+    db.execute(
+        update(Lead)
+        .where(Lead.id == scores.c.id)
+        .values(
+            lead_score=scores.c.lead_score,
+            score_breakdown=cast(scores.c.score_breakdown, JSON),
+            scoring_config_version=version,
+            scoring_input_hash=scores.c.scoring_input_hash,
+        ),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def _plain(value):
+    # Keep integral scores as ints, as score_lead produces them
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def rescore_leads_chunk(
+    db: Session,
+    after_id: int,
+    limit: int,
+    config: dict,
+    lead_ids: Optional[list[int]] = None,
+    force: bool = False,
+) -> tuple[list[int], int]:
+    """
+    Scan the next ``limit`` leads with id greater than ``after_id`` and
+    rescore the stale ones (all of them if ``force``). The caller commits.
+
+    Returns:
+        Tuple of (ids of the leads scanned in ascending order, number rescored)
+    """
+    df = fetch_scoring_inputs(db, after_id, limit, lead_ids)
+    if df.empty:
+        return [], 0
+
+    scanned = df["id"].tolist()
+    version = config_version(config)
+    if not force:
+        stale = (df["scoring_config_version"] != version) | (df["scoring_input_hash"] != df["fingerprint"])
+        df = df[stale.to_numpy()]
+        if df.empty:
+            return scanned, 0
+
+    totals, breakdown = score_frame(df, config)
+    write_scores(db, df["id"].to_numpy(), totals, breakdown, version, df["fingerprint"])
+    return scanned, len(df)
+
+
+def rescore_leads(
+    db: Session,
+    lead_ids: Optional[list[int]] = None,
+    config: Optional[dict] = None,
+    chunk_size: int = SCORING_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[int, int], None]] = None,
+    force: bool = False,
+) -> int:
+    """
+    Rescore stale leads (or every lead if ``force``), committing chunk by chunk.
+
+    Args:
+        lead_ids: Only consider these leads
+        on_chunk: Optional callback with (leads scanned, leads rescored) so far
+
+    Returns:
+        Number of leads rescored
+    """
+    if config is None:
+        config = get_active_config(db)
+
+    count = 0
+    total_scanned = 0
+    after_id = 0
+    while True:
+        scanned, rescored = rescore_leads_chunk(db, after_id, chunk_size, config, lead_ids, force)
+        db.commit()
+        if not scanned:
+            break
+        count += rescored
+        total_scanned += len(scanned)
+        after_id = scanned[-1]
+        if on_chunk is not None:
+            on_chunk(total_scanned, count)
+        if len(scanned) < chunk_size:
+            break
+
+    return count
@@ -0,0 +1,173 @@
+"""
+Request coalescing (single-flight) for upstream verification calls.
+
+Concurrent callers asking for the same key share one upstream request:
+within a process they await the same future, and across the API process
+and Celery workers a short-lived Redis lock elects one leader while the
+others wait for its result to land in the shared cache.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+import redis
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "verification:lock:"
+
+# After a Redis error the cross-process lock is skipped for this many seconds
+REDIS_RETRY_SECONDS = 30.0
+
+# Release the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        client: Optional[redis.Redis],
+        lock_ttl: float,
+        wait_timeout: float,
+        poll_interval: float = 0.2,
+    ):
+        self.client = client
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._inflight: dict[tuple[int, str], asyncio.Future] = {}
+        self._disabled_until = 0.0
+        self.counters = {"leader": 0, "local_waits": 0, "remote_waits": 0}
+
+    @property
+    def _shared(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._disabled_until
+
+    def _fail(self, error: Exception) -> None:
+        logger.warning(f"Single-flight: Redis unavailable, skipping for {REDIS_RETRY_SECONDS:.0f}s: {error}")
+        self._disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def run(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[dict]],
+        lookup: Callable[[], Optional[dict]],
+    ) -> dict:
+        """
+        Return ``fetch()`` for ``key``, coalescing concurrent callers.
+
+        Args:
+            key: Normalized email address
+            fetch: Performs the upstream call and publishes its result
+            lookup: Reads a published result (cache), or None
+        """
+        slot = (id(asyncio.get_running_loop()), key)
+        inflight = self._inflight.get(slot)
+        if inflight is not None:
+            self.counters["local_waits"] += 1
+            return dict(await asyncio.shield(inflight))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[slot] = future
+        try:
+            result = await self._run_cross_process(key, fetch, lookup)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters receive the exception; mark it retrieved for the leader
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(slot, None)
+
+    async def _run_cross_process(self, key, fetch, lookup) -> dict:
+        token = self._acquire(key)
+        if token is not None:
+            self.counters["leader"] += 1
+            try:
+                return await fetch()
+            finally:
+                self._release(key, token)
+
+        # Another process holds the lock: wait for its published result
+        self.counters["remote_waits"] += 1
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            result = lookup()
+            if result is not None:
+                return result
+            if not self._locked(key):
+                break
+
+        # Leader failed or timed out; fall back to our own request
+        return await fetch()
+
+    def _acquire(self, key: str) -> Optional[str]:
+        """
+        Take the cross-process lock; returns a token, or None if held elsewhere.
+
+        Without Redis (or while it is failing) every caller is its own leader.
+        """
+        token = uuid.uuid4().hex
+        if not self._shared:
+            return token
+        try:
+            if self.client.set(LOCK_PREFIX + key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                return token
+            return None
+        except redis.RedisError as e:
+            self._fail(e)
+            return token
+
+    def _release(self, key: str, token: str) -> None:
+        if not self._shared:
+            return
+        try:
+            self.client.eval(_RELEASE_SCRIPT, 1, LOCK_PREFIX + key, token)
+        except redis.RedisError as e:
+            self._fail(e)
+
+    def _locked(self, key: str) -> bool:
+        if not self._shared:
+            return False
+        try:
+            return bool(self.client.exists(LOCK_PREFIX + key))
+        except redis.RedisError as e:
+            self._fail(e)
+            return False
+
+
+# Singleton instance
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    global _single_flight
+    if _single_flight is None:
+        settings = get_settings()
+        client = None
+        if settings.verification_single_flight_redis:
+            client = redis.Redis.from_url(
+                settings.redis_url,
+                decode_responses=True,
+                socket_timeout=1.0,
+                socket_connect_timeout=1.0,
+            )
+        _single_flight = SingleFlight(
+            client,
+            lock_ttl=settings.zerobounce_timeout + 5.0,
+            wait_timeout=settings.zerobounce_timeout + 5.0,
+        )
+    return _single_flight
@@ -0,0 +1,171 @@
+"""
+Aggregate stats for the dashboard and the leads pipeline summary.
+
+Lead figures are read from the lead_stats rollup, which triggers on
+leads keep current, so they cost the same however many leads exist.
+The other tables are aggregated in a single scan: every figure is a
+COUNT(...) FILTER (WHERE ...) column of one SELECT, and the verification
+status breakdown shares its scan with the totals through GROUPING SETS.
+Results are cached in process for a few seconds, since these screens
+are polled.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import Float, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.batch import BatchJob
+from app.models.email import EmailVerification
+from app.models.enrichment import ContactEnrichment
+from app.models.lead import LeadStats
+
+_cache: dict[str, tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def cached(key: str, compute: Callable[[], dict]) -> dict:
+    """Return the cached result for ``key`` if younger than the stats TTL, else recompute it."""
+    ttl = get_settings().stats_cache_ttl_seconds
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+
+    result = compute()
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), result)
+    return result
+
+
+def _pipeline_columns():
+    """Pipeline stage figures as sums over lead_stats rows ("" is a NULL status)."""
+    return (
+        func.coalesce(func.sum(LeadStats.lead_count), 0),
+        func.coalesce(func.sum(LeadStats.lead_count).filter(LeadStats.verification_status != ""), 0),
+        func.coalesce(func.sum(LeadStats.lead_count).filter(LeadStats.verification_status == "valid"), 0),
+        func.coalesce(func.sum(LeadStats.enriched_count), 0),
+        func.coalesce(func.sum(LeadStats.scored_count), 0),
+        func.coalesce(func.sum(LeadStats.lead_count).filter(LeadStats.outreach_status != ""), 0),
+        func.sum(LeadStats.score_sum).cast(Float) / func.nullif(func.sum(LeadStats.score_count), 0),
+    )
+
+
+def _pipeline_dict(row) -> dict:
+    total, verified, valid, enriched, scored, outreach, avg_score = row
+    return {
+        "imported": int(total),
+        "verified": int(verified),
+        "valid": int(valid),
+        "enriched": int(enriched),
+        "scored": int(scored),
+        "outreach": int(outreach),
+        "avg_score": round(float(avg_score or 0), 1),
+    }
+
+
+def lead_pipeline_stats(db: Session) -> dict:
+    """Counts at each pipeline stage, from the lead_stats rollup."""
+    return _pipeline_dict(db.execute(select(*_pipeline_columns())).one())
+
+
+LEAD_STATS_DIMENSIONS = ("source", "verification_status", "outreach_status")
+
+
+def lead_timeseries(db: Session, days: int = 30, group_by: Optional[str] = None) -> list[dict]:
+    """
+    Pipeline stage counts per day over the last ``days`` days (by lead
+    creation date, UTC), optionally split by one of LEAD_STATS_DIMENSIONS.
+    Days without leads are omitted.
+    """
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    keys = [LeadStats.day]
+    if group_by:
+        keys.append(getattr(LeadStats, group_by))
+
+    rows = db.execute(
+        select(*keys, *_pipeline_columns())
+        .where(LeadStats.day >= since)
+        .group_by(*keys)
+        .order_by(*keys)
+    ).all()
+
+    series = []
+    for row in rows:
+        point = {"day": row[0].isoformat()}
+        if group_by:
+            point[group_by] = row[1] or None
+        point.update(_pipeline_dict(row[len(keys):]))
+        series.append(point)
+    return series
+
+
+def verification_stats(db: Session) -> dict:
+    """Totals and per-status breakdown of email_verifications, from one scan."""
+    rows = db.execute(
+        select(
+            EmailVerification.status,
+            func.grouping(EmailVerification.status),
+            func.count(EmailVerification.id),
+            func.count(func.distinct(EmailVerification.email)),
+        ).group_by(func.grouping_sets(EmailVerification.status, tuple_()))
+    ).all()
+
+    stats = {"total_verified": 0, "unique_verified": 0, "verification_breakdown": {}}
+    for status, is_total, count, unique in rows:
+        if is_total:
+            stats["total_verified"] = count
+            stats["unique_verified"] = unique
+        else:
+            stats["verification_breakdown"][status] = count
+    return stats
+
+
+def enrichment_stats(db: Session) -> dict:
+    """Enrichment totals and field coverage, from one scan of contact_enrichments."""
+    enriched = ContactEnrichment.enriched == True
+    row = db.execute(
+        select(
+            func.count(ContactEnrichment.id),
+            func.count(ContactEnrichment.id).filter(enriched),
+            func.count(func.distinct(ContactEnrichment.email)).filter(enriched),
+            func.count(ContactEnrichment.phone_numbers),
+            func.count(ContactEnrichment.linkedin_url),
+            func.count(ContactEnrichment.company_name),
+            func.count(ContactEnrichment.title),
+        )
+    ).one()
+    total, enriched_count, unique_enriched, phone, linkedin, company, title = row
+
+    return {
+        "total_enrichments": total,
+        "enriched_count": enriched_count,
+        "unique_enriched": unique_enriched,
+        # COUNT(column) counts the non-NULL values
+        "enrichment_coverage": {"phone": phone, "linkedin": linkedin, "company": company, "title": title},
+    }
+
+
+def batch_stats(db: Session) -> dict:
+    row = db.execute(
+        select(
+            func.count(BatchJob.id),
+            func.count(BatchJob.id).filter(BatchJob.status == "completed"),
+        )
+    ).one()
+    return {"total_batches": row[0], "completed_batches": row[1]}
+
+
+def dashboard_stats(db: Session) -> dict:
+    """Everything /api/dashboard/stats returns: one scan per table, leads from the rollup."""
+    return {
+        "total_leads": lead_pipeline_stats(db)["imported"],
+        **verification_stats(db),
+        **enrichment_stats(db),
+        **batch_stats(db),
+    }
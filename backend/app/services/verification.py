@@ -1,20 +1,42 @@
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Callable, Optional
 from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.batch import BatchJob
 from app.models.email import EmailVerification
-from app.services.zerobounce import get_zerobounce_service, ZeroBounceError
+from app.services.concurrency import bounded_gather
+from app.services.domain_cache import (
+    DEAD_DOMAIN_SUB_STATUS,
+    dead_domain_result,
+    get_domain_cache,
+    is_dead_domain_result,
+)
+from app.services.precheck import get_pre_verifier
+from app.services.single_flight import get_single_flight
+from app.services.verification_cache import get_verification_cache
+from app.services.verification_ttl import is_fresh, max_ttl
+from app.services.verification_writer import VerificationWriter
+from app.services.zerobounce import get_zerobounce_service
+
+# Emails per cache probe query in verify_batch
+CACHE_PROBE_CHUNK_SIZE = 500
 
 
 class VerificationService:
     def __init__(self, db: Session):
         self.db = db
         self.zerobounce = get_zerobounce_service()
+        self.cache = get_verification_cache()
+        self.single_flight = get_single_flight()
+        self.domains = get_domain_cache()
 
     async def verify_email(
         self,
         email: str,
         batch_id: Optional[int] = None,
         use_cache: bool = True,
+        precheck: bool = True,
+        persist: bool = True,
     ) -> dict:
         """
         Verify an email address.
@@ -23,23 +45,115 @@ class VerificationService:
             email: Email address to verify
             batch_id: Optional batch job ID
             use_cache: Whether to use cached results (default True)
+            precheck: Whether to run the local pre-checks (verify_batch
+                already ran them for the whole batch)
+            persist: Whether to store the result; False when a
+                VerificationWriter persists it instead
 
         Returns:
             Verification result dictionary
         """
         email = email.lower().strip()
 
-        # Check cache (recent verification within 24 hours)
+        # Check cache: in-process/Redis tiers first, then recent DB rows
         if use_cache:
+            cached = self.cache.get(email)
+            if cached:
+                return cached
             cached = self._get_cached_result(email)
             if cached:
+                self.cache.set(email, cached)
                 return cached
 
-        # Verify with ZeroBounce
-        result = await self.zerobounce.verify_email(email)
+        # Certain-bad addresses never reach ZeroBounce
+        rejected = await self.precheck([email]) if precheck else {}
+        if rejected:
+            self._save(list(rejected.values()), batch_id, persist)
+            return rejected[email]
+
+        # Another address on this domain may have just proved it dead
+        if get_settings().domain_verdict_cache and self.domains.is_dead(email.rpartition("@")[2]):
+            result = dead_domain_result(email)
+            self._save([result], batch_id, persist)
+            return result
+
+        async def fetch() -> dict:
+            # Verify with ZeroBounce
+            result = await self.zerobounce.verify_email(email)
+
+            # Store result; the caches are updated right away either way so
+            # that waiters and later addresses on the domain see it
+            self._save([result], batch_id, persist)
+            return result
+
+        # Concurrent callers for the same email share one upstream request
+        return await self.single_flight.run(email, fetch, lambda: self.cache.peek(email))
+
+    def store_results(
+        self,
+        results: list[dict],
+        batch_id: Optional[int] = None,
+    ) -> list[EmailVerification]:
+        """Persist already-verified results (e.g. from the bulk file API)."""
+        records = [self._build_record(r["email"], r, batch_id) for r in results]
+        self.db.add_all(records)
+        self.db.commit()
+        self._remember(results)
+        return records
+
+    def _save(self, results: list[dict], batch_id: Optional[int], persist: bool) -> None:
+        if persist:
+            self.store_results(results, batch_id)
+        else:
+            self._remember(results)
+
+    def _remember(self, results: list[dict]) -> None:
+        self.cache.set_many({r["email"]: r for r in results})
+        self.domains.learn(results)
+
+    def resolve_dead_domains(self, emails: list[str]) -> dict[str, dict]:
+        """
+        Resolve normalized emails on known-dead domains without going upstream.
+
+        Domains missing from the domain cache are looked up in recent
+        EmailVerification rows, and any dead ones found there are cached.
+
+        Returns:
+            Mapping of email to a local result; the results are not stored
+        """
+        if not get_settings().domain_verdict_cache or not emails:
+            return {}
+
+        domains = list({email.rpartition("@")[2] for email in emails})
+        dead = self.domains.dead_domains(domains)
+        seeded = self._get_dead_domains([domain for domain in domains if domain not in dead])
+        self.domains.mark_dead(seeded)
+        dead |= seeded
+
+        return {
+            email: dead_domain_result(email)
+            for email in emails
+            if email.rpartition("@")[2] in dead
+        }
+
+    def record_dead_domain_skips(self, batch_id: Optional[int], count: int) -> None:
+        """Add to a batch's count of emails resolved by the domain cache."""
+        if not batch_id or not count:
+            return
+        self.db.query(BatchJob).filter(BatchJob.id == batch_id).update(
+            {BatchJob.dead_domain_count: BatchJob.dead_domain_count + count},
+            synchronize_session=False,
+        )
+        self.db.commit()
+
+    async def precheck(self, emails: list[str]) -> dict[str, dict]:
+        """Run the local pre-verification stage on normalized emails, if enabled."""
+        if not get_settings().precheck_enabled or not emails:
+            return {}
+        return await get_pre_verifier().check_many(emails)
 
-        # Store result
-        verification = EmailVerification(
+    def _build_record(self, email: str, result: dict, batch_id: Optional[int]) -> EmailVerification:
+        return EmailVerification(
             email=email,
             status=result["status"],
             sub_status=result.get("sub_status"),
@@ -53,64 +167,262 @@ class VerificationService:
             mx_record=result.get("mx_record"),
             batch_id=batch_id,
         )
-        self.db.add(verification)
-        self.db.commit()
-
-        return result
 
     def _get_cached_result(self, email: str) -> Optional[dict]:
-        """Get cached verification result if recent."""
-        from datetime import timedelta
-
-        cutoff = datetime.utcnow() - timedelta(hours=24)
-
+        """Get the latest verification result if still within its status TTL."""
         cached = (
             self.db.query(EmailVerification)
             .filter(
                 EmailVerification.email == email,
-                EmailVerification.created_at >= cutoff,
+                EmailVerification.created_at >= self._cache_cutoff(),
             )
             .order_by(EmailVerification.created_at.desc())
             .first()
         )
 
         if cached:
-            return {
-                "email": cached.email,
-                "status": cached.status,
-                "sub_status": cached.sub_status,
-                "score": cached.score,
-                "free_email": cached.free_email == "true" if cached.free_email else None,
-                "did_you_mean": cached.did_you_mean,
-                "domain": cached.domain,
-                "domain_age_days": cached.domain_age_days,
-                "smtp_provider": cached.smtp_provider,
-                "mx_found": cached.mx_found == "true" if cached.mx_found else None,
-                "mx_record": cached.mx_record,
-                "verified_at": cached.created_at,
-                "cached": True,
-            }
+            result = self._record_to_result(cached)
+            if is_fresh(result):
+                return result
 
         return None
 
+    def _get_cached_results(self, emails: list[str]) -> dict[str, dict]:
+        """
+        Get cached verification results for many emails at once.
+
+        Issues one DISTINCT ON (email) query per chunk, served by
+        ix_email_verifications_email_created, instead of one query per email.
+
+        Args:
+            emails: Normalized (lowercased, stripped) email addresses
+
+        Returns:
+            Mapping of email to its freshest cached result; misses are absent
+        """
+        cutoff = self._cache_cutoff()
+        found = {}
+
+        for start in range(0, len(emails), CACHE_PROBE_CHUNK_SIZE):
+            chunk = emails[start:start + CACHE_PROBE_CHUNK_SIZE]
+            rows = (
+                self.db.query(EmailVerification)
+                .filter(
+                    EmailVerification.email.in_(chunk),
+                    EmailVerification.created_at >= cutoff,
+                )
+                .order_by(EmailVerification.email, EmailVerification.created_at.desc())
+                .distinct(EmailVerification.email)
+                .all()
+            )
+            for row in rows:
+                result = self._record_to_result(row)
+                if is_fresh(result):
+                    found[row.email] = result
+
+        return found
+
+    def _get_dead_domains(self, domains: list[str]) -> set[str]:
+        """Domains whose latest verification within the verdict TTL proves them dead."""
+        cutoff = datetime.utcnow() - timedelta(seconds=get_settings().domain_verdict_ttl_seconds)
+        dead = set()
+
+        for start in range(0, len(domains), CACHE_PROBE_CHUNK_SIZE):
+            chunk = domains[start:start + CACHE_PROBE_CHUNK_SIZE]
+            rows = (
+                self.db.query(EmailVerification)
+                .filter(
+                    EmailVerification.domain.in_(chunk),
+                    EmailVerification.created_at >= cutoff,
+                )
+                .order_by(EmailVerification.domain, EmailVerification.created_at.desc())
+                .distinct(EmailVerification.domain)
+                .all()
+            )
+            for row in rows:
+                if is_dead_domain_result(self._record_to_result(row)):
+                    dead.add(row.domain)
+
+        return dead
+
+    def _cache_cutoff(self) -> datetime:
+        # Nothing older than the longest status TTL can be fresh
+        return datetime.utcnow() - timedelta(seconds=max_ttl())
+
+    def _record_to_result(self, cached: EmailVerification) -> dict:
+        return {
+            "email": cached.email,
+            "status": cached.status,
+            "sub_status": cached.sub_status,
+            "score": cached.score,
+            "free_email": cached.free_email == "true" if cached.free_email else None,
+            "did_you_mean": cached.did_you_mean,
+            "domain": cached.domain,
+            "domain_age_days": cached.domain_age_days,
+            "smtp_provider": cached.smtp_provider,
+            "mx_found": cached.mx_found == "true" if cached.mx_found else None,
+            "mx_record": cached.mx_record,
+            "verified_at": cached.created_at,
+            "cached": True,
+        }
+
+    async def resolve_locally(
+        self,
+        emails: list[str],
+        batch_id: Optional[int] = None,
+        use_cache: bool = True,
+        on_result: Optional[Callable[[int, dict], None]] = None,
+        writer: Optional[VerificationWriter] = None,
+    ) -> tuple[list, dict[str, list[int]]]:
+        """
+        Resolve whatever a batch can without calling ZeroBounce: cache hits,
+        local pre-check rejections and addresses on known-dead domains.
+
+        Args:
+            emails: Email addresses to verify
+            batch_id: Optional batch job ID
+            use_cache: Whether to use cached results (default True)
+            on_result: Optional callback ``(index, result)`` per resolved email
+            writer: Optional VerificationWriter the resolved results go to;
+                without one new results are stored directly
+
+        Returns:
+            Tuple of (results, groups): results in input order with None
+            for the emails still to verify, and those emails (normalized,
+            deduplicated) mapped to their input indexes
+        """
+        results: list = [None] * len(emails)
+        pending = list(range(len(emails)))
+
+        # Probe the cache for the whole batch up front; only misses go upstream
+        if use_cache:
+            normalized = [email.lower().strip() for email in emails]
+            unique = list(dict.fromkeys(normalized))
+            cached = self.cache.get_many(unique)
+            from_db = self._get_cached_results([email for email in unique if email not in cached])
+            self.cache.set_many(from_db)
+            cached.update(from_db)
+            pending = []
+            for index, email in enumerate(normalized):
+                if email in cached:
+                    results[index] = dict(cached[email])
+                    if writer is not None:
+                        writer.add(results[index], store=False)
+                    if on_result is not None:
+                        on_result(index, results[index])
+                else:
+                    pending.append(index)
+
+        # Deduplicate within the batch: one request per normalized email
+        groups: dict[str, list[int]] = {}
+        for index in pending:
+            groups.setdefault(emails[index].lower().strip(), []).append(index)
+
+        # Resolve syntax errors, disposable and dead domains locally
+        rejected = await self.precheck(list(groups))
+        if rejected:
+            self._save(list(rejected.values()), batch_id, writer is None)
+            for email, result in rejected.items():
+                for position, index in enumerate(groups.pop(email)):
+                    results[index] = dict(result)
+                    if writer is not None:
+                        writer.add(results[index], store=position == 0)
+                    if on_result is not None:
+                        on_result(index, results[index])
+
+        # Addresses on domains already known to be dead
+        dead = self.resolve_dead_domains(list(groups))
+        dead_domain_skips = 0
+        if dead:
+            self._save(list(dead.values()), batch_id, writer is None)
+            for email, result in dead.items():
+                for position, index in enumerate(groups.pop(email)):
+                    results[index] = dict(result)
+                    dead_domain_skips += 1
+                    if writer is not None:
+                        writer.add(results[index], store=position == 0)
+                    if on_result is not None:
+                        on_result(index, results[index])
+        self.record_dead_domain_skips(batch_id, dead_domain_skips)
+
+        return results, groups
+
     async def verify_batch(
         self,
         emails: list[str],
         batch_id: Optional[int] = None,
+        use_cache: bool = True,
+        concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[int, dict], None]] = None,
+        writer: Optional[VerificationWriter] = None,
     ) -> list[dict]:
-        """Verify a batch of emails."""
-        results = []
-        for email in emails:
-            try:
-                result = await self.verify_email(email, batch_id=batch_id)
-                results.append(result)
-            except ZeroBounceError as e:
-                results.append({
-                    "email": email,
-                    "status": "error",
-                    "error": str(e),
-                    "verified_at": datetime.utcnow(),
-                })
+        """
+        Verify a batch of emails with bounded concurrency.
+
+        Args:
+            emails: Email addresses to verify
+            batch_id: Optional batch job ID
+            use_cache: Whether to use cached results (default True)
+            concurrency: Max requests in flight (default from settings)
+            on_result: Optional callback ``(index, result)`` fired as each
+                email completes, e.g. to report task progress
+            writer: Optional VerificationWriter that persists results, leads
+                and batch counters in buffered bulk writes; without one each
+                new result is stored as it arrives
+
+        Returns:
+            Results in input order; failures are returned as items with
+            status "error" instead of aborting the batch
+        """
+        if concurrency is None:
+            concurrency = get_settings().verification_concurrency
+
+        results, groups = await self.resolve_locally(
+            emails, batch_id=batch_id, use_cache=use_cache, on_result=on_result, writer=writer
+        )
+        unique = [indexes[0] for indexes in groups.values()]
+        dead_domain_skips = 0
+
+        async def verify(email: str) -> dict:
+            return await self.verify_email(
+                email,
+                batch_id=batch_id,
+                use_cache=False,
+                precheck=False,
+                persist=writer is None,
+            )
+
+        def on_error(email: str, error: Exception) -> dict:
+            return {
+                "email": email,
+                "status": "error",
+                "error": str(error),
+                "verified_at": datetime.utcnow(),
+            }
+
+        def on_verified(position: int, result: dict):
+            nonlocal dead_domain_skips
+            first = unique[position]
+            for index in groups[emails[first].lower().strip()]:
+                results[index] = result if index == first else dict(result)
+                if result.get("sub_status") == DEAD_DOMAIN_SUB_STATUS:
+                    dead_domain_skips += 1
+                if writer is not None:
+                    writer.add(results[index], store=index == first)
+                if on_result is not None:
+                    on_result(index, results[index])
+
+        await bounded_gather(
+            [emails[index] for index in unique],
+            verify,
+            concurrency,
+            on_error,
+            on_verified,
+        )
+
+        if writer is not None:
+            writer.flush()
+        self.record_dead_domain_skips(batch_id, dead_domain_skips)
         return results
 
     def get_stats(self, results: list[dict]) -> dict:
@@ -0,0 +1,220 @@
+"""
+Two-tier cache for email verification results.
+
+Tier 1 is a bounded in-process LRU; tier 2 is the Redis instance already
+used as the Celery broker, so the API process and every worker share hits
+without touching Postgres. The email_verifications table remains the
+durable fallback behind both tiers. Entries expire according to the
+status-aware policy in verification_ttl.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+import redis
+
+from app.config import get_settings
+from app.services.verification_ttl import remaining_ttl
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "verification:"
+
+# After a Redis error the tier is skipped for this many seconds
+REDIS_RETRY_SECONDS = 30.0
+
+
+class LRUTier:
+    """Bounded, thread-safe LRU with a per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict, ttl: int) -> None:
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisTier:
+    """Shared Redis tier; degrades to a no-op while Redis is unreachable."""
+
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self._disabled_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    def _fail(self, error: Exception) -> None:
+        logger.warning(f"Verification cache: Redis unavailable, skipping for {REDIS_RETRY_SECONDS:.0f}s: {error}")
+        self._disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def get_many(self, keys: list[str]) -> list[Optional[dict]]:
+        if not keys or not self.available:
+            return [None] * len(keys)
+        try:
+            raw = self.client.mget([KEY_PREFIX + key for key in keys])
+        except redis.RedisError as e:
+            self._fail(e)
+            return [None] * len(keys)
+        return [_loads(value) if value is not None else None for value in raw]
+
+    def set_many(self, items: list[tuple[str, dict, int]]) -> None:
+        items = [(key, value, ttl) for key, value, ttl in items if ttl > 0]
+        if not items or not self.available:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value, ttl in items:
+                pipe.set(KEY_PREFIX + key, _dumps(value), ex=ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._fail(e)
+
+    def delete(self, key: str) -> None:
+        if not self.available:
+            return
+        try:
+            self.client.delete(KEY_PREFIX + key)
+        except redis.RedisError as e:
+            self._fail(e)
+
+
+class VerificationCache:
+    """In-process LRU in front of a shared Redis tier, with hit/miss counters."""
+
+    def __init__(self, lru: LRUTier, shared: Optional[RedisTier]):
+        self.lru = lru
+        self.shared = shared
+        self.counters = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "sets": 0}
+
+    def get(self, email: str) -> Optional[dict]:
+        return self.get_many([email]).get(email)
+
+    def get_many(self, emails: list[str]) -> dict[str, dict]:
+        """Look up normalized emails; returns only the hits."""
+        found, redis_hits = self._lookup(emails)
+        self.counters["memory_hits"] += len(found) - redis_hits
+        self.counters["redis_hits"] += redis_hits
+        self.counters["misses"] += len(emails) - len(found)
+        return found
+
+    def peek(self, email: str) -> Optional[dict]:
+        """Like get, but left out of the hit/miss counters (e.g. for repeated polls)."""
+        return self._lookup([email])[0].get(email)
+
+    def _lookup(self, emails: list[str]) -> tuple[dict[str, dict], int]:
+        found = {}
+        remaining = []
+        for email in emails:
+            value = self.lru.get(email)
+            if value is not None:
+                found[email] = value
+            else:
+                remaining.append(email)
+
+        redis_hits = 0
+        if remaining and self.shared is not None:
+            for email, value in zip(remaining, self.shared.get_many(remaining)):
+                if value is not None:
+                    found[email] = value
+                    self.lru.set(email, value, remaining_ttl(value))
+                    redis_hits += 1
+
+        return {email: {**value, "cached": True} for email, value in found.items()}, redis_hits
+
+    def set(self, email: str, result: dict) -> None:
+        self.set_many({email: result})
+
+    def set_many(self, results: dict[str, dict]) -> None:
+        """Store results in both tiers, each with its remaining status TTL."""
+        items = []
+        for email, result in results.items():
+            if result.get("status") == "error":
+                continue
+            value = {k: v for k, v in result.items() if k != "cached"}
+            ttl = remaining_ttl(value)
+            self.lru.set(email, value, ttl)
+            items.append((email, value, ttl))
+        if self.shared is not None:
+            self.shared.set_many(items)
+        self.counters["sets"] += len(items)
+
+    def invalidate(self, email: str) -> None:
+        self.lru.delete(email)
+        if self.shared is not None:
+            self.shared.delete(email)
+
+    def stats(self) -> dict:
+        lookups = self.counters["memory_hits"] + self.counters["redis_hits"] + self.counters["misses"]
+        hits = lookups - self.counters["misses"]
+        return {
+            **self.counters,
+            "memory_entries": len(self.lru),
+            "redis_enabled": self.shared is not None,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _dumps(value: dict) -> str:
+    return json.dumps(value, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+
+
+def _loads(raw: bytes) -> Optional[dict]:
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return None
+    if isinstance(value.get("verified_at"), str):
+        try:
+            value["verified_at"] = datetime.fromisoformat(value["verified_at"])
+        except ValueError:
+            pass
+    return value
+
+
+# Singleton instance
+_verification_cache: Optional[VerificationCache] = None
+
+
+def get_verification_cache() -> VerificationCache:
+    global _verification_cache
+    if _verification_cache is None:
+        settings = get_settings()
+        _verification_cache = VerificationCache(
+            lru=LRUTier(settings.verification_cache_max_entries),
+            shared=RedisTier(settings.redis_url) if settings.verification_cache_redis else None,
+        )
+    return _verification_cache
@@ -0,0 +1,69 @@
+"""
+Status-aware TTL policy for verification results.
+
+A "valid" or "invalid" verdict is stable for weeks, while "unknown" or a
+greylisted mailbox is worth re-checking within the hour. The same policy
+drives every cache tier, the database cache lookup and re-verification
+scheduling.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import case, func
+
+from app.config import get_settings
+from app.models.email import EmailVerification
+
+
+def ttl_for(status: Optional[str], sub_status: Optional[str] = None) -> int:
+    """TTL in seconds for a verification with the given status/sub-status."""
+    settings = get_settings()
+    if sub_status and sub_status in settings.verification_ttl_by_sub_status:
+        return settings.verification_ttl_by_sub_status[sub_status]
+    return settings.verification_ttl_by_status.get(status or "", settings.verification_cache_ttl_seconds)
+
+
+def max_ttl() -> int:
+    """Longest TTL in the policy; bounds how far back the DB cache looks."""
+    settings = get_settings()
+    return max(
+        [settings.verification_cache_ttl_seconds]
+        + list(settings.verification_ttl_by_status.values())
+        + list(settings.verification_ttl_by_sub_status.values())
+    )
+
+
+def remaining_ttl(result: dict, now: Optional[datetime] = None) -> int:
+    """Seconds until a result expires, measured from its verified_at."""
+    ttl = ttl_for(result.get("status"), result.get("sub_status"))
+    verified_at = result.get("verified_at")
+    if not isinstance(verified_at, datetime):
+        return ttl
+    if verified_at.tzinfo is not None:
+        verified_at = verified_at.astimezone(timezone.utc).replace(tzinfo=None)
+    age = ((now or datetime.utcnow()) - verified_at).total_seconds()
+    return max(0, int(ttl - age))
+
+
+def is_fresh(result: dict, now: Optional[datetime] = None) -> bool:
+    return remaining_ttl(result, now) > 0
+
+
+def ttl_seconds_expr():
+    """SQL expression giving each EmailVerification row's TTL in seconds."""
+    settings = get_settings()
+    whens = [
+        (EmailVerification.sub_status == sub_status, ttl)
+        for sub_status, ttl in settings.verification_ttl_by_sub_status.items()
+    ] + [
+        (EmailVerification.status == status, ttl)
+        for status, ttl in settings.verification_ttl_by_status.items()
+    ]
+    return case(*whens, else_=settings.verification_cache_ttl_seconds)
+
+
+def expired_filter():
+    """SQL predicate matching EmailVerification rows past their TTL."""
+    age = func.extract("epoch", func.now() - EmailVerification.created_at)
+    return age > ttl_seconds_expr()
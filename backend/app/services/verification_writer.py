@@ -0,0 +1,145 @@
+"""
+Buffered persistence for batch verification results.
+
+Writing each result on its own costs an EmailVerification INSERT and
+commit, a re-query of that row, a Lead upsert and a BatchJob counter
+commit. VerificationWriter instead accumulates results and, every N items
+or T seconds, writes the verification rows with one multi-row INSERT,
+upserts the leads with INSERT ... ON CONFLICT (email), bumps the batch
+counters with a single UPDATE and commits once.
+"""
+
+import logging
+import time
+from collections import Counter
+from typing import Callable, Optional
+
+from app.config import get_settings
+from app.models.batch import BatchJob
+from app.models.email import EmailVerification
+
+logger = logging.getLogger(__name__)
+
+
+class VerificationWriter:
+    def __init__(
+        self,
+        service,
+        batch_id: Optional[int] = None,
+        source: str = "csv",
+        flush_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        on_flush: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Args:
+            service: VerificationService whose session is used
+            batch_id: BatchJob to attach rows to and whose counters to update
+            source: Lead source for newly created leads
+            flush_size: Flush after this many results (default from settings)
+            flush_interval: Flush when this many seconds have passed since
+                the last flush (default from settings)
+            on_flush: Optional callback with the number of results written
+                so far, e.g. to report task progress
+        """
+        settings = get_settings()
+        self.service = service
+        self.db = service.db
+        self.batch_id = batch_id
+        self.source = source
+        self.flush_size = flush_size or settings.verification_flush_size
+        self.flush_interval = flush_interval if flush_interval is not None else settings.verification_flush_interval
+        self.on_flush = on_flush
+        self.written = 0
+        self._config = None
+        self._pending: list[tuple[dict, bool]] = []
+        self._last_flush = time.monotonic()
+
+    def add(self, result: dict, store: bool = True) -> None:
+        """
+        Buffer one result.
+
+        Args:
+            result: Verification result dict
+            store: Whether to insert an EmailVerification row; False for
+                cache hits and duplicates that only need lead/counter updates
+        """
+        self._pending.append((result, store))
+        if (
+            len(self._pending) >= self.flush_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        from app.services.lead_manager import upsert_leads_from_verifications
+        from app.services.scoring import get_active_config
+
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        to_store = [result for result, store in pending if store and result.get("status") != "error"]
+        records = [self.service._build_record(r["email"], r, self.batch_id) for r in to_store]
+        if records:
+            # Batched into multi-row INSERT ... RETURNING id by SQLAlchemy
+            self.db.add_all(records)
+            self.db.flush()
+
+        # Cache hits need the id of the row they came from
+        stored = {record.email for record in records}
+        reused = list({
+            result["email"]
+            for result, store in pending
+            if result.get("status") != "error" and result["email"] not in stored
+        })
+        if reused:
+            records += (
+                self.db.query(EmailVerification)
+                .filter(EmailVerification.email.in_(reused))
+                .order_by(EmailVerification.email, EmailVerification.created_at.desc())
+                .distinct(EmailVerification.email)
+                .all()
+            )
+
+        if records:
+            if self._config is None:
+                self._config = get_active_config(self.db)
+            try:
+                with self.db.begin_nested():
+                    upsert_leads_from_verifications(self.db, records, self.source, self._config)
+            except Exception as e:
+                logger.warning(f"Failed to upsert {len(records)} leads: {e}")
+
+        counts = Counter(processed=len(pending))
+        for result, _ in pending:
+            status = result.get("status")
+            if status in ("valid", "invalid"):
+                counts[status] += 1
+            elif status != "error":
+                counts["unknown"] += 1
+        if self.batch_id:
+            increment_batch_counters(self.db, self.batch_id, counts)
+
+        self.db.commit()
+        self.written += len(pending)
+
+        if self.on_flush is not None:
+            self.on_flush(self.written)
+
+    def close(self) -> None:
+        self.flush()
+
+
+def increment_batch_counters(db, batch_id: int, counts: Counter) -> None:
+    """Atomically add to a batch's counters; safe across concurrent tasks. The caller commits."""
+    columns = {
+        "processed": BatchJob.processed_emails,
+        "valid": BatchJob.valid_count,
+        "invalid": BatchJob.invalid_count,
+        "unknown": BatchJob.unknown_count,
+    }
+    values = {column: column + counts[key] for key, column in columns.items() if counts[key]}
+    if values:
+        db.query(BatchJob).filter(BatchJob.id == batch_id).update(values, synchronize_session=False)
@@ -1,8 +1,15 @@
+import asyncio
+import csv
+import io
+import json
+import logging
 import httpx
-from typing import Optional
+from typing import Iterator, Optional
 from datetime import datetime
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 class ZeroBounceError(Exception):
     """Custom exception for ZeroBounce API errors."""
@@ -14,6 +21,43 @@ class ZeroBounceService:
         self.settings = get_settings()
         self.base_url = self.settings.zerobounce_base_url
         self.api_key = self.settings.zerobounce_api_key
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared pooled client, creating it on first use.
+
+        httpx clients are bound to the event loop they were first used on,
+        so a new client is created if the running loop has changed (e.g. a
+        Celery task that started a fresh loop). The stale client's
+        connections belong to a dead loop and are simply dropped.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.settings.zerobounce_timeout,
+                limits=httpx.Limits(
+                    max_connections=self.settings.zerobounce_max_connections,
+                    max_keepalive_connections=self.settings.zerobounce_max_keepalive_connections,
+                    keepalive_expiry=self.settings.zerobounce_keepalive_expiry,
+                ),
+                http2=self.settings.zerobounce_http2,
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled client if it belongs to the running loop."""
+        client, client_loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client is None or client.is_closed:
+            return
+        if client_loop is not asyncio.get_running_loop():
+            logger.debug("Dropping ZeroBounce client bound to another event loop")
+            return
+        await client.aclose()
 
     async def verify_email(self, email: str, ip_address: Optional[str] = None) -> dict:
         """
@@ -36,37 +80,156 @@ class ZeroBounceService:
         if ip_address:
             params["ip_address"] = ip_address
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{self.base_url}/validate",
-                params=params,
-            )
+        response = await self._get_client().get(
+            f"{self.base_url}/validate",
+            params=params,
+        )
 
-            if response.status_code != 200:
-                raise ZeroBounceError(f"API request failed: {response.status_code}")
+        if response.status_code != 200:
+            raise ZeroBounceError(f"API request failed: {response.status_code}")
 
-            data = response.json()
+        data = response.json()
 
-            if "error" in data:
-                raise ZeroBounceError(data["error"])
+        if "error" in data:
+            raise ZeroBounceError(data["error"])
 
-            return self._parse_response(email, data)
+        return self._parse_response(email, data)
 
     async def get_credits(self) -> dict:
         """Get remaining API credits."""
         if not self.api_key:
             raise ZeroBounceError("ZeroBounce API key not configured")
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{self.base_url}/getcredits",
-                params={"api_key": self.api_key},
-            )
+        response = await self._get_client().get(
+            f"{self.base_url}/getcredits",
+            params={"api_key": self.api_key},
+            timeout=10.0,
+        )
+
+        if response.status_code != 200:
+            raise ZeroBounceError(f"API request failed: {response.status_code}")
+
+        return response.json()
+
+    async def send_file(self, emails: list[str]) -> str:
+        """
+        Upload a list of emails to the bulk file API.
+
+        Returns:
+            The ZeroBounce file_id used to poll and download results
+        """
+        if not self.api_key:
+            raise ZeroBounceError("ZeroBounce API key not configured")
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["email"])
+        for email in emails:
+            writer.writerow([email])
+
+        response = await self._get_client().post(
+            f"{self.settings.zerobounce_bulk_base_url}/sendfile",
+            data={
+                "api_key": self.api_key,
+                "email_address_column": "1",
+                "has_header_row": "true",
+            },
+            files={"file": ("emails.csv", buffer.getvalue().encode("utf-8"), "text/csv")},
+            timeout=300.0,
+        )
+
+        if response.status_code != 200:
+            raise ZeroBounceError(f"Bulk upload failed: {response.status_code}")
+
+        data = response.json()
+        if not data.get("success") or not data.get("file_id"):
+            raise ZeroBounceError(f"Bulk upload rejected: {data.get('message') or data}")
+
+        return data["file_id"]
 
+    async def get_file_status(self, file_id: str) -> dict:
+        """Get the processing status of a bulk file."""
+        response = await self._get_client().get(
+            f"{self.settings.zerobounce_bulk_base_url}/filestatus",
+            params={"api_key": self.api_key, "file_id": file_id},
+        )
+
+        if response.status_code != 200:
+            raise ZeroBounceError(f"Bulk status request failed: {response.status_code}")
+
+        data = response.json()
+        if not data.get("success", True):
+            raise ZeroBounceError(f"Bulk status failed: {data.get('message') or data}")
+
+        return data
+
+    async def file_ready(self, file_id: str) -> bool:
+        """
+        Check once whether ZeroBounce has finished processing a bulk file.
+
+        Returns:
+            True when the results can be downloaded, False while processing
+        """
+        status = await self.get_file_status(file_id)
+        file_status = str(status.get("file_status", "")).lower()
+
+        if file_status == "complete":
+            return True
+        if file_status in ("deleted", "failed", "error"):
+            raise ZeroBounceError(f"Bulk file {file_id} ended with status {file_status}")
+        return False
+
+    async def download_file(self, file_id: str, dest_path: str) -> str:
+        """Stream a completed bulk results file to disk."""
+        async with self._get_client().stream(
+            "GET",
+            f"{self.settings.zerobounce_bulk_base_url}/getfile",
+            params={"api_key": self.api_key, "file_id": file_id},
+            timeout=300.0,
+        ) as response:
             if response.status_code != 200:
-                raise ZeroBounceError(f"API request failed: {response.status_code}")
+                raise ZeroBounceError(f"Bulk download failed: {response.status_code}")
+
+            # Errors (e.g. file not ready) come back as JSON instead of CSV
+            if "application/json" in response.headers.get("content-type", ""):
+                data = json.loads(await response.aread())
+                raise ZeroBounceError(f"Bulk download failed: {data.get('message') or data}")
+
+            with open(dest_path, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
 
-            return response.json()
+        return dest_path
+
+    def iter_file_results(self, path: str) -> Iterator[dict]:
+        """
+        Parse a downloaded bulk results file row by row.
+
+        Yields results in the same format as verify_email.
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                data = {}
+                email = None
+                for key, value in row.items():
+                    if key is None:
+                        continue
+                    name = key.strip().lower()
+                    if name == "email":
+                        email = value
+                        continue
+                    if name.startswith("zb "):
+                        name = name[3:]
+                    data[name.replace(" ", "_")] = value
+
+                if not email:
+                    continue
+
+                for flag in ("free_email", "mx_found"):
+                    if data.get(flag) is not None:
+                        data[flag] = data[flag].strip().lower()
+
+                yield self._parse_response(email.lower().strip(), data)
 
     def _parse_response(self, email: str, data: dict) -> dict:
         """Parse ZeroBounce API response into our standard format."""
@@ -80,7 +243,7 @@ class ZeroBounceService:
             "domain": data.get("domain"),
             "domain_age_days": self._parse_int(data.get("domain_age_days")),
             "smtp_provider": data.get("smtp_provider"),
-            "mx_found": data.get("mx_found") == "true",
+            "mx_found": self._parse_flag(data.get("mx_found")),
             "mx_record": data.get("mx_record"),
             "verified_at": datetime.utcnow(),
         }
@@ -90,6 +253,12 @@ class ZeroBounceService:
         # This is a placeholder - actual scoring would depend on status
         return None
 
+    def _parse_flag(self, value: Optional[str]) -> Optional[bool]:
+        """Parse a "true"/"false" field; missing or empty values are unknown (None)."""
+        if value is None or str(value).strip() == "":
+            return None
+        return str(value).strip().lower() == "true"
+
     def _parse_int(self, value: Optional[str]) -> Optional[int]:
         """Safely parse a string to int."""
         if value is None or value == "":
@@ -109,3 +278,9 @@ def get_zerobounce_service() -> ZeroBounceService:
     if _zerobounce_service is None:
         _zerobounce_service = ZeroBounceService()
     return _zerobounce_service
+
+
+async def close_zerobounce_service() -> None:
+    """Release the singleton's pooled connections (called at shutdown)."""
+    if _zerobounce_service is not None:
+        await _zerobounce_service.aclose()
@@ -1,5 +1,6 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_shutdown
 from app.config import get_settings
 
 settings = get_settings()
@@ -8,7 +9,7 @@ celery_app = Celery(
     "ebomboleadmanager",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["app.tasks.verification", "app.tasks.enrichment", "app.tasks.linkedin", "app.tasks.pipeline", "app.tasks.oneclick_pipeline"],
+    include=["app.tasks.verification", "app.tasks.enrichment", "app.tasks.linkedin", "app.tasks.pipeline", "app.tasks.oneclick_pipeline", "app.tasks.leads"],
 )
 
 celery_app.conf.update(
@@ -39,12 +40,29 @@ def parse_cron_schedule(schedule_str: str) -> dict:
     }
 
 
+beat_schedule = {}
+
 # Configure Celery Beat schedule for LinkedIn scraping
 if settings.linkedin_username and settings.linkedin_password:
     cron_kwargs = parse_cron_schedule(settings.linkedin_scrape_schedule)
-    celery_app.conf.beat_schedule = {
-        "scheduled-linkedin-scrape": {
-            "task": "app.tasks.linkedin.scheduled_linkedin_scrape",
-            "schedule": crontab(**cron_kwargs),
-        },
+    beat_schedule["scheduled-linkedin-scrape"] = {
+        "task": "app.tasks.linkedin.scheduled_linkedin_scrape",
+        "schedule": crontab(**cron_kwargs),
+    }
+
+# Re-verify leads whose verification result has outlived its status TTL
+if settings.reverification_enabled:
+    beat_schedule["reverify-expired-leads"] = {
+        "task": "app.tasks.verification.reverify_expired_leads",
+        "schedule": crontab(minute=0),
     }
+
+celery_app.conf.beat_schedule = beat_schedule
+
+
+@worker_process_shutdown.connect
+def close_http_clients(**kwargs):
+    """Release pooled HTTP connections when a worker process exits."""
+    from app.tasks.runner import close_task_loop
+
+    close_task_loop()
@@ -1,11 +1,14 @@
-import asyncio
 import logging
 from datetime import datetime
+from app.config import get_settings
 from app.tasks import celery_app
+from app.tasks.runner import run_async
 from app.database import SessionLocal
 from app.models.batch import BatchJob
 from app.models.enrichment import ContactEnrichment
 from app.services.apollo import get_apollo_service
+from app.services.concurrency import bounded_gather
+from app.services.lead_manager import EnrichmentLeadBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,10 @@ def enrich_contacts_with_apollo(self, batch_id: int, contact_data: list[dict]):
         batch_id: ID of the BatchJob
         contact_data: List of contact dicts with email (and optionally contact_id, status)
     """
+    return run_async(_enrich_contacts_with_apollo(self, batch_id, contact_data))
+
+
+async def _enrich_contacts_with_apollo(task, batch_id: int, contact_data: list[dict]):
     db = SessionLocal()
     try:
         batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
@@ -38,14 +45,29 @@ def enrich_contacts_with_apollo(self, batch_id: int, contact_data: list[dict]):
         enriched_count = 0
         error_count = 0
 
-        for i, contact in enumerate(contact_data):
-            email = contact.get("email")
-            if not email:
-                continue
+        contacts = [contact for contact in contact_data if contact.get("email")]
+        done = 0
+
+        async def enrich(contact: dict) -> dict:
+            return await apollo_service.enrich_person(contact["email"])
+
+        def on_error(contact: dict, error: Exception) -> dict:
+            return {
+                "email": contact["email"],
+                "contact_id": contact.get("contact_id"),
+                "enriched": False,
+                "error": str(error),
+            }
+
+        def on_result(index: int, enrichment_data: dict):
+            nonlocal enriched_count, error_count, done
+            contact = contacts[index]
+            email = contact["email"]
+            done += 1
 
             try:
-                # Enrich with Apollo
-                enrichment_data = asyncio.run(apollo_service.enrich_person(email))
+                if "error" in enrichment_data:
+                    raise Exception(enrichment_data["error"])
 
                 # Save to database
                 enrichment = ContactEnrichment(
@@ -75,16 +97,8 @@ def enrich_contacts_with_apollo(self, batch_id: int, contact_data: list[dict]):
                     apollo_id=enrichment_data.get("apollo_id"),
                     batch_id=batch_id,
                 )
-                db.add(enrichment)
-                db.commit()
-                db.refresh(enrichment)
-
-                # Upsert lead record
-                try:
-                    from app.services.lead_manager import upsert_lead_from_enrichment
-                    upsert_lead_from_enrichment(db, email, enrichment)
-                except Exception as lead_err:
-                    logger.warning(f"Failed to upsert lead from enrichment for {email}: {lead_err}")
+                # Lead upserts are written in bulk
+                leads.add(enrichment)
 
                 if enrichment_data.get("enriched"):
                     enriched_count += 1
@@ -93,20 +107,21 @@ def enrich_contacts_with_apollo(self, batch_id: int, contact_data: list[dict]):
                 results.append(enrichment_data)
 
                 # Update progress
-                batch.processed_emails = i + 1
+                batch.processed_emails = done
                 db.commit()
 
-                self.update_state(
+                task.update_state(
                     state="PROGRESS",
                     meta={
-                        "current": i + 1,
+                        "current": done,
                         "total": len(contact_data),
-                        "percent": int((i + 1) / len(contact_data) * 100),
+                        "percent": int(done / len(contact_data) * 100),
                         "enriched": enriched_count,
                     },
                 )
 
             except Exception as e:
+                db.rollback()
                 error_count += 1
                 # Save error record
                 enrichment = ContactEnrichment(
@@ -125,6 +140,16 @@ def enrich_contacts_with_apollo(self, batch_id: int, contact_data: list[dict]):
                     "error": str(e),
                 })
 
+        leads = EnrichmentLeadBuffer(db)
+        await bounded_gather(
+            contacts,
+            enrich,
+            get_settings().apollo_concurrency,
+            on_error,
+            on_result,
+        )
+        leads.flush()
+
         # Update batch status
         batch.status = "completed"
         batch.completed_at = datetime.utcnow()
@@ -172,6 +197,17 @@ def verify_and_enrich_hubspot_contacts(
         contact_data: List of contact dicts with id and email
         enrich_valid_only: If True, only enrich emails marked as valid
     """
+    return run_async(
+        _verify_and_enrich_hubspot_contacts(self, batch_id, contact_data, enrich_valid_only)
+    )
+
+
+async def _verify_and_enrich_hubspot_contacts(
+    task,
+    batch_id: int,
+    contact_data: list[dict],
+    enrich_valid_only: bool,
+):
     from app.services.verification import get_verification_service
 
     db = SessionLocal()
@@ -188,11 +224,8 @@ def verify_and_enrich_hubspot_contacts(
         verification_service = get_verification_service(db)
         apollo_service = get_apollo_service()
 
-        results = []
-        valid_emails = []
-
         # Phase 1: Verify all emails with ZeroBounce
-        self.update_state(
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "verification",
@@ -202,52 +235,45 @@ def verify_and_enrich_hubspot_contacts(
             },
         )
 
-        for i, contact in enumerate(contact_data):
-            email = contact["email"]
-            try:
-                verification = asyncio.run(
-                    verification_service.verify_email(email, batch_id=batch_id)
-                )
-                verification["contact_id"] = contact["id"]
-                results.append(verification)
-
-                # Track valid emails for enrichment
-                if verification.get("status") == "valid":
-                    batch.valid_count += 1
-                    valid_emails.append(contact)
-                elif verification.get("status") == "invalid":
-                    batch.invalid_count += 1
-                else:
-                    batch.unknown_count += 1
-
-                batch.processed_emails = i + 1
-                db.commit()
+        emails = [contact["email"] for contact in contact_data]
 
-                self.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "phase": "verification",
-                        "current": i + 1,
-                        "total": len(contact_data),
-                        "percent": int((i + 1) / len(contact_data) * 50),  # First 50%
-                        "valid": batch.valid_count,
-                        "invalid": batch.invalid_count,
-                    },
-                )
+        def on_verified(index: int, verification: dict):
+            verification["contact_id"] = contact_data[index]["id"]
 
-            except Exception as e:
-                results.append({
-                    "contact_id": contact["id"],
-                    "email": email,
-                    "status": "error",
-                    "error": str(e),
-                })
+            # Track valid emails for enrichment
+            if verification.get("status") == "valid":
+                batch.valid_count += 1
+            elif verification.get("status") == "invalid":
+                batch.invalid_count += 1
+            elif verification.get("status") != "error":
+                batch.unknown_count += 1
+
+            batch.processed_emails += 1
+            db.commit()
+
+            task.update_state(
+                state="PROGRESS",
+                meta={
+                    "phase": "verification",
+                    "current": batch.processed_emails,
+                    "total": len(contact_data),
+                    "percent": int(batch.processed_emails / len(contact_data) * 50),  # First 50%
+                    "valid": batch.valid_count,
+                    "invalid": batch.invalid_count,
+                },
+            )
+
+        results = await verification_service.verify_batch(emails, batch_id=batch_id, on_result=on_verified)
+        valid_emails = [
+            contact for contact, verification in zip(contact_data, results)
+            if verification.get("status") == "valid"
+        ]
 
         # Phase 2: Enrich valid emails with Apollo
         contacts_to_enrich = valid_emails if enrich_valid_only else contact_data
         enrichments = []
 
-        self.update_state(
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "enrichment",
@@ -257,11 +283,26 @@ def verify_and_enrich_hubspot_contacts(
             },
         )
 
-        for i, contact in enumerate(contacts_to_enrich):
+        async def enrich(contact: dict) -> dict:
+            return await apollo_service.enrich_person(contact["email"])
+
+        def on_enrich_error(contact: dict, error: Exception) -> dict:
+            return {
+                "contact_id": contact["id"],
+                "email": contact["email"],
+                "enriched": False,
+                "error": str(error),
+            }
+
+        def on_enriched(index: int, enrichment: dict):
+            contact = contacts_to_enrich[index]
             email = contact["email"]
-            try:
-                enrichment = asyncio.run(apollo_service.enrich_person(email))
 
+            if "error" in enrichment:
+                enrichments.append(enrichment)
+                return
+
+            try:
                 # Save enrichment to database
                 enrichment_record = ContactEnrichment(
                     email=email,
@@ -290,32 +331,25 @@ def verify_and_enrich_hubspot_contacts(
                     apollo_id=enrichment.get("apollo_id"),
                     batch_id=batch_id,
                 )
-                db.add(enrichment_record)
-                db.commit()
-                db.refresh(enrichment_record)
-
-                # Upsert lead record
-                try:
-                    from app.services.lead_manager import upsert_lead_from_enrichment
-                    upsert_lead_from_enrichment(db, email, enrichment_record, source="hubspot")
-                except Exception as lead_err:
-                    logger.warning(f"Failed to upsert lead from enrichment for {email}: {lead_err}")
+                # Lead upserts are written in bulk
+                leads.add(enrichment_record)
 
                 enrichment["contact_id"] = contact["id"]
                 enrichments.append(enrichment)
 
-                self.update_state(
+                task.update_state(
                     state="PROGRESS",
                     meta={
                         "phase": "enrichment",
-                        "current": i + 1,
+                        "current": len(enrichments),
                         "total": len(contacts_to_enrich),
-                        "percent": 50 + int((i + 1) / len(contacts_to_enrich) * 50),
+                        "percent": 50 + int(len(enrichments) / len(contacts_to_enrich) * 50),
                         "enriched": sum(1 for e in enrichments if e.get("enriched")),
                     },
                 )
 
             except Exception as e:
+                db.rollback()
                 enrichments.append({
                     "contact_id": contact["id"],
                     "email": email,
@@ -323,6 +357,16 @@ def verify_and_enrich_hubspot_contacts(
                     "error": str(e),
                 })
 
+        leads = EnrichmentLeadBuffer(db, source="hubspot")
+        await bounded_gather(
+            contacts_to_enrich,
+            enrich,
+            get_settings().apollo_concurrency,
+            on_enrich_error,
+            on_enriched,
+        )
+        leads.flush()
+
         # Complete
         batch.status = "completed"
         batch.completed_at = datetime.utcnow()
@@ -0,0 +1,251 @@
+"""
+Lead maintenance Celery tasks: backfilling the leads table from existing data
+and rescoring leads after scoring config or input changes.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import redis
+from celery.exceptions import SoftTimeLimitExceeded
+
+from app.config import get_settings
+from app.tasks import celery_app
+from app.database import SessionLocal
+from app.models.batch import BatchJob
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_KEY = "backfill:checkpoint:{batch_id}"
+
+# Checkpoints outlive any realistic gap between a crash and the retry
+CHECKPOINT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def find_running_job(db, source: str) -> Optional[BatchJob]:
+    """
+    Return the pending or processing BatchJob of ``source``, if any.
+
+    A job whose current run started (or, if pending, which was created)
+    longer ago than the hard task time limit cannot still be running: its
+    worker was killed, crashed or the task was revoked before it could
+    record a failure. Such jobs are marked failed and ignored.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=celery_app.conf.task_time_limit)
+    jobs = (
+        db.query(BatchJob)
+        .filter(BatchJob.source == source, BatchJob.status.in_(["pending", "processing"]))
+        .order_by(BatchJob.id.desc())
+        .all()
+    )
+
+    running = None
+    for job in jobs:
+        started = job.started_at or job.created_at
+        if started is not None and started.tzinfo is not None:
+            started = started.astimezone(timezone.utc).replace(tzinfo=None)
+        if started is not None and started < cutoff:
+            logger.warning(f"{source} job {job.id} ({job.status}) exceeded the task time limit; marking it failed")
+            job.status = "failed"
+            job.error_message = "Abandoned: the task stopped without reporting a result"
+        elif running is None:
+            running = job
+    db.commit()
+    return running
+
+
+def _checkpoint_client() -> Optional[redis.Redis]:
+    try:
+        client = redis.Redis.from_url(get_settings().redis_url, decode_responses=True, socket_timeout=2.0)
+        client.ping()
+        return client
+    except redis.RedisError as e:
+        logger.warning(f"Backfill checkpoints disabled, Redis unavailable: {e}")
+        return None
+
+
+@celery_app.task(bind=True, acks_late=True, soft_time_limit=3300, max_retries=None)
+def backfill_leads_task(self, batch_id: int):
+    """
+    Populate leads from existing verification and enrichment data.
+
+    Progress is checkpointed in Redis after every committed chunk. If the
+    worker dies (the task is acked late, so it is redelivered) or the soft
+    time limit is reached (the task re-queues itself), the next run resumes
+    from the last checkpoint instead of starting over.
+
+    Args:
+        batch_id: BatchJob (source "backfill") used to report progress
+    """
+    from app.services.lead_manager import backfill_leads, new_backfill_state
+    from app.models.email import EmailVerification
+    from app.models.enrichment import ContactEnrichment
+    from app.models.lead import Lead
+    from sqlalchemy import func
+
+    db = SessionLocal()
+    checkpoints = _checkpoint_client()
+    key = CHECKPOINT_KEY.format(batch_id=batch_id)
+    try:
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if not batch:
+            return {"error": "Batch not found"}
+
+        state = None
+        if checkpoints is not None:
+            raw = checkpoints.get(key)
+            state = json.loads(raw) if raw else None
+
+        if state is None:
+            # Progress is measured in rows: one per source email plus one per lead scored
+            state = new_backfill_state()
+            batch.total_emails = (
+                db.query(func.count(func.distinct(func.lower(EmailVerification.email)))).scalar()
+                + db.query(func.count(func.distinct(func.lower(ContactEnrichment.email))))
+                .filter(ContactEnrichment.enriched == True)
+                .scalar()
+                + db.query(func.count(Lead.id)).scalar()
+            )
+            batch.processed_emails = 0
+            batch.status = "processing"
+            batch.started_at = datetime.utcnow()
+            db.commit()
+        else:
+            logger.info(f"Backfill {batch_id}: resuming {state['phase']} after {state['after']!r}")
+            # started_at marks the current run, which find_running_job ages
+            batch.started_at = datetime.utcnow()
+            db.commit()
+
+        def on_chunk(state: dict):
+            if checkpoints is not None:
+                try:
+                    checkpoints.set(key, json.dumps(state), ex=CHECKPOINT_TTL_SECONDS)
+                except redis.RedisError as e:
+                    logger.warning(f"Backfill {batch_id}: could not save checkpoint: {e}")
+
+            batch.processed_emails = min(state["processed"], batch.total_emails)
+            db.commit()
+
+            self.update_state(
+                state="PROGRESS",
+                meta={
+                    "phase": f"backfill_{state['phase']}" if state["phase"] != "scoring" else "scoring",
+                    "current": batch.processed_emails,
+                    "total": batch.total_emails,
+                    "percent": int(batch.processed_emails / max(batch.total_emails, 1) * 100),
+                    "created": state["created"],
+                    "updated": state["updated"],
+                },
+            )
+
+        result = backfill_leads(db, state=state, on_chunk=on_chunk)
+
+        batch.status = "completed"
+        batch.processed_emails = batch.total_emails
+        batch.completed_at = datetime.utcnow()
+        db.commit()
+
+        if checkpoints is not None:
+            checkpoints.delete(key)
+
+        return {"batch_id": batch_id, "status": "completed", **result}
+
+    except SoftTimeLimitExceeded:
+        db.rollback()
+        logger.info(f"Backfill {batch_id}: time limit reached, re-queueing from checkpoint")
+        raise self.retry(countdown=0)
+
+    except Exception as e:
+        db.rollback()
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if batch:
+            batch.status = "failed"
+            batch.error_message = str(e)
+            db.commit()
+        return {"error": str(e)}
+
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, soft_time_limit=3300, max_retries=None)
+def rescore_leads_task(self, batch_id: int, force: bool = False):
+    """
+    Rescore leads scored with another config or whose inputs changed since.
+
+    No checkpoint is needed: every committed chunk stamps its leads with the
+    config version and input fingerprint, so when the soft time limit is
+    reached the task re-queues itself and the next run skips them. A forced
+    rescore cannot tell its own work apart, so it is marked failed instead.
+
+    Args:
+        batch_id: BatchJob (source "rescore") used to report progress
+        force: Rescore every lead, stale or not
+    """
+    from app.services.scoring_engine import rescore_leads
+    from app.models.lead import Lead
+    from sqlalchemy import func
+
+    db = SessionLocal()
+    try:
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if not batch:
+            return {"error": "Batch not found"}
+
+        # Progress is measured in leads scanned; only stale ones are written
+        batch.total_emails = db.query(func.count(Lead.id)).scalar()
+        batch.processed_emails = 0
+        batch.status = "processing"
+        batch.started_at = datetime.utcnow()
+        db.commit()
+
+        def on_chunk(scanned: int, rescored: int):
+            batch.processed_emails = min(scanned, batch.total_emails)
+            db.commit()
+
+            self.update_state(
+                state="PROGRESS",
+                meta={
+                    "phase": "scoring",
+                    "current": batch.processed_emails,
+                    "total": batch.total_emails,
+                    "percent": int(batch.processed_emails / max(batch.total_emails, 1) * 100),
+                    "rescored": rescored,
+                },
+            )
+
+        rescored = rescore_leads(db, on_chunk=on_chunk, force=force)
+
+        batch.status = "completed"
+        batch.processed_emails = batch.total_emails
+        batch.completed_at = datetime.utcnow()
+        db.commit()
+
+        logger.info(f"Rescore {batch_id}: {rescored} of {batch.total_emails} leads rescored")
+        return {"batch_id": batch_id, "status": "completed", "rescored": rescored}
+
+    except SoftTimeLimitExceeded:
+        db.rollback()
+        if not force:
+            logger.info(f"Rescore {batch_id}: time limit reached, re-queueing for the remaining stale leads")
+            raise self.retry(countdown=0)
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if batch:
+            batch.status = "failed"
+            batch.error_message = "Time limit reached before every lead was rescored"
+            db.commit()
+        return {"error": "Time limit reached"}
+
+    except Exception as e:
+        db.rollback()
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if batch:
+            batch.status = "failed"
+            batch.error_message = str(e)
+            db.commit()
+        return {"error": str(e)}
+
+    finally:
+        db.close()
@@ -150,6 +150,9 @@ def process_linkedin_leads(
         enriched_count = 0
         error_count = 0
 
+        from app.services.lead_manager import EnrichmentLeadBuffer
+        leads = EnrichmentLeadBuffer(db, source="linkedin")
+
         for i, post in enumerate(posts):
             # Extract domain from profile URL to search for email
             # Apollo needs an email or domain, so we'll use the profile URL
@@ -170,16 +173,8 @@ def process_linkedin_leads(
                     city=post.author_country,
                     batch_id=batch_id,
                 )
-                db.add(enrichment)
-                db.flush()
-                db.refresh(enrichment)
-
-                # Upsert lead record
-                try:
-                    from app.services.lead_manager import upsert_lead_from_enrichment
-                    upsert_lead_from_enrichment(db, enrichment.email, enrichment, source="linkedin")
-                except Exception as lead_err:
-                    logger.warning(f"Failed to upsert lead from linkedin enrichment: {lead_err}")
+                # Lead upserts are written in bulk
+                leads.add(enrichment)
 
                 post.is_processed = True
                 post.enrichment_batch_id = batch_id
@@ -200,6 +195,7 @@ def process_linkedin_leads(
                     "enriched": enriched_count,
                 },
             )
+        leads.flush()
 
         batch.status = "completed"
         batch.completed_at = datetime.utcnow()
@@ -2,17 +2,20 @@
 One-Click Pipeline Celery task: Apollo Search → ZeroBounce Verify → HubSpot Push.
 """
 
-import asyncio
 import logging
 from datetime import datetime
+from app.config import get_settings
 from app.tasks import celery_app
+from app.tasks.runner import run_async
 from app.database import SessionLocal
 from app.models.batch import BatchJob
 from app.models.enrichment import ContactEnrichment
 from app.services.apollo import get_apollo_service
 from app.services.verification import get_verification_service
 from app.services.hubspot import get_hubspot_service
-from app.services.lead_manager import upsert_lead_from_verification, upsert_lead_from_enrichment
+from app.services.concurrency import bounded_gather
+from app.services.lead_manager import EnrichmentLeadBuffer
+from app.services.verification_writer import VerificationWriter
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +30,10 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
         search_criteria: Dict with person_titles, q_organization_domains,
                          person_locations, person_seniorities, max_results
     """
+    return run_async(_run_oneclick_pipeline(self, batch_id, search_criteria))
+
+
+async def _run_oneclick_pipeline(task, batch_id: int, search_criteria: dict):
     db = SessionLocal()
     try:
         batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
@@ -43,14 +50,14 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
 
         # Ensure custom HubSpot properties exist
         try:
-            asyncio.run(hubspot_service.ensure_properties_exist())
+            await hubspot_service.ensure_properties_exist()
         except Exception as e:
             logger.warning(f"Failed to ensure HubSpot properties: {e}")
 
         max_results = search_criteria.get("max_results", 25)
 
         # ── Phase 1: Apollo Search (0–20%) ──
-        self.update_state(
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "search",
@@ -67,15 +74,13 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
 
         while len(all_contacts) < max_results:
             try:
-                result = asyncio.run(
-                    apollo_service.search_people(
-                        person_titles=search_criteria.get("person_titles") or None,
-                        q_organization_domains=search_criteria.get("q_organization_domains") or None,
-                        person_locations=search_criteria.get("person_locations") or None,
-                        person_seniorities=search_criteria.get("person_seniorities") or None,
-                        per_page=per_page,
-                        page=page,
-                    )
+                result = await apollo_service.search_people(
+                    person_titles=search_criteria.get("person_titles") or None,
+                    q_organization_domains=search_criteria.get("q_organization_domains") or None,
+                    person_locations=search_criteria.get("person_locations") or None,
+                    person_seniorities=search_criteria.get("person_seniorities") or None,
+                    per_page=per_page,
+                    page=page,
                 )
             except Exception as e:
                 logger.error(f"Apollo search failed on page {page}: {e}")
@@ -88,7 +93,7 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
             all_contacts.extend(contacts)
             total_available = result.get("total_entries", 0)
 
-            self.update_state(
+            task.update_state(
                 state="PROGRESS",
                 meta={
                     "phase": "search",
@@ -127,7 +132,7 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
         valid_contacts = []
         contact_results = []  # Track per-contact results
 
-        self.update_state(
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "verification",
@@ -138,43 +143,38 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
             },
         )
 
-        for i, contact in enumerate(all_contacts):
-            email = contact["email"]
-            verification_status = "unknown"
+        emails = [contact["email"] for contact in all_contacts]
 
-            try:
-                vresult = asyncio.run(
-                    verification_service.verify_email(email, batch_id=batch_id)
-                )
-                verification_status = vresult.get("status", "unknown")
-
-                # Upsert lead
-                try:
-                    from app.models.email import EmailVerification
-                    verification_record = (
-                        db.query(EmailVerification)
-                        .filter(EmailVerification.email == email.lower().strip())
-                        .order_by(EmailVerification.created_at.desc())
-                        .first()
-                    )
-                    if verification_record:
-                        upsert_lead_from_verification(db, email, verification_record, source="apollo")
-                except Exception as e:
-                    logger.warning(f"Failed to upsert lead for {email}: {e}")
-
-                if verification_status == "valid":
-                    batch.valid_count += 1
-                    valid_contacts.append(contact)
-                elif verification_status == "invalid":
-                    batch.invalid_count += 1
-                else:
-                    batch.unknown_count += 1
+        def on_verified(index: int, vresult: dict):
+            if vresult.get("status") == "error":
+                logger.error(f"Verification error for {emails[index]}: {vresult.get('error')}")
 
-            except Exception as e:
-                logger.error(f"Verification error for {email}: {e}")
+        def on_flush(processed: int):
+            task.update_state(
+                state="PROGRESS",
+                meta={
+                    "phase": "verification",
+                    "phase_label": "Verifying emails",
+                    "current": processed,
+                    "total": total,
+                    "percent": 20 + int(processed / total * 50),
+                },
+            )
+
+        writer = VerificationWriter(verification_service, batch_id=batch_id, source="apollo", on_flush=on_flush)
+        vresults = await verification_service.verify_batch(
+            emails, batch_id=batch_id, on_result=on_verified, writer=writer
+        )
+
+        for contact, vresult in zip(all_contacts, vresults):
+            verification_status = vresult.get("status", "unknown")
+            if verification_status == "error":
+                verification_status = "unknown"
+            elif verification_status == "valid":
+                valid_contacts.append(contact)
 
             contact_results.append({
-                "email": email,
+                "email": contact["email"],
                 "first_name": contact.get("first_name"),
                 "last_name": contact.get("last_name"),
                 "title": contact.get("title"),
@@ -183,26 +183,12 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
                 "hubspot_status": None,
             })
 
-            batch.processed_emails = i + 1
-            db.commit()
-
-            self.update_state(
-                state="PROGRESS",
-                meta={
-                    "phase": "verification",
-                    "phase_label": "Verifying emails",
-                    "current": i + 1,
-                    "total": total,
-                    "percent": 20 + int((i + 1) / total * 50),
-                },
-            )
-
         # ── Phase 3: HubSpot Push (70–100%) — valid emails only ──
         pushed_count = 0
         push_failed = 0
         push_total = len(valid_contacts)
 
-        self.update_state(
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "hubspot_push",
@@ -213,21 +199,28 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
             },
         )
 
-        for i, contact in enumerate(valid_contacts):
+        result_index = {}
+        for cr in contact_results:
+            result_index.setdefault(cr["email"], cr)
+        push_done = 0
+
+        async def push(contact: dict) -> dict:
+            return await hubspot_service.create_contact(contact)
+
+        def on_push_error(contact: dict, error: Exception) -> dict:
+            logger.error(f"HubSpot push error for {contact['email']}: {error}")
+            return {"status": "failed"}
+
+        def on_pushed(index: int, result: dict):
+            nonlocal pushed_count, push_failed, push_done
+            contact = valid_contacts[index]
             email = contact["email"]
-            hubspot_status = "failed"
+            push_done += 1
 
-            try:
-                result = asyncio.run(
-                    hubspot_service.create_contact(contact)
-                )
-                hubspot_status = result.get("status", "failed")
-                if hubspot_status in ("created", "updated"):
-                    pushed_count += 1
-                else:
-                    push_failed += 1
-            except Exception as e:
-                logger.error(f"HubSpot push error for {email}: {e}")
+            hubspot_status = result.get("status", "failed")
+            if hubspot_status in ("created", "updated"):
+                pushed_count += 1
+            else:
                 push_failed += 1
 
             # Store enrichment record for the contact
@@ -258,31 +251,36 @@ def run_oneclick_pipeline(self, batch_id: int, search_criteria: dict):
                     apollo_id=contact.get("apollo_id"),
                     batch_id=batch_id,
                 )
-                db.add(enrichment_record)
-                db.commit()
-                db.refresh(enrichment_record)
-
-                upsert_lead_from_enrichment(db, email, enrichment_record, source="apollo")
+                leads.add(enrichment_record)
             except Exception as e:
+                db.rollback()
                 logger.warning(f"Failed to store enrichment for {email}: {e}")
 
             # Update the per-contact result
-            for cr in contact_results:
-                if cr["email"] == email:
-                    cr["hubspot_status"] = hubspot_status
-                    break
+            if email in result_index:
+                result_index[email]["hubspot_status"] = hubspot_status
 
-            self.update_state(
+            task.update_state(
                 state="PROGRESS",
                 meta={
                     "phase": "hubspot_push",
                     "phase_label": "Pushing to HubSpot",
-                    "current": i + 1,
+                    "current": push_done,
                     "total": push_total,
-                    "percent": 70 + int((i + 1) / max(push_total, 1) * 30),
+                    "percent": 70 + int(push_done / max(push_total, 1) * 30),
                 },
             )
 
+        leads = EnrichmentLeadBuffer(db, source="apollo")
+        await bounded_gather(
+            valid_contacts,
+            push,
+            get_settings().hubspot_concurrency,
+            on_push_error,
+            on_pushed,
+        )
+        leads.flush()
+
         # ── Complete ──
         batch.status = "completed"
         batch.completed_at = datetime.utcnow()
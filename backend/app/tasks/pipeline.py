@@ -2,16 +2,19 @@
 Full pipeline Celery task: verify -> enrich -> score.
 """
 
-import asyncio
 import logging
 from datetime import datetime
+from app.config import get_settings
 from app.tasks import celery_app
+from app.tasks.runner import run_async
 from app.database import SessionLocal
 from app.models.batch import BatchJob
 from app.models.enrichment import ContactEnrichment
 from app.services.verification import get_verification_service
 from app.services.apollo import get_apollo_service
-from app.services.lead_manager import upsert_lead_from_verification, upsert_lead_from_enrichment
+from app.services.concurrency import bounded_gather
+from app.services.lead_manager import EnrichmentLeadBuffer
+from app.services.verification_writer import VerificationWriter
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +28,10 @@ def run_lead_pipeline(self, batch_id: int, contact_data: list[dict]):
         batch_id: BatchJob ID for tracking
         contact_data: List of dicts with 'email' and optionally 'id'
     """
+    return run_async(_run_lead_pipeline(self, batch_id, contact_data))
+
+
+async def _run_lead_pipeline(task, batch_id: int, contact_data: list[dict]):
     db = SessionLocal()
     try:
         batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
@@ -39,11 +46,10 @@ def run_lead_pipeline(self, batch_id: int, contact_data: list[dict]):
         verification_service = get_verification_service(db)
         apollo_service = get_apollo_service()
 
-        valid_contacts = []
         total = len(contact_data)
 
         # Phase 1: Verify
-        self.update_state(
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "verification",
@@ -53,56 +59,37 @@ def run_lead_pipeline(self, batch_id: int, contact_data: list[dict]):
             },
         )
 
-        for i, contact in enumerate(contact_data):
-            email = contact["email"]
-            try:
-                result = asyncio.run(
-                    verification_service.verify_email(email, batch_id=batch_id)
-                )
+        emails = [contact["email"] for contact in contact_data]
 
-                # Upsert lead from verification
-                try:
-                    from app.models.email import EmailVerification
-                    verification_record = (
-                        db.query(EmailVerification)
-                        .filter(EmailVerification.email == email.lower().strip())
-                        .order_by(EmailVerification.created_at.desc())
-                        .first()
-                    )
-                    if verification_record:
-                        upsert_lead_from_verification(db, email, verification_record, source="csv")
-                except Exception as e:
-                    logger.warning(f"Failed to upsert lead from verification for {email}: {e}")
+        def on_verified(index: int, result: dict):
+            if result.get("status") == "error":
+                logger.error(f"Pipeline verification error for {emails[index]}: {result.get('error')}")
 
-                if result.get("status") == "valid":
-                    batch.valid_count += 1
-                    valid_contacts.append(contact)
-                elif result.get("status") == "invalid":
-                    batch.invalid_count += 1
-                else:
-                    batch.unknown_count += 1
-
-                batch.processed_emails = i + 1
-                db.commit()
-
-            except Exception as e:
-                logger.error(f"Pipeline verification error for {email}: {e}")
-
-            self.update_state(
+        def on_flush(processed: int):
+            task.update_state(
                 state="PROGRESS",
                 meta={
                     "phase": "verification",
-                    "current": i + 1,
+                    "current": processed,
                     "total": total,
-                    "percent": int((i + 1) / total * 33),
+                    "percent": int(processed / total * 33),
                 },
             )
 
+        writer = VerificationWriter(verification_service, batch_id=batch_id, source="csv", on_flush=on_flush)
+        results = await verification_service.verify_batch(
+            emails, batch_id=batch_id, on_result=on_verified, writer=writer
+        )
+        valid_contacts = [
+            contact for contact, result in zip(contact_data, results)
+            if result.get("status") == "valid"
+        ]
+
         # Phase 2: Enrich valid contacts
         enrich_total = len(valid_contacts)
         enriched_count = 0
 
-        self.update_state(
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "enrichment",
@@ -112,66 +99,80 @@ def run_lead_pipeline(self, batch_id: int, contact_data: list[dict]):
             },
         )
 
-        for i, contact in enumerate(valid_contacts):
-            email = contact["email"]
-            try:
-                enrichment_data = asyncio.run(apollo_service.enrich_person(email))
-
-                enrichment_record = ContactEnrichment(
-                    email=email,
-                    enriched=enrichment_data.get("enriched", False),
-                    first_name=enrichment_data.get("first_name"),
-                    last_name=enrichment_data.get("last_name"),
-                    full_name=enrichment_data.get("full_name"),
-                    title=enrichment_data.get("title"),
-                    headline=enrichment_data.get("headline"),
-                    linkedin_url=enrichment_data.get("linkedin_url"),
-                    phone_numbers=enrichment_data.get("phone_numbers"),
-                    city=enrichment_data.get("city"),
-                    state=enrichment_data.get("state"),
-                    country=enrichment_data.get("country"),
-                    employment_history=enrichment_data.get("employment_history"),
-                    seniority=enrichment_data.get("seniority"),
-                    departments=enrichment_data.get("departments"),
-                    company_name=enrichment_data.get("company_name"),
-                    company_domain=enrichment_data.get("company_domain"),
-                    company_industry=enrichment_data.get("company_industry"),
-                    company_size=enrichment_data.get("company_size"),
-                    company_linkedin_url=enrichment_data.get("company_linkedin_url"),
-                    company_phone=enrichment_data.get("company_phone"),
-                    company_founded_year=enrichment_data.get("company_founded_year"),
-                    company_location=enrichment_data.get("company_location"),
-                    apollo_id=enrichment_data.get("apollo_id"),
-                    batch_id=batch_id,
-                )
-                db.add(enrichment_record)
-                db.commit()
-                db.refresh(enrichment_record)
-
-                # Upsert lead from enrichment (also triggers scoring)
+        def on_enrich_error(contact: dict, error: Exception) -> dict:
+            logger.error(f"Pipeline enrichment error for {contact['email']}: {error}")
+            return {"email": contact["email"], "enriched": False, "error": str(error)}
+
+        async def enrich(contact: dict) -> dict:
+            return await apollo_service.enrich_person(contact["email"])
+
+        enrich_done = 0
+
+        def on_enriched(index: int, enrichment_data: dict):
+            nonlocal enriched_count, enrich_done
+            email = valid_contacts[index]["email"]
+            enrich_done += 1
+            if "error" not in enrichment_data:
                 try:
-                    upsert_lead_from_enrichment(db, email, enrichment_record, source="csv")
-                except Exception as e:
-                    logger.warning(f"Failed to upsert lead from enrichment for {email}: {e}")
+                    enrichment_record = ContactEnrichment(
+                        email=email,
+                        enriched=enrichment_data.get("enriched", False),
+                        first_name=enrichment_data.get("first_name"),
+                        last_name=enrichment_data.get("last_name"),
+                        full_name=enrichment_data.get("full_name"),
+                        title=enrichment_data.get("title"),
+                        headline=enrichment_data.get("headline"),
+                        linkedin_url=enrichment_data.get("linkedin_url"),
+                        phone_numbers=enrichment_data.get("phone_numbers"),
+                        city=enrichment_data.get("city"),
+                        state=enrichment_data.get("state"),
+                        country=enrichment_data.get("country"),
+                        employment_history=enrichment_data.get("employment_history"),
+                        seniority=enrichment_data.get("seniority"),
+                        departments=enrichment_data.get("departments"),
+                        company_name=enrichment_data.get("company_name"),
+                        company_domain=enrichment_data.get("company_domain"),
+                        company_industry=enrichment_data.get("company_industry"),
+                        company_size=enrichment_data.get("company_size"),
+                        company_linkedin_url=enrichment_data.get("company_linkedin_url"),
+                        company_phone=enrichment_data.get("company_phone"),
+                        company_founded_year=enrichment_data.get("company_founded_year"),
+                        company_location=enrichment_data.get("company_location"),
+                        apollo_id=enrichment_data.get("apollo_id"),
+                        batch_id=batch_id,
+                    )
+                    # Lead upserts (which also score) are written in bulk
+                    leads.add(enrichment_record)
 
-                if enrichment_data.get("enriched"):
-                    enriched_count += 1
+                    if enrichment_data.get("enriched"):
+                        enriched_count += 1
 
-            except Exception as e:
-                logger.error(f"Pipeline enrichment error for {email}: {e}")
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Pipeline enrichment error for {email}: {e}")
 
-            self.update_state(
+            task.update_state(
                 state="PROGRESS",
                 meta={
                     "phase": "enrichment",
-                    "current": i + 1,
+                    "current": enrich_done,
                     "total": enrich_total,
-                    "percent": 33 + int((i + 1) / max(enrich_total, 1) * 34),
+                    "percent": 33 + int(enrich_done / max(enrich_total, 1) * 34),
                 },
             )
 
-        # Phase 3: Scoring is done automatically in upsert, but rescore all for safety
-        self.update_state(
+        leads = EnrichmentLeadBuffer(db, source="csv")
+        await bounded_gather(
+            valid_contacts,
+            enrich,
+            get_settings().apollo_concurrency,
+            on_enrich_error,
+            on_enriched,
+        )
+        leads.flush()
+
+        # Phase 3: Scoring is done automatically in upsert; rescore whatever is still stale
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "scoring",
@@ -184,7 +185,7 @@ def run_lead_pipeline(self, batch_id: int, contact_data: list[dict]):
         from app.services.scoring import rescore_all_leads
         rescored = rescore_all_leads(db)
 
-        self.update_state(
+        task.update_state(
             state="PROGRESS",
             meta={
                 "phase": "scoring",
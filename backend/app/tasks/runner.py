@@ -0,0 +1,53 @@
+"""
+Async runner for Celery tasks.
+
+Each worker thread keeps a single event loop for its whole lifetime, so a
+task body runs start to finish inside one loop and the pooled HTTP clients
+of the provider singletons are reused across items and across tasks.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def get_task_loop() -> asyncio.AbstractEventLoop:
+    """Return this thread's long-lived event loop, creating it if needed."""
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _local.loop = loop
+    return loop
+
+
+def run_async(coro: Coroutine) -> Any:
+    """Run a task body to completion on the thread's event loop."""
+    return get_task_loop().run_until_complete(coro)
+
+
+async def _close_clients() -> None:
+    from app.services.zerobounce import close_zerobounce_service
+    from app.services.apollo import close_apollo_service
+
+    await close_zerobounce_service()
+    await close_apollo_service()
+
+
+def close_task_loop() -> None:
+    """Close pooled clients and the thread's event loop (worker shutdown)."""
+    loop = getattr(_local, "loop", None)
+    _local.loop = None
+    if loop is None or loop.is_closed():
+        return
+    try:
+        loop.run_until_complete(_close_clients())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    except Exception as e:
+        logger.warning(f"Failed to close HTTP clients: {e}")
+    finally:
+        loop.close()
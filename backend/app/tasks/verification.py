@@ -1,15 +1,24 @@
-import asyncio
 import logging
+import time
 import pandas as pd
+from celery import chord
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+from app.config import get_settings
 from app.tasks import celery_app
+from app.tasks.runner import run_async
 from app.database import SessionLocal
 from app.models.batch import BatchJob
 from app.services.verification import get_verification_service
+from app.services.verification_writer import VerificationWriter
+from app.services.zerobounce import ZeroBounceError, get_zerobounce_service
 
 logger = logging.getLogger(__name__)
 
+# Bulk-file results are persisted in chunks of this many rows
+BULK_IMPORT_CHUNK_SIZE = 500
+
 
 @celery_app.task(bind=True)
 def process_csv_batch(self, batch_id: int):
@@ -19,6 +28,10 @@ def process_csv_batch(self, batch_id: int):
     Args:
         batch_id: ID of the BatchJob to process
     """
+    return run_async(_process_csv_batch(self, batch_id))
+
+
+async def _process_csv_batch(task, batch_id: int):
     db = SessionLocal()
     try:
         batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
@@ -31,14 +44,7 @@ def process_csv_batch(self, batch_id: int):
         db.commit()
 
         # Read CSV
-        df = pd.read_csv(batch.input_file_path)
-
-        # Find email column
-        email_column = None
-        for col in df.columns:
-            if "email" in col.lower():
-                email_column = col
-                break
+        df, email_column = _read_batch_csv(batch)
 
         if not email_column:
             batch.status = "failed"
@@ -46,81 +52,31 @@ def process_csv_batch(self, batch_id: int):
             db.commit()
             return {"error": "No email column found"}
 
-        emails = df[email_column].dropna().tolist()
+        emails = [str(email).strip() for email in df[email_column].dropna().tolist()]
         batch.total_emails = len(emails)
         db.commit()
 
-        # Process emails
-        service = get_verification_service(db)
-        results = []
-
-        for i, email in enumerate(emails):
-            try:
-                result = asyncio.run(
-                    service.verify_email(str(email).strip(), batch_id=batch_id)
-                )
-                results.append(result)
-
-                # Upsert lead record
-                try:
-                    from app.services.lead_manager import upsert_lead_from_verification
-                    from app.models.email import EmailVerification
-                    verification_record = (
-                        db.query(EmailVerification)
-                        .filter(EmailVerification.email == str(email).strip().lower())
-                        .order_by(EmailVerification.created_at.desc())
-                        .first()
-                    )
-                    if verification_record:
-                        upsert_lead_from_verification(db, str(email).strip(), verification_record, source="csv")
-                except Exception as lead_err:
-                    logger.warning(f"Failed to upsert lead for {email}: {lead_err}")
-
-                # Update progress
-                batch.processed_emails = i + 1
-                if result.get("status") == "valid":
-                    batch.valid_count += 1
-                elif result.get("status") == "invalid":
-                    batch.invalid_count += 1
-                else:
-                    batch.unknown_count += 1
-                db.commit()
-
-                # Update Celery task state
-                self.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "current": i + 1,
-                        "total": len(emails),
-                        "percent": int((i + 1) / len(emails) * 100),
-                    },
-                )
-
-            except Exception as e:
-                results.append({
-                    "email": email,
-                    "status": "error",
-                    "error": str(e),
-                })
-
-        # Create output CSV
-        output_df = df.copy()
-        email_to_result = {r["email"]: r for r in results if "email" in r}
+        settings = get_settings()
+        bulk = bool(settings.zerobounce_bulk_threshold) and len(emails) >= settings.zerobounce_bulk_threshold
+        chunk_size = settings.csv_chunk_size
+        if bulk or (chunk_size and len(emails) > chunk_size):
+            # Shard across workers; finalize_csv_batch writes the output.
+            # Bulk batches upload one ZeroBounce file per shard.
+            chunk_size = chunk_size or len(emails)
+            chunks = [emails[start:start + chunk_size] for start in range(0, len(emails), chunk_size)]
+            chord(verify_csv_chunk.s(batch_id, chunk, bulk) for chunk in chunks)(finalize_csv_batch.s(batch_id))
+            logger.info(f"Batch {batch_id}: split {len(emails)} emails into {len(chunks)} chunk tasks (bulk={bulk})")
+            return {"batch_id": batch_id, "status": "processing", "total": len(emails), "chunks": len(chunks)}
 
-        output_df["verification_status"] = output_df[email_column].apply(
-            lambda x: email_to_result.get(str(x).strip().lower(), {}).get("status", "unknown")
-        )
-        output_df["verification_sub_status"] = output_df[email_column].apply(
-            lambda x: email_to_result.get(str(x).strip().lower(), {}).get("sub_status", "")
-        )
+        results = await _verify_per_email(task, db, batch, emails)
 
-        # Save output
-        output_path = batch.input_file_path.replace(".csv", "_verified.csv")
-        output_df.to_csv(output_path, index=False)
+        # Create output CSV
+        _write_output_csv(batch, df, email_column, {
+            _normalize_email(email): result for email, result in zip(emails, results) if result is not None
+        })
 
         # Update batch
         batch.status = "completed"
-        batch.output_file_path = output_path
         batch.completed_at = datetime.utcnow()
         db.commit()
 
@@ -145,6 +101,282 @@ def process_csv_batch(self, batch_id: int):
         db.close()
 
 
+def _read_batch_csv(batch: BatchJob) -> tuple[pd.DataFrame, Optional[str]]:
+    """Read a batch's input CSV and find its email column."""
+    df = pd.read_csv(batch.input_file_path)
+
+    email_column = None
+    for col in df.columns:
+        if "email" in col.lower():
+            email_column = col
+            break
+
+    return df, email_column
+
+
+def _normalize_email(value) -> str:
+    """The key results are stored under, and looked up by, for an input cell."""
+    return str(value).strip().lower()
+
+
+def _write_output_csv(batch: BatchJob, df: pd.DataFrame, email_column: str, email_to_result: dict[str, dict]):
+    """
+    Write the input CSV with verification columns appended and record its path.
+
+    email_to_result is keyed by _normalize_email. Empty cells get status
+    "unknown"; addresses that have no result get "error".
+    """
+    output_df = df.copy()
+
+    def lookup(value) -> dict:
+        if pd.isna(value):
+            return {"status": "unknown", "sub_status": ""}
+        return email_to_result.get(_normalize_email(value)) or {"status": "error", "sub_status": ""}
+
+    results = output_df[email_column].map(lookup)
+    output_df["verification_status"] = results.map(lambda result: result.get("status") or "error")
+    output_df["verification_sub_status"] = results.map(lambda result: result.get("sub_status") or "")
+
+    output_path = batch.input_file_path.replace(".csv", "_verified.csv")
+    output_df.to_csv(output_path, index=False)
+    batch.output_file_path = output_path
+
+
+@celery_app.task(bind=True)
+def verify_csv_chunk(
+    self,
+    batch_id: int,
+    emails: list[str],
+    bulk: bool = False,
+    file_id: Optional[str] = None,
+    occurrences: Optional[dict[str, int]] = None,
+    deadline: Optional[float] = None,
+):
+    """
+    Verify one shard of a CSV batch.
+
+    Bulk shards upload their uncached addresses to the ZeroBounce file API
+    and then re-schedule themselves (as retries, so the chord still waits
+    for them) to poll the file every zerobounce_bulk_poll_interval seconds
+    instead of holding a worker until it is processed.
+
+    Args:
+        batch_id: ID of the BatchJob the shard belongs to
+        emails: The shard's email addresses
+        bulk: Verify through the bulk file API instead of per-email calls
+        file_id: Set on polls: the uploaded ZeroBounce file
+        occurrences: Set on polls: uploaded email -> times it appears in the shard
+        deadline: Set on polls: epoch time after which the file is given up on
+    """
+    if not bulk:
+        return run_async(_verify_csv_chunk(batch_id, emails))
+
+    if file_id is None:
+        result = run_async(_submit_bulk_chunk(batch_id, emails))
+    else:
+        result = run_async(_import_bulk_chunk(batch_id, file_id, occurrences, deadline))
+
+    if "file_id" in result:
+        raise self.retry(
+            args=(batch_id, []),
+            kwargs={"bulk": True, **result},
+            countdown=get_settings().zerobounce_bulk_poll_interval,
+            max_retries=None,
+        )
+    return result
+
+
+async def _verify_csv_chunk(batch_id: int, emails: list[str]):
+    db = SessionLocal()
+    errors = {}
+    try:
+        service = get_verification_service(db)
+        writer = VerificationWriter(service, batch_id=batch_id, source="csv")
+
+        def on_result(index: int, result: dict):
+            if result.get("status") == "error":
+                errors[_normalize_email(emails[index])] = result.get("error", "")
+
+        await service.verify_batch(emails, batch_id=batch_id, on_result=on_result, writer=writer)
+        return {"total": len(emails), "errors": errors}
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Batch {batch_id}: chunk of {len(emails)} emails failed: {e}")
+        return {"total": len(emails), "errors": errors, "error": str(e)}
+
+    finally:
+        db.close()
+
+
+async def _submit_bulk_chunk(batch_id: int, emails: list[str]) -> dict:
+    """
+    Resolve a bulk shard's cache hits and locally decidable addresses, then
+    upload only the rest as a ZeroBounce file.
+
+    Returns:
+        The poll state (file_id, occurrences, deadline) if a file was
+        uploaded, else the shard's final result
+    """
+    db = SessionLocal()
+    try:
+        service = get_verification_service(db)
+        writer = VerificationWriter(service, batch_id=batch_id, source="csv")
+        _, groups = await service.resolve_locally(emails, batch_id=batch_id, writer=writer)
+        writer.flush()
+
+        if not groups:
+            return {"total": len(emails), "errors": {}}
+
+        file_id = await get_zerobounce_service().send_file(list(groups))
+        logger.info(
+            f"Batch {batch_id}: uploaded {len(groups)} of {len(emails)} emails as ZeroBounce file {file_id}"
+        )
+        return {
+            "file_id": file_id,
+            "occurrences": {email: len(indexes) for email, indexes in groups.items()},
+            "deadline": time.time() + get_settings().zerobounce_bulk_timeout,
+        }
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Batch {batch_id}: bulk upload of {len(emails)} emails failed: {e}")
+        return {"total": len(emails), "errors": {}, "error": str(e)}
+
+    finally:
+        db.close()
+
+
+async def _import_bulk_chunk(batch_id: int, file_id: str, occurrences: dict[str, int], deadline: float) -> dict:
+    """
+    Poll a bulk shard's ZeroBounce file once; when it is processed, stream
+    the downloaded results into EmailVerification, Lead and the batch counters.
+
+    Returns:
+        The unchanged poll state while the file is still processing, else
+        the shard's final result
+    """
+    db = SessionLocal()
+    total = sum(occurrences.values())
+    try:
+        zerobounce = get_zerobounce_service()
+        if not await zerobounce.file_ready(file_id):
+            if time.time() > deadline:
+                raise ZeroBounceError(f"Timed out waiting for bulk file {file_id}")
+            return {"file_id": file_id, "occurrences": occurrences, "deadline": deadline}
+
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        results_path = batch.input_file_path.replace(".csv", f"_zerobounce_{file_id}.csv")
+        await zerobounce.download_file(file_id, results_path)
+
+        service = get_verification_service(db)
+        writer = VerificationWriter(service, batch_id=batch_id, source="csv", flush_size=BULK_IMPORT_CHUNK_SIZE)
+        imported = []
+        for result in zerobounce.iter_file_results(results_path):
+            for position in range(occurrences.get(result["email"], 1)):
+                writer.add(result if position == 0 else dict(result), store=position == 0)
+            imported.append(result)
+            if len(imported) >= BULK_IMPORT_CHUNK_SIZE:
+                service._remember(imported)
+                imported = []
+        writer.flush()
+        service._remember(imported)
+
+        return {"total": total, "errors": {}}
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Batch {batch_id}: bulk file {file_id} failed: {e}")
+        return {"total": total, "errors": {}, "error": str(e)}
+
+    finally:
+        db.close()
+
+
+@celery_app.task
+def finalize_csv_batch(chunk_results: list[dict], batch_id: int):
+    """
+    Chord callback for a sharded CSV batch: write the output CSV and close the batch.
+
+    Results are read back from EmailVerification rather than passed through
+    the result backend, so chunk tasks only report their failures.
+    """
+    from app.models.email import EmailVerification
+
+    db = SessionLocal()
+    try:
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if not batch:
+            return {"error": "Batch not found"}
+
+        df, email_column = _read_batch_csv(batch)
+        emails = list(dict.fromkeys(_normalize_email(email) for email in df[email_column].dropna().tolist()))
+
+        email_to_result = {}
+        for start in range(0, len(emails), BULK_IMPORT_CHUNK_SIZE):
+            rows = (
+                db.query(EmailVerification.email, EmailVerification.status, EmailVerification.sub_status)
+                .filter(EmailVerification.email.in_(emails[start:start + BULK_IMPORT_CHUNK_SIZE]))
+                .order_by(EmailVerification.email, EmailVerification.created_at.desc())
+                .distinct(EmailVerification.email)
+                .all()
+            )
+            for row in rows:
+                email_to_result[_normalize_email(row.email)] = {"status": row.status, "sub_status": row.sub_status}
+
+        for chunk in chunk_results:
+            for email in chunk.get("errors", {}):
+                email_to_result[_normalize_email(email)] = {"status": "error", "sub_status": ""}
+
+        _write_output_csv(batch, df, email_column, email_to_result)
+
+        failures = [chunk["error"] for chunk in chunk_results if chunk.get("error")]
+        batch.status = "failed" if failures else "completed"
+        batch.error_message = "; ".join(failures) if failures else None
+        batch.completed_at = datetime.utcnow()
+        db.commit()
+
+        return {
+            "batch_id": batch_id,
+            "status": batch.status,
+            "total": batch.total_emails,
+            "valid": batch.valid_count,
+            "invalid": batch.invalid_count,
+            "unknown": batch.unknown_count,
+        }
+
+    except Exception as e:
+        db.rollback()
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if batch:
+            batch.status = "failed"
+            batch.error_message = str(e)
+            db.commit()
+        return {"error": str(e)}
+
+    finally:
+        db.close()
+
+
+async def _verify_per_email(task, db, batch: BatchJob, emails: list[str], source: str = "csv") -> list[dict]:
+    """Verify emails one API call each, with bounded concurrency and buffered writes."""
+    service = get_verification_service(db)
+
+    def on_flush(processed: int):
+        # Update Celery task state
+        task.update_state(
+            state="PROGRESS",
+            meta={
+                "current": processed,
+                "total": len(emails),
+                "percent": int(processed / len(emails) * 100),
+            },
+        )
+
+    writer = VerificationWriter(service, batch_id=batch.id, source=source, on_flush=on_flush)
+    return await service.verify_batch(emails, batch_id=batch.id, writer=writer)
+
+
 @celery_app.task(bind=True)
 def process_hubspot_contacts(self, batch_id: int, contact_data: list[dict]):
     """
@@ -154,6 +386,10 @@ def process_hubspot_contacts(self, batch_id: int, contact_data: list[dict]):
         batch_id: ID of the BatchJob
         contact_data: List of contact dicts with id and email
     """
+    return run_async(_process_hubspot_contacts(self, batch_id, contact_data))
+
+
+async def _process_hubspot_contacts(task, batch_id: int, contact_data: list[dict]):
     db = SessionLocal()
     try:
         batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
@@ -166,57 +402,23 @@ def process_hubspot_contacts(self, batch_id: int, contact_data: list[dict]):
         db.commit()
 
         service = get_verification_service(db)
-        results = []
-
-        for i, contact in enumerate(contact_data):
-            try:
-                email = contact["email"]
-                result = asyncio.run(
-                    service.verify_email(email, batch_id=batch_id)
-                )
-                result["contact_id"] = contact["id"]
-                results.append(result)
-
-                # Upsert lead record
-                try:
-                    from app.services.lead_manager import upsert_lead_from_verification
-                    from app.models.email import EmailVerification
-                    verification_record = (
-                        db.query(EmailVerification)
-                        .filter(EmailVerification.email == email.lower().strip())
-                        .order_by(EmailVerification.created_at.desc())
-                        .first()
-                    )
-                    if verification_record:
-                        upsert_lead_from_verification(db, email, verification_record, source="hubspot")
-                except Exception as lead_err:
-                    logger.warning(f"Failed to upsert lead for {email}: {lead_err}")
-
-                batch.processed_emails = i + 1
-                if result.get("status") == "valid":
-                    batch.valid_count += 1
-                elif result.get("status") == "invalid":
-                    batch.invalid_count += 1
-                else:
-                    batch.unknown_count += 1
-                db.commit()
-
-                self.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "current": i + 1,
-                        "total": len(contact_data),
-                        "percent": int((i + 1) / len(contact_data) * 100),
-                    },
-                )
-
-            except Exception as e:
-                results.append({
-                    "contact_id": contact["id"],
-                    "email": contact["email"],
-                    "status": "error",
-                    "error": str(e),
-                })
+        emails = [contact["email"] for contact in contact_data]
+
+        def on_result(index: int, result: dict):
+            result["contact_id"] = contact_data[index]["id"]
+
+        def on_flush(processed: int):
+            task.update_state(
+                state="PROGRESS",
+                meta={
+                    "current": processed,
+                    "total": len(contact_data),
+                    "percent": int(processed / len(contact_data) * 100),
+                },
+            )
+
+        writer = VerificationWriter(service, batch_id=batch_id, source="hubspot", on_flush=on_flush)
+        results = await service.verify_batch(emails, batch_id=batch_id, on_result=on_result, writer=writer)
 
         batch.status = "completed"
         batch.completed_at = datetime.utcnow()
@@ -238,3 +440,114 @@ def process_hubspot_contacts(self, batch_id: int, contact_data: list[dict]):
 
     finally:
         db.close()
+
+
+@celery_app.task
+def reverify_expired_leads():
+    """
+    Queue re-verification for leads whose latest result has expired.
+
+    Expiry follows the status-aware TTL policy, so "unknown" results are
+    retried within hours while "valid"/"invalid" ones are left for weeks.
+    Called hourly by Celery beat when REVERIFICATION_ENABLED is set; a run
+    is skipped while the previous re-verification batch is still going.
+    """
+    from app.models.email import EmailVerification
+    from app.models.lead import Lead
+    from app.services.verification_ttl import expired_filter
+    from app.tasks.leads import find_running_job
+
+    db = SessionLocal()
+    try:
+        running = find_running_job(db, "reverify")
+        if running:
+            return {"queued": 0, "skipped": "previous run still in progress", "batch_id": running.id}
+
+        leads = (
+            db.query(Lead.id)
+            .join(EmailVerification, Lead.latest_verification_id == EmailVerification.id)
+            .filter(expired_filter())
+            .order_by(EmailVerification.created_at)
+            .limit(get_settings().reverification_batch_size)
+            .all()
+        )
+        lead_ids = [lead.id for lead in leads]
+        if not lead_ids:
+            return {"queued": 0}
+
+        batch = BatchJob(
+            filename="reverify_expired",
+            status="pending",
+            total_emails=len(lead_ids),
+            source="reverify",
+        )
+        db.add(batch)
+        db.commit()
+        db.refresh(batch)
+
+        reverify_leads.delay(batch.id, lead_ids)
+
+        return {"queued": len(lead_ids), "batch_id": batch.id}
+
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True)
+def reverify_leads(self, batch_id: int, lead_ids: list[int]):
+    """
+    Re-verify leads' emails, keeping each lead's own source.
+
+    Args:
+        batch_id: ID of the re-verification BatchJob
+        lead_ids: IDs of the leads to re-verify
+    """
+    return run_async(_reverify_leads(self, batch_id, lead_ids))
+
+
+async def _reverify_leads(task, batch_id: int, lead_ids: list[int]):
+    from app.models.lead import Lead
+
+    db = SessionLocal()
+    try:
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if not batch:
+            return {"error": "Batch not found"}
+
+        batch.status = "processing"
+        batch.started_at = datetime.utcnow()
+        db.commit()
+
+        by_source: dict[str, list[str]] = {}
+        for email, source in db.query(Lead.email, Lead.source).filter(Lead.id.in_(lead_ids)):
+            by_source.setdefault(source or "csv", []).append(email)
+
+        batch.total_emails = sum(len(emails) for emails in by_source.values())
+        db.commit()
+
+        for source, emails in by_source.items():
+            await _verify_per_email(task, db, batch, emails, source=source)
+
+        batch.status = "completed"
+        batch.completed_at = datetime.utcnow()
+        db.commit()
+
+        return {
+            "batch_id": batch_id,
+            "status": "completed",
+            "total": batch.total_emails,
+            "valid": batch.valid_count,
+            "invalid": batch.invalid_count,
+            "unknown": batch.unknown_count,
+        }
+
+    except Exception as e:
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
+        if batch:
+            batch.status = "failed"
+            batch.error_message = str(e)
+            db.commit()
+        return {"error": str(e)}
+
+    finally:
+        db.close()
@@ -0,0 +1,167 @@
+"""
+Benchmark lead search latency: the former OR of six ILIKE '%term%'
+predicates against the trigram-indexed search document (migration 007),
+unranked and ranked by relevance.
+
+Needs a Postgres database with pg_trgm available (DATABASE_URL). Leads are
+generated into a scratch schema, which is dropped afterwards unless
+--keep is given; the real leads table is not touched.
+
+Run from backend/:  python -m benchmarks.lead_search [--leads 1000000] [--queries 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import desc, or_, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.database import engine
+from app.models.lead import Lead
+from app.services.lead_search import search_document, search_filter, search_rank
+
+SCHEMA = "bench_lead_search"
+PAGE_SIZE = 50
+
+FIRST_NAMES = [
+    "james", "mary", "robert", "patricia", "john", "jennifer", "michael", "linda", "david", "elizabeth",
+    "william", "barbara", "richard", "susan", "joseph", "jessica", "thomas", "sarah", "priya", "wei",
+    "carlos", "sofia", "ahmed", "fatima", "lukas", "emma", "kenji", "yuki", "olga", "ivan",
+]
+LAST_NAMES = [
+    "smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis", "rodriguez", "martinez",
+    "hernandez", "lopez", "gonzalez", "wilson", "anderson", "thomas", "taylor", "moore", "jackson", "martin",
+    "lee", "perez", "thompson", "white", "harris", "sanchez", "clark", "ramirez", "lewis", "robinson",
+    "nakamura", "schmidt", "novak", "kowalski", "singh", "chen", "wang", "kim", "nguyen", "muller",
+]
+COMPANY_WORDS = [
+    "acme", "globex", "initech", "umbrella", "hooli", "vandelay", "stark", "wayne", "wonka", "cyberdyne",
+    "soylent", "tyrell", "aperture", "massive", "dynamic", "blue", "north", "quantum", "vertex", "nimbus",
+]
+COMPANY_SUFFIXES = ["labs", "systems", "analytics", "cloud", "health", "capital", "logistics", "media"]
+TITLES = [
+    "software engineer", "senior software engineer", "engineering manager", "director of engineering",
+    "vp engineering", "cto", "account executive", "sales manager", "vp sales", "head of marketing",
+    "marketing manager", "product manager", "data scientist", "ceo", "founder", "recruiter",
+]
+
+
+def _sql_array(values: list[str]) -> str:
+    return "ARRAY[" + ", ".join(f"'{v}'" for v in values) + "]"
+
+
+def _pick(values: list[str]) -> str:
+    # Random pick per row, skewed towards the start of the list
+    return f"({_sql_array(values)})[1 + floor(power(random(), 1.5) * {len(values)})::int]"
+
+
+def _search_document_sql() -> str:
+    # The expression the queries use, so the planner matches it to the index
+    compiled = search_document().compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return str(compiled).replace("leads.", "")
+
+
+def seed(conn, leads: int) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.leads (LIKE public.leads INCLUDING DEFAULTS)"))
+    conn.execute(text(f"CREATE SEQUENCE {SCHEMA}.leads_id_seq OWNED BY {SCHEMA}.leads.id"))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.leads ALTER COLUMN id SET DEFAULT nextval('{SCHEMA}.leads_id_seq')"))
+
+    started = time.perf_counter()
+    conn.execute(text(f"""
+        INSERT INTO {SCHEMA}.leads (email, first_name, last_name, full_name, company_name, title, created_at)
+        SELECT
+            lower(first) || '.' || lower(last) || g || '@' || lower(replace(company, ' ', '')) || '.com',
+            initcap(first), initcap(last), initcap(first) || ' ' || initcap(last),
+            initcap(company), initcap(title),
+            now() - (g || ' seconds')::interval
+        FROM (
+            SELECT g,
+                {_pick(FIRST_NAMES)} AS first,
+                {_pick(LAST_NAMES)} AS last,
+                {_pick(COMPANY_WORDS)} || ' ' || {_pick(COMPANY_SUFFIXES)} AS company,
+                CASE WHEN random() < 0.15 THEN NULL ELSE {_pick(TITLES)} END AS title
+            FROM generate_series(1, :leads) AS g
+        ) AS generated
+    """), {"leads": leads})
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.leads ADD PRIMARY KEY (id)"))
+    conn.execute(text(f"CREATE INDEX ON {SCHEMA}.leads (created_at)"))
+    print(f"seeded {leads} leads in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text(f"CREATE INDEX ON {SCHEMA}.leads USING gin (({_search_document_sql()}) gin_trgm_ops)"))
+    conn.execute(text(f"ANALYZE {SCHEMA}.leads"))
+    print(f"built the trigram index in {time.perf_counter() - started:.1f}s\n")
+
+
+def search_terms(count: int, seed_value: int = 11) -> list[str]:
+    rng = random.Random(seed_value)
+    makers = [
+        lambda: rng.choice(LAST_NAMES),
+        lambda: rng.choice(FIRST_NAMES)[:4],
+        lambda: f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        lambda: rng.choice(COMPANY_WORDS),
+        lambda: f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_WORDS)}",
+        lambda: f"{rng.choice(FIRST_NAMES)}.{rng.choice(LAST_NAMES)}{rng.randint(1, 999)}",
+        lambda: rng.choice(TITLES),
+    ]
+    return [rng.choice(makers)() for _ in range(count)]
+
+
+def legacy_filter(term: str):
+    pattern = f"%{term}%"
+    return or_(
+        Lead.email.ilike(pattern),
+        Lead.full_name.ilike(pattern),
+        Lead.first_name.ilike(pattern),
+        Lead.last_name.ilike(pattern),
+        Lead.company_name.ilike(pattern),
+        Lead.title.ilike(pattern),
+    )
+
+
+def run(conn, label: str, build, terms: list[str]) -> None:
+    timings = []
+    for term in terms:
+        statement = build(term).limit(PAGE_SIZE)
+        started = time.perf_counter()
+        conn.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<34} p50 {statistics.median(timings):8.1f} ms   p95 {p95:8.1f} ms   max {timings[-1]:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema (and reuse it with --no-seed)")
+    parser.add_argument("--no-seed", action="store_true")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        if not args.no_seed:
+            seed(conn, args.leads)
+            conn.commit()
+
+        # Unqualified "leads" in the statements below now means the scratch table
+        conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        terms = search_terms(args.queries)
+
+        run(conn, "ILIKE x6, newest first", lambda t: select(Lead.id).where(legacy_filter(t)).order_by(desc(Lead.created_at)), terms)
+        run(conn, "trigram, newest first", lambda t: select(Lead.id).where(search_filter(t)).order_by(desc(Lead.created_at)), terms)
+        run(conn, "trigram, by relevance", lambda t: select(Lead.id).where(search_filter(t)).order_by(desc(search_rank(t))), terms)
+
+        conn.rollback()
+        if not args.keep:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            conn.commit()
+
+
+if __name__ == "__main__":
+    main()
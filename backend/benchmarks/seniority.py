@@ -0,0 +1,111 @@
+"""
+Benchmark the seniority classifier against the keyword-loop implementation
+it replaced, on a synthetic corpus shaped like real lead data: a few
+hundred distinct titles with a long tail, repeated across many leads.
+
+Run from backend/:  python -m benchmarks.seniority [--leads 200000]
+"""
+
+import argparse
+import random
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.scoring import SENIORITY_MAP, SeniorityClassifier
+
+ROLES = [
+    "Software Engineer", "Data Scientist", "Product Manager", "Account Executive",
+    "Sales Development Representative", "Marketing", "Engineering", "Operations",
+    "Customer Success", "Finance", "People", "Design", "Security", "Growth",
+    "Revenue Operations", "Partnerships", "Legal", "IT", "Analytics", "Recruiting",
+]
+PREFIXES = [
+    "", "", "", "Senior ", "Staff ", "Principal ", "Lead ", "Head of ", "Director of ",
+    "Senior Director, ", "VP ", "VP of ", "SVP, ", "Chief ", "Associate ", "Junior ",
+]
+SUFFIXES = ["", "", "", " Manager", " Lead", " Specialist", " II", ", EMEA", " (Remote)"]
+EXECUTIVES = ["CEO", "CTO", "CFO", "COO", "Founder", "Co-Founder & CEO", "Owner", "Managing Director"]
+SENIORITIES = [None, None, "", "Entry", "Senior", "Manager", "Director", "VP", "C-Level", "Owner", "Partner"]
+
+
+def build_corpus(leads: int, seed: int = 7) -> tuple[list, list]:
+    rng = random.Random(seed)
+    titles = [f"{p}{r}{s}".strip() for p in PREFIXES for r in ROLES for s in SUFFIXES]
+    titles = sorted(set(titles)) + EXECUTIVES
+    # Zipf-like popularity: a few titles dominate, the rest form a long tail
+    weights = [1 / (rank + 1) for rank in range(len(titles))]
+    rng.shuffle(titles)
+    title_column = rng.choices(titles + [None], weights=weights + [sum(weights) * 0.1], k=leads)
+    seniority_column = [rng.choice(SENIORITIES) for _ in range(leads)]
+    return seniority_column, title_column
+
+
+def legacy_classify(seniority, title) -> str:
+    """The pre-compiled implementation: nested keyword loops, no memo."""
+    text = ""
+    if seniority:
+        text += seniority.lower()
+    if title:
+        text += " " + title.lower()
+
+    if not text.strip():
+        return "other"
+
+    for level, keywords in SENIORITY_MAP.items():
+        for kw in keywords:
+            if kw in text:
+                return level
+    return "other"
+
+
+def legacy_classify_many(seniority: pd.Series, title: pd.Series) -> np.ndarray:
+    """The previous bulk path: one str.contains pass per level."""
+    present_s = (seniority.notna() & (seniority.astype(object) != "")).to_numpy()
+    present_t = (title.notna() & (title.astype(object) != "")).to_numpy()
+    text = seniority.where(present_s, "").astype(str).str.lower()
+    text = text + np.where(present_t, " " + title.where(present_t, "").astype(str).str.lower(), "")
+    patterns = {level: "|".join(re.escape(k) for k in keywords) for level, keywords in SENIORITY_MAP.items()}
+    conditions = [text.str.contains(p, regex=True).to_numpy() for p in patterns.values()]
+    return np.select(conditions, list(patterns), default="other")
+
+
+def timed(label: str, fn, leads: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {elapsed * 1000:9.1f} ms  {leads / elapsed / 1e6:7.2f} M leads/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leads", type=int, default=200_000)
+    args = parser.parse_args()
+
+    seniority, title = build_corpus(args.leads)
+    distinct = len(set(zip(seniority, title)))
+    print(f"{args.leads} leads, {distinct} distinct (seniority, title) pairs\n")
+
+    expected = timed("legacy loops (per lead)", lambda: [legacy_classify(s, t) for s, t in zip(seniority, title)], args.leads)
+
+    cold = SeniorityClassifier(SENIORITY_MAP)
+    got = timed("compiled, cold memo (per lead)", lambda: [cold.classify(s, t) for s, t in zip(seniority, title)], args.leads)
+    assert got == expected
+    got = timed("compiled, warm memo (per lead)", lambda: [cold.classify(s, t) for s, t in zip(seniority, title)], args.leads)
+    assert got == expected
+
+    s_col, t_col = pd.Series(seniority, dtype=object), pd.Series(title, dtype=object)
+    got = timed("legacy bulk (str.contains per level)", lambda: legacy_classify_many(s_col, t_col), args.leads)
+    assert list(got) == expected
+    fresh = SeniorityClassifier(SENIORITY_MAP)
+    got = timed("classify_many, cold memo", lambda: fresh.classify_many(seniority, title), args.leads)
+    assert got == expected
+    got = timed("classify_many, warm memo", lambda: fresh.classify_many(seniority, title), args.leads)
+    assert got == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""A bulk CSV shard uploads its emails, re-polls the file as a retry until it is processed, then imports it."""
+
+import csv
+import io
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker
+
+import app.services.lead_manager as lead_manager
+import app.tasks.verification as verification_tasks
+from app.config import get_settings
+from app.database import Base
+from app.models.batch import BatchJob
+from app.models.email import EmailVerification
+from app.models.lead import Lead
+from app.services.zerobounce import get_zerobounce_service
+
+# Each test uses its own domain, as verified addresses stay in the in-process cache
+EMAILS = ["ann@{}", "bob@{}", "bad@{}", "Ann@{}"]
+
+
+class FakeZeroBounce:
+    """Bulk file API answering "Processing" to the first polls, then ``final_status``."""
+
+    def __init__(self, final_status: str = "Complete", processing_polls: int = 2):
+        self.final_status = final_status
+        self.processing_polls = processing_polls
+        self.uploaded = []
+        self.polls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/sendfile"):
+            body = request.content.decode()
+            self.uploaded = [line for line in body.splitlines() if "@" in line and "Content-" not in line]
+            return httpx.Response(200, json={"success": True, "file_id": "file-1"})
+        if path.endswith("/filestatus"):
+            self.polls += 1
+            status = "Processing" if self.polls <= self.processing_polls else self.final_status
+            return httpx.Response(200, json={"success": True, "file_id": "file-1", "file_status": status})
+        if path.endswith("/getfile"):
+            out = io.StringIO()
+            writer = csv.writer(out)
+            writer.writerow(["email", "ZB Status", "ZB Sub Status", "ZB MX Found", "ZB Domain"])
+            for email in self.uploaded:
+                domain = email.rpartition("@")[2]
+                writer.writerow([email, "invalid" if email.startswith("bad") else "valid", "", "true", domain])
+            return httpx.Response(200, content=out.getvalue().encode(), headers={"content-type": "text/csv"})
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(verification_tasks, "SessionLocal", factory)
+    # The lead upsert's ON CONFLICT clause renders the same on SQLite
+    monkeypatch.setattr(lead_manager, "pg_insert", sqlite_insert)
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "zerobounce_bulk_poll_interval", 0)
+    monkeypatch.setattr(settings, "precheck_mx_lookup", False)
+    monkeypatch.setattr(settings, "verification_cache_redis", False)
+    monkeypatch.setattr(settings, "verification_single_flight_redis", False)
+    return factory
+
+
+def _run_shard(factory, tmp_path, monkeypatch, api: FakeZeroBounce, emails: list[str]) -> tuple[dict, int]:
+    zerobounce = get_zerobounce_service()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    monkeypatch.setattr(zerobounce, "api_key", "test-key")
+    monkeypatch.setattr(zerobounce, "_get_client", lambda: client)
+
+    db = factory()
+    batch = BatchJob(filename="in.csv", input_file_path=str(tmp_path / "in.csv"), status="processing")
+    db.add(batch)
+    db.commit()
+    batch_id = batch.id
+    db.close()
+
+    # Eager apply() runs each self.retry() poll in place
+    result = verification_tasks.verify_csv_chunk.apply(args=(batch_id, emails, True)).get()
+    return result, batch_id
+
+
+def test_bulk_shard_polls_until_complete_then_imports(session_factory, tmp_path, monkeypatch):
+    api = FakeZeroBounce()
+    emails = [email.format("complete.example") for email in EMAILS]
+    result, batch_id = _run_shard(session_factory, tmp_path, monkeypatch, api, emails)
+
+    assert result == {"total": len(emails), "errors": {}}
+    assert sorted(api.uploaded) == ["ann@complete.example", "bad@complete.example", "bob@complete.example"]
+    assert api.polls == 3
+
+    db = session_factory()
+    statuses = dict(db.query(EmailVerification.email, EmailVerification.status))
+    assert statuses == {
+        "ann@complete.example": "valid",
+        "bob@complete.example": "valid",
+        "bad@complete.example": "invalid",
+    }
+    assert db.query(Lead).count() == 3
+    batch = db.get(BatchJob, batch_id)
+    # The duplicate address counts once per occurrence in the shard
+    assert (batch.processed_emails, batch.valid_count, batch.invalid_count) == (4, 3, 1)
+    db.close()
+
+
+def test_bulk_shard_reports_a_failed_file(session_factory, tmp_path, monkeypatch):
+    api = FakeZeroBounce(final_status="Failed", processing_polls=1)
+    emails = [email.format("failed.example") for email in EMAILS]
+    result, batch_id = _run_shard(session_factory, tmp_path, monkeypatch, api, emails)
+
+    assert api.polls == 2
+    assert result["total"] == len(emails)
+    assert "ended with status failed" in result["error"]
+
+    db = session_factory()
+    assert db.query(EmailVerification).count() == 0
+    assert db.get(BatchJob, batch_id).processed_emails in (0, None)
+    db.close()
@@ -0,0 +1,44 @@
+"""Dead-domain verdicts must only come from results that prove the domain has no mail servers."""
+
+from app.config import Settings, get_settings
+from app.services.domain_cache import DomainVerdictCache, dead_domain_result, is_dead_domain_result
+from app.services.verification_ttl import ttl_for
+from app.services.zerobounce import ZeroBounceService
+
+
+def _parse(data: dict) -> dict:
+    return ZeroBounceService()._parse_response("x..y@gmail.com", {"domain": "gmail.com", **data})
+
+
+def test_syntax_failure_does_not_mark_domain_dead():
+    # ZeroBounce leaves mx_found empty on syntax failures
+    result = _parse({"status": "invalid", "sub_status": "failed_syntax_check", "mx_found": ""})
+    assert result["mx_found"] is None
+    assert not is_dead_domain_result(result)
+
+    # Even an explicit "false" says nothing about the domain for an address-level failure
+    result = _parse({"status": "invalid", "sub_status": "failed_syntax_check", "mx_found": "false"})
+    assert not is_dead_domain_result(result)
+
+    cache = DomainVerdictCache(ttl=3600, client=None)
+    cache.learn([result])
+    assert not cache.is_dead("gmail.com")
+
+
+def test_missing_mx_found_is_unknown():
+    assert _parse({"status": "invalid", "sub_status": "mailbox_not_found"})["mx_found"] is None
+
+
+def test_dead_domain_results():
+    assert is_dead_domain_result(_parse({"status": "invalid", "sub_status": "no_dns_entries", "mx_found": "false"}))
+    assert is_dead_domain_result(_parse({"status": "invalid", "sub_status": "", "mx_found": "false"}))
+    assert not is_dead_domain_result(_parse({"status": "invalid", "sub_status": "mailbox_not_found", "mx_found": "false"}))
+    assert not is_dead_domain_result(_parse({"status": "valid", "mx_found": "true"}))
+
+
+def test_dead_domain_result_expires_with_the_verdict():
+    result = dead_domain_result("someone@dead.example")
+    assert ttl_for(result["status"], result["sub_status"]) == get_settings().domain_verdict_ttl_seconds
+    # Not the 90 days a real "invalid" verdict is kept
+    assert ttl_for(result["status"]) > get_settings().domain_verdict_ttl_seconds
+    assert Settings(domain_verdict_ttl_seconds=60).verification_ttl_by_sub_status["local_dead_domain"] == 60
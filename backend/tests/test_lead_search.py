@@ -0,0 +1,83 @@
+"""Relevance-sorted keyset paging must return every match once, including rows with tied ranks."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.lead import LEAD_SEARCH_DOCUMENT_SQL, Lead
+from app.services.lead_search import search_document, search_rank
+
+
+def _word_similarity(term: str, document: str) -> float:
+    # Coarse stand-in for pg_trgm's word_similarity, so that many rows tie
+    return 0.9 if document.startswith(term) else 0.3
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def register_functions(connection, _):
+        connection.create_function("word_similarity", 2, _word_similarity)
+
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all(
+            Lead(email=f"{'acme' if i % 4 == 0 else 'user'}{i}@acme.com", company_name="Acme")
+            for i in range(23)
+        )
+        db.commit()
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.mark.parametrize("sort_order", ["desc", "asc"])
+def test_relevance_pages_through_tied_ranks(client, sort_order):
+    params = {"search": "acme", "sort_by": "relevance", "sort_order": sort_order, "page_size": 4, "count": "none"}
+    seen = []
+    cursor = None
+    while True:
+        response = client.get("/api/leads/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        seen += [lead["email"] for lead in body["leads"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 23
+    # The 6 best matches (rank 0.9) come first when descending
+    best = {email for email in seen if email.startswith("acme")}
+    assert set(seen[:6] if sort_order == "desc" else seen[-6:]) == best
+
+
+def test_rank_is_double_precision():
+    sql = str(select(search_rank("acme")).compile(dialect=postgresql.dialect()))
+    assert "AS FLOAT(53))" in sql
+
+
+def test_search_document_matches_index_expression():
+    # The trigram index is only used when the query repeats its expression; SQLAlchemy
+    # parenthesizes the left-associative || chain, which Postgres parses identically
+    sql = str(search_document().compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    def bare(expression):
+        return expression.replace("leads.", "").replace("(", "").replace(")", "")
+
+    assert bare(sql) == bare(LEAD_SEARCH_DOCUMENT_SQL)
@@ -0,0 +1,41 @@
+"""The implicit-MX fallback must accept domains that only publish IPv6 addresses."""
+
+import asyncio
+
+import dns.exception
+import dns.resolver
+import pytest
+
+from app.config import get_settings
+from app.services.precheck import PreVerifier
+from app.services.verification_ttl import ttl_for
+
+
+class FakeResolver:
+    def __init__(self, answers: dict):
+        # rdtype -> answer, or an exception class to raise
+        self.answers = answers
+
+    async def resolve(self, domain, rdtype):
+        answer = self.answers.get(rdtype, dns.resolver.NoAnswer)
+        if isinstance(answer, type) and issubclass(answer, Exception):
+            raise answer()
+        return answer
+
+
+@pytest.mark.parametrize("answers, expected", [
+    ({"AAAA": ["2001:db8::1"]}, True),
+    ({"A": ["192.0.2.1"]}, True),
+    ({}, False),
+    ({"A": dns.resolver.NXDOMAIN, "AAAA": dns.resolver.NXDOMAIN}, False),
+    ({"AAAA": dns.exception.Timeout}, None),
+])
+def test_implicit_mx_fallback(answers, expected):
+    verifier = PreVerifier()
+    verifier._resolver = FakeResolver(answers)
+    assert asyncio.run(verifier._accepts_mail("example.com")) is expected
+
+
+def test_no_mx_result_expires_with_the_mx_cache():
+    result = PreVerifier()._local_result("someone@example.com", "local_no_mx")
+    assert ttl_for(result["status"], result["sub_status"]) == get_settings().precheck_mx_cache_ttl_seconds
@@ -0,0 +1,74 @@
+"""
+The columnar scoring engine must agree with scoring.score_lead, lead for
+lead, on random leads that hit the edge cases of every rule (missing and
+empty values, company sizes on and around the ideal range bounds,
+list/dict phone_numbers).
+"""
+
+import random
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.services.scoring import DEFAULT_CONFIG, score_lead
+from app.services.scoring_engine import BREAKDOWN_KEYS, SCORING_INPUTS, _plain, score_frame
+
+STATUSES = ["valid", "invalid", "catch-all", "unknown", None, "spamtrap", ""]
+SENIORITIES = [None, "", "VP", "Director", "c-suite", "senior", "Head of Sales", "manager", "Vice"]
+TITLES = [None, "", "Director of Eng", "CTO", "Team Lead", "president of x", "Sales Exec", "Chief", "leadership", "vp"]
+INDUSTRIES = [None, "", "Software", "Fintech Software", "Health", "retail"]
+COMPANY_SIZES = [None, 0, -5, 1, 10, 49, 50, 51, 123, 4999, 5000, 5001, 20000]
+PHONE_NUMBERS = [None, [], ["1"], [{"number": "2"}], {}]
+
+CONFIGS = {
+    "default": DEFAULT_CONFIG,
+    "custom": {
+        "weights": {"email_quality": 30, "seniority": 20, "company_fit": 33, "data_completeness": 17},
+        "seniority_scores": {"c_suite": 30, "vp": 19, "director": 12.5, "manager": 9, "other": 3},
+        "ideal_company_size": {"min": 10, "max": 100},
+        "target_industries": ["software", "Health"],
+    },
+    "odd weights": {
+        "weights": {"email_quality": 7, "seniority": 9, "company_fit": 11, "data_completeness": 13},
+        "target_industries": [""],
+    },
+}
+
+
+def random_lead(rng: random.Random, lead_id: int) -> dict:
+    return {
+        "id": lead_id,
+        "verification_status": rng.choice(STATUSES),
+        "seniority": rng.choice(SENIORITIES),
+        "title": rng.choice(TITLES),
+        "company_size": rng.choice(COMPANY_SIZES),
+        "company_industry": rng.choice(INDUSTRIES),
+        "phone": rng.choice([None, "", "123"]),
+        "phone_numbers": rng.choice(PHONE_NUMBERS),
+        "linkedin_url": rng.choice([None, "", "x"]),
+        "company_name": rng.choice([None, "", "Acme"]),
+    }
+
+
+def check(config: dict, leads: list[dict]) -> list[tuple]:
+    """Score leads both ways; returns (lead, expected, got) for each disagreement."""
+    df = pd.DataFrame(leads, columns=[column.key for column in SCORING_INPUTS])
+    totals, breakdown = score_frame(df, config)
+
+    mismatches = []
+    for i, lead in enumerate(leads):
+        expected = score_lead(SimpleNamespace(**lead), config)
+        got = (int(totals[i]), {key: _plain(breakdown.iloc[i][key]) for key in BREAKDOWN_KEYS})
+        if (int(expected[0]), expected[1]) != got:
+            mismatches.append((lead, expected, got))
+    return mismatches
+
+
+@pytest.mark.parametrize("name", list(CONFIGS))
+def test_engine_matches_score_lead(name):
+    rng = random.Random(1)
+    leads = [random_lead(rng, lead_id) for lead_id in range(1, 3001)]
+
+    mismatches = check(CONFIGS[name], leads)
+    assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[0]}"
@@ -23,6 +23,8 @@ const phaseLabels: Record<string, string> = {
   verification: 'Verifying emails',
   enrichment: 'Enriching contacts',
   scoring: 'Scoring leads',
+  backfill_verifications: 'Importing verification results',
+  backfill_enrichments: 'Importing enrichment data',
 };
 
 export default function ProcessingProgress({ batchId, onClose, onComplete }: ProcessingProgressProps) {
@@ -88,8 +88,8 @@ export function useLeads() {
       setState((prev) => ({
         ...prev,
         leads: res.data.leads,
-        total: res.data.total,
-        totalPages: res.data.total_pages,
+        total: res.data.total ?? 0,
+        totalPages: res.data.total_pages ?? 0,
         loading: false,
       }));
     } catch (err: any) {
@@ -77,8 +77,8 @@ export default function LeadsPage() {
     setActionLoading('backfill');
     try {
       const res = await backfillLeads();
-      showMessage('success', `Backfill complete: ${res.data.created} created, ${res.data.updated} updated (${res.data.total_leads} total)`);
-      leads.refresh();
+      showMessage('success', res.data.message);
+      setProcessingBatchId(res.data.batch_id);
     } catch (err: any) {
       showMessage('error', err.response?.data?.detail || 'Backfill failed');
     } finally {
@@ -91,7 +91,7 @@ export default function LeadsPage() {
     try {
       const res = await rescoreLeads();
       showMessage('success', res.data.message);
-      leads.refresh();
+      setProcessingBatchId(res.data.batch_id);
     } catch (err: any) {
       showMessage('error', err.response?.data?.detail || 'Rescore failed');
     } finally {
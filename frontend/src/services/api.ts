@@ -270,10 +270,12 @@ export interface LeadItem {
 
 export interface LeadListResponse {
   leads: LeadItem[];
-  total: number;
+  total: number | null;
+  total_estimated: boolean;
   page: number;
   page_size: number;
-  total_pages: number;
+  total_pages: number | null;
+  next_cursor: string | null;
 }
 
 export const getLeads = (params: Record<string, string | number | boolean>) =>
@@ -297,12 +299,21 @@ export const rescoreLeads = () =>
 export const getPipelineSummary = () =>
   api.get('/leads/pipeline-summary');
 
+export const getLeadStatsTimeseries = (
+  days: number = 30,
+  groupBy?: 'source' | 'verification_status' | 'outreach_status'
+) =>
+  api.get('/leads/stats/timeseries', { params: { days, group_by: groupBy } });
+
 export const getScoringConfig = () =>
   api.get('/leads/scoring-config');
 
 export const updateScoringConfig = (config: Record<string, any>) =>
   api.put('/leads/scoring-config', { config });
 
+export const simulateScoringConfig = (config: Record<string, any>, thresholds?: number[]) =>
+  api.post('/leads/scoring-simulation', { config, thresholds });
+
 // Progress endpoint
 export const getProgress = (batchId: number) =>
   api.get(`/progress/${batchId}`);
@@ -326,8 +337,8 @@ export const pushLeadsToOutreach = (leadIds: number[], campaignId: string, campa
 export const getOutreachLogs = (limit: number = 50, offset: number = 0) =>
   api.get(`/outreach/logs?limit=${limit}&offset=${offset}`);
 
-export const exportForOutreach = (format: string, leadIds?: number[]) =>
-  api.post('/outreach/export', { format, lead_ids: leadIds }, { responseType: 'blob' });
+export const exportForOutreach = (format: string, leadIds?: number[], gzip: boolean = false) =>
+  api.post('/outreach/export', { format, lead_ids: leadIds, gzip }, { responseType: 'blob' });
 
 // One-Click Pipeline endpoints
 export interface ApolloSearchCriteria {